@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import upload, health, recordings, search, labeling
+from app.api.v1.endpoints import upload, health, recordings, search, labeling, media, metrics
 
 api_router = APIRouter()
 
@@ -17,4 +17,10 @@ api_router.include_router(recordings.router, tags=["recordings"])
 api_router.include_router(search.router, tags=["search"])
 
 # Include labeling endpoints
-api_router.include_router(labeling.router, prefix="/labeling", tags=["labeling"]) 
\ No newline at end of file
+api_router.include_router(labeling.router, prefix="/labeling", tags=["labeling"])
+
+# Include media endpoints (served only with the local storage backend)
+api_router.include_router(media.router, tags=["media"])
+
+# Include Prometheus metrics endpoint
+api_router.include_router(metrics.router, tags=["metrics"])
@@ -1,9 +1,10 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from datetime import datetime
 from typing import Any
 
 from app.models.schemas import HealthResponse, BasicResponse
-from app.services.storage_service import storage_service
+from app.services.health_service import health_service
 
 router = APIRouter()
 
@@ -19,11 +20,33 @@ async def root() -> Any:
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check() -> Any:
-    """Detailed health check including Supabase Storage connectivity"""
-    bucket_info = storage_service.get_bucket_info()
+    """Detailed health check served from the cached background dependency checks"""
+    checks = health_service.get_results()
+    storage_status = checks.get("storage", {}).get("status", "unknown")
     
     return HealthResponse(
         api="healthy",
-        storage=bucket_info["status"],
-        timestamp=datetime.now().isoformat()
-    ) 
\ No newline at end of file
+        storage="connected" if storage_status == "healthy" else storage_status,
+        timestamp=datetime.now().isoformat(),
+        checks=checks
+    )
+
+
+@router.get("/health/live", response_model=BasicResponse)
+async def liveness() -> Any:
+    """Liveness probe - the process is up and serving requests"""
+    return BasicResponse(message="alive", status="healthy")
+
+
+@router.get("/health/ready")
+async def readiness() -> Any:
+    """Readiness probe - critical dependencies passed their latest background check"""
+    ready = health_service.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not ready",
+            "checks": health_service.get_results(),
+            "timestamp": datetime.now().isoformat()
+        }
+    )
\ No newline at end of file
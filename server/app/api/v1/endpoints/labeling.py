@@ -1,7 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, List
 from sqlalchemy.orm import Session
+import asyncio
+import json
+import logging
 
+from app.core.caching import make_etag, is_not_modified, not_modified_response, cache_headers
 from app.models.database import get_db
 from app.models.schemas import (
     LabelingRuleCreate, 
@@ -12,9 +17,16 @@ from app.models.schemas import (
 )
 from app.services.labeling_service import labeling_service
 from app.services.recording_service import recording_service
+from app.services.metrics_service import metrics_service
+from app.services.tracing_service import tracing_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Recording columns the labeling prompt is built from
+LABELING_FIELDS = ["id", "summary", "action_items", "decisions", "transcript"]
+
 @router.post("/", response_model=LabelingRuleResponse)
 async def create_labeling_rule(
     rule_data: LabelingRuleCreate, 
@@ -25,21 +37,36 @@ async def create_labeling_rule(
 
 @router.get("/", response_model=List[LabelingRuleResponse])
 async def get_labeling_rules(
+    request: Request,
+    response: Response,
     active_only: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Get all labeling rules"""
+    """Get all labeling rules (answers 304 if the rule set is unchanged)"""
+    etag = make_etag("labeling-rules", *labeling_service.get_rules_version(db), active_only)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    response.headers.update(cache_headers(etag))
     return labeling_service.get_rules(db, active_only=active_only)
 
 @router.get("/{rule_id}", response_model=LabelingRuleResponse)
 async def get_labeling_rule(
     rule_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """Get a specific labeling rule"""
     rule = labeling_service.get_rule(db, rule_id)
     if not rule:
         raise HTTPException(status_code=404, detail="Labeling rule not found")
+    
+    etag = make_etag("labeling-rule", rule.id, rule.updated_at)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    response.headers.update(cache_headers(etag))
     return rule
 
 @router.put("/{rule_id}", response_model=LabelingRuleResponse)
@@ -82,18 +109,85 @@ async def apply_labels_to_recording(
             detail="Recording must be analyzed before labeling"
         )
     
-    # Apply labeling rules
-    applied_labels = await labeling_service.apply_rules_to_recording(
-        summary=recording.summary,
-        action_items=recording.action_items or [],
-        decisions=recording.decisions or [],
-        transcript=recording.transcript or ""
-    )
+    # Apply labeling rules, collecting the spans of the OpenAI call for its token usage
+    with tracing_service.continue_trace(tracing_service.current_context(), "labeling", recording_id=recording_id) as spans:
+        with metrics_service.track_stage("label"):
+            applied_labels = await labeling_service.apply_rules_to_recording(
+                summary=recording.summary,
+                action_items=recording.action_items or [],
+                decisions=recording.decisions or [],
+                transcript=recording.transcript or ""
+            )
     
-    # Update the recording with the labels
+    # Update the recording with the labels and add the call to its LLM usage
     recording_service.update_recording(
         recording_id=recording_id,
-        labels=applied_labels
+        labels=applied_labels,
+        add_llm_usage=metrics_service.summarize_openai_usage(spans)
     )
     
-    return applied_labels 
\ No newline at end of file
+    return applied_labels
+
+
+@router.post("/stream/{recording_id}")
+async def stream_labels_to_recording(
+    recording_id: int
+):
+    """
+    Apply labeling rules to a recording on-demand, streamed as Server-Sent Events
+    
+    Emits a "label" event for each label the moment the model decides it,
+    then a "done" event with the full list once it is saved on the recording,
+    or an "error" event if labeling fails part-way.
+    """
+    # Database calls run off the event loop, which only forwards stream chunks
+    recording = await asyncio.to_thread(
+        recording_service.get_recording,
+        recording_id,
+        LABELING_FIELDS
+    )
+    if not recording:
+        raise HTTPException(status_code=404, detail="Recording not found")
+    
+    if not recording.summary:
+        raise HTTPException(
+            status_code=400, 
+            detail="Recording must be analyzed before labeling"
+        )
+    
+    async def events() -> AsyncIterator[str]:
+        applied_labels = []
+        try:
+            with tracing_service.continue_trace(tracing_service.current_context(), "labeling", recording_id=recording_id) as spans:
+                with metrics_service.track_stage("label"):
+                    async for label in labeling_service.stream_rules_to_recording(
+                        summary=recording.summary,
+                        action_items=recording.action_items or [],
+                        decisions=recording.decisions or [],
+                        transcript=recording.transcript or ""
+                    ):
+                        applied_labels.append(label)
+                        yield _sse_event("label", label)
+            
+            await asyncio.to_thread(
+                recording_service.update_recording,
+                recording_id=recording_id,
+                labels=applied_labels,
+                add_llm_usage=metrics_service.summarize_openai_usage(spans)
+            )
+            yield _sse_event("done", {"labels": applied_labels})
+        except Exception as e:
+            logger.error(f"❌ Streamed labeling failed for recording {recording_id}: {e}")
+            yield _sse_event("error", {"detail": str(e)})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,83 @@
+from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi.responses import FileResponse, StreamingResponse, Response
+from typing import Any
+import logging
+import mimetypes
+import os
+
+from app.core.config import settings
+from app.services.storage_service import storage_service
+from app.services.local_storage_service import LocalStorageService
+from app.services.media_derivatives import cache_control
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def _local_storage() -> LocalStorageService:
+    """Media is only served by the API when the local storage backend is active"""
+    if not isinstance(storage_service, LocalStorageService):
+        raise HTTPException(status_code=404, detail="Local media serving is not enabled")
+    return storage_service
+
+
+@router.get("/media/{storage_path:path}")
+async def get_media(storage_path: str, request: Request) -> Any:
+    """
+    Serve a file from local storage, honouring single-range Range requests
+    
+    Ranges are streamed from a memory map so seeking in a long recording only
+    touches the pages that are actually requested. Images are generated
+    visuals under unique paths and are cached by clients for good.
+    """
+    storage = _local_storage()
+    local_path = storage.get_local_path(storage_path)
+    if not local_path:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    size = os.path.getsize(local_path)
+    content_type = mimetypes.guess_type(storage_path)[0] or "application/octet-stream"
+    range_header = request.headers.get("range")
+    
+    if not range_header:
+        response = FileResponse(local_path, media_type=content_type)
+        response.headers["Accept-Ranges"] = "bytes"
+        if content_type.startswith("image/"):
+            response.headers["Cache-Control"] = cache_control()
+        return response
+    
+    byte_range = storage.parse_range_header(range_header, size)
+    if byte_range is None:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    
+    start, end = byte_range
+    return StreamingResponse(
+        storage.iter_range(storage_path, start, end),
+        status_code=206,
+        media_type=content_type,
+        headers={
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "Content-Length": str(end - start + 1)
+        }
+    )
+
+
+@router.put("/media/{storage_path:path}")
+async def put_media(
+    storage_path: str,
+    request: Request,
+    token: str = Query(..., description="Token from a signed upload URL")
+) -> Any:
+    """Receive a direct upload issued by a local signed upload URL"""
+    storage = _local_storage()
+    if not storage.verify_upload_token(storage_path, token):
+        raise HTTPException(status_code=403, detail="Invalid or expired upload token")
+    
+    written = await storage.save_stream(
+        storage_path,
+        request.stream(),
+        max_bytes=settings.max_file_size
+    )
+    return {"storage_path": storage_path, "file_size": written}
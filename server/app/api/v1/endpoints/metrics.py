@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+import asyncio
+
+from app.services.metrics_service import metrics_service
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """Expose API, database pool, queue, pipeline and OpenAI metrics for Prometheus"""
+    # Rendering reads Redis and the connection pools, so keep it off the event loop
+    body = await asyncio.to_thread(metrics_service.render)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
\ No newline at end of file
@@ -1,12 +1,20 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from typing import List, Optional
 import logging
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
-from app.models.schemas import RecordingResponse, RecordingListResponse
+from app.core.caching import make_etag, is_not_modified, not_modified_response, cache_headers
+from app.models.schemas import (
+    RecordingResponse, RecordingListResponse, BulkDeleteRequest, BulkDeleteResponse,
+    TranscriptRangeResponse, TranscriptSegment, WaveformResponse
+)
 from app.services.recording_service import recording_service
 from app.services.storage_service import storage_service
+from app.services.transcript_index_service import transcript_index_service
+from app.services.media_probe_service import media_probe_service
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +23,8 @@ router = APIRouter()
 
 @router.get("/recordings", response_model=RecordingListResponse)
 async def get_recordings(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of recordings to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of recordings to return")
 ):
@@ -22,6 +32,13 @@ async def get_recordings(
     logger.info(f"📋 Fetching recordings list - Skip: {skip}, Limit: {limit}")
     
     try:
+        # Compare validators before loading any rows
+        version = await asyncio.to_thread(recording_service.get_recordings_version)
+        etag = make_etag("recordings", *version, skip, limit)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        response.headers.update(cache_headers(etag))
+        
         # Run database operations in thread pool to avoid blocking
         loop = asyncio.get_event_loop()
         with ThreadPoolExecutor() as executor:
@@ -46,24 +63,58 @@ async def get_recordings(
 
 
 @router.get("/recordings/{recording_id}", response_model=RecordingResponse)
-async def get_recording(recording_id: int):
-    """Get a specific recording by ID"""
+async def get_recording(
+    recording_id: int,
+    request: Request,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return, e.g. id,summary,processing_status (default: all)"
+    )
+):
+    """
+    Get a specific recording by ID
+    
+    With ?fields= only the requested columns are read and returned, so pages
+    that do not show transcripts never load or transfer them.
+    """
     logger.info(f"🔍 Fetching recording with ID: {recording_id}")
+    requested_fields = _parse_fields(fields)
     
     try:
+        # Check the validator against updated_at alone, so an unchanged recording
+        # is answered without loading or serialising its transcripts
+        updated_at = await asyncio.to_thread(recording_service.get_recording_version, recording_id)
+        if updated_at is None:
+            logger.warning(f"⚠️  Recording not found: {recording_id}")
+            raise HTTPException(status_code=404, detail="Recording not found")
+        
+        etag = make_etag("recording", recording_id, updated_at, ",".join(requested_fields or []))
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        
         # Run database operation in thread pool to avoid blocking
         loop = asyncio.get_event_loop()
         with ThreadPoolExecutor() as executor:
             recording = await loop.run_in_executor(
-                executor, recording_service.get_recording, recording_id
+                executor, recording_service.get_recording, recording_id, requested_fields
             )
         
         if not recording:
             logger.warning(f"⚠️  Recording not found: {recording_id}")
             raise HTTPException(status_code=404, detail="Recording not found")
         
+        if requested_fields is not None:
+            logger.info(f"✅ Retrieved recording {recording_id} fields: {', '.join(requested_fields)}")
+            return JSONResponse(
+                content=jsonable_encoder({field: getattr(recording, field) for field in requested_fields}),
+                headers=cache_headers(etag)
+            )
+        
         logger.info(f"✅ Retrieved recording: {recording.original_filename} (Status: {recording.processing_status})")
-        return RecordingResponse.from_orm(recording)
+        return JSONResponse(
+            content=jsonable_encoder(RecordingResponse.from_orm(recording)),
+            headers=cache_headers(etag)
+        )
         
     except HTTPException:
         raise
@@ -72,6 +123,100 @@ async def get_recording(recording_id: int):
         raise HTTPException(status_code=500, detail="Failed to fetch recording")
 
 
+@router.get("/recordings/{recording_id}/transcript", response_model=TranscriptRangeResponse)
+async def get_transcript_range(
+    recording_id: int,
+    start: Optional[float] = Query(None, ge=0, description="Window start in seconds"),
+    end: Optional[float] = Query(None, ge=0, description="Window end in seconds"),
+    first_segment: Optional[int] = Query(None, ge=0, description="Index of the first segment to return"),
+    last_segment: Optional[int] = Query(None, ge=0, description="Index of the last segment to return (inclusive)")
+):
+    """
+    Get part of a transcript by time window or by segment index
+    
+    Served from the recording's transcript index, so long meetings can be
+    paged or seeked without sending the whole transcript.
+    """
+    by_time = start is not None or end is not None
+    by_segment = first_segment is not None or last_segment is not None
+    if by_time and by_segment:
+        raise HTTPException(status_code=400, detail="Use either start/end or first_segment/last_segment, not both")
+    if start is not None and end is not None and end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if first_segment is not None and last_segment is not None and last_segment < first_segment:
+        raise HTTPException(status_code=400, detail="last_segment must not be before first_segment")
+    
+    logger.info(f"📜 Fetching transcript range for recording {recording_id}")
+    
+    try:
+        recording, index = await asyncio.gather(
+            asyncio.to_thread(recording_service.get_recording, recording_id, ["id", "transcript"]),
+            asyncio.to_thread(transcript_index_service.get_index, recording_id)
+        )
+        
+        if not recording:
+            raise HTTPException(status_code=404, detail="Recording not found")
+        if index is None:
+            raise HTTPException(status_code=404, detail="Transcript index not available for this recording")
+        
+        transcript = recording.transcript or ""
+        if by_segment:
+            segments = transcript_index_service.segments_by_index(
+                index, transcript, first_segment or 0, last_segment
+            )
+        else:
+            segments = transcript_index_service.segments_between(index, transcript, start or 0.0, end)
+        
+        return TranscriptRangeResponse(
+            recording_id=recording_id,
+            total_segments=transcript_index_service.segment_count(index),
+            segments=[TranscriptSegment(**segment) for segment in segments]
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Failed to fetch transcript range for recording {recording_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch transcript")
+
+
+@router.get("/recordings/{recording_id}/waveform", response_model=WaveformResponse)
+async def get_waveform(recording_id: int, request: Request):
+    """
+    Get the media details and waveform peaks taken when the recording was ingested
+    
+    About a kilobyte for any recording length, so the player can be drawn
+    and seeked before (or without) downloading the media itself.
+    """
+    try:
+        probe = await asyncio.to_thread(media_probe_service.get, recording_id)
+        if probe is None:
+            raise HTTPException(status_code=404, detail="Waveform not available for this recording")
+        
+        etag = make_etag("waveform", recording_id, probe.created_at)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        
+        waveform = WaveformResponse(
+            recording_id=recording_id,
+            duration=probe.duration,
+            format_name=probe.format_name,
+            bit_rate=probe.bit_rate,
+            audio_codec=probe.audio_codec,
+            channels=probe.channels,
+            sample_rate=probe.sample_rate,
+            video_codec=probe.video_codec,
+            peaks=media_probe_service.decode_peaks(probe).tolist()
+        )
+        return JSONResponse(content=jsonable_encoder(waveform), headers=cache_headers(etag))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Failed to fetch waveform for recording {recording_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch waveform")
+
+
 @router.delete("/recordings/{recording_id}")
 async def delete_recording(recording_id: int):
     """Delete a recording"""
@@ -89,19 +234,10 @@ async def delete_recording(recording_id: int):
             logger.warning(f"⚠️  Recording not found for deletion: {recording_id}")
             raise HTTPException(status_code=404, detail="Recording not found")
         
-        # Delete files from storage
-        if recording.storage_path:
-            logger.info(f"🗑️  Deleting recording file: {recording.storage_path}")
-            storage_deleted = storage_service.delete_file(recording.storage_path)
-            if not storage_deleted:
-                logger.warning(f"⚠️  Failed to delete recording file: {recording.storage_path}")
-        
-        # Delete AI-generated visual summary if it exists
-        if recording.visual_summary_url:
-            logger.info(f"🎨 Deleting visual summary for recording {recording_id}")
-            visual_deleted = storage_service.delete_visual_summary(recording_id, recording.visual_summary_url)
-            if not visual_deleted:
-                logger.warning(f"⚠️  Failed to delete visual summary for recording {recording_id}")
+        # Delete the media file and AI-generated visual summary in one storage call
+        storage_deleted = await storage_service.delete_files(_storage_paths_for(recording))
+        if not storage_deleted:
+            logger.warning(f"⚠️  Failed to delete storage files for recording {recording_id}")
         
         # Run database operation in thread pool to avoid blocking
         with ThreadPoolExecutor() as executor:
@@ -120,4 +256,63 @@ async def delete_recording(recording_id: int):
         raise
     except Exception as e:
         logger.error(f"❌ Failed to delete recording {recording_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to delete recording")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to delete recording")
+
+
+@router.post("/recordings/bulk-delete", response_model=BulkDeleteResponse)
+async def bulk_delete_recordings(delete_request: BulkDeleteRequest):
+    """Delete several recordings, removing all their storage files in one batch"""
+    logger.info(f"🗑️  Attempting to delete {len(delete_request.recording_ids)} recordings")
+    
+    try:
+        recordings = await asyncio.to_thread(
+            recording_service.get_recordings_by_ids, delete_request.recording_ids
+        )
+        found_ids = [recording.id for recording in recordings]
+        not_found = [rid for rid in delete_request.recording_ids if rid not in set(found_ids)]
+        
+        storage_paths = [path for recording in recordings for path in _storage_paths_for(recording)]
+        storage_deleted = await storage_service.delete_files(storage_paths)
+        if not storage_deleted:
+            logger.warning(f"⚠️  Failed to delete some storage files for recordings {found_ids}")
+        
+        deleted = await asyncio.to_thread(recording_service.delete_recordings, found_ids)
+        
+        logger.info(f"✅ Deleted {deleted} recordings ({len(storage_paths)} storage files)")
+        return BulkDeleteResponse(deleted=deleted, not_found=not_found)
+        
+    except Exception as e:
+        logger.error(f"❌ Failed to bulk delete recordings: {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete recordings")
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validate a ?fields= sparse fieldset; the ID is always included"""
+    if fields is None:
+        return None
+    
+    requested = ["id"]
+    for field in fields.split(","):
+        field = field.strip()
+        if field and field not in requested:
+            requested.append(field)
+    
+    unknown = [field for field in requested if field not in RecordingResponse.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(RecordingResponse.model_fields)}"
+        )
+    return requested
+
+
+def _storage_paths_for(recording) -> List[str]:
+    """Storage paths of every file that belongs to a recording"""
+    paths = []
+    if recording.storage_path:
+        paths.append(recording.storage_path)
+    visual_urls = set((recording.visual_assets or {}).values())
+    if recording.visual_summary_url:
+        visual_urls.add(recording.visual_summary_url)
+    paths.extend(storage_service.storage_path_from_url(url) for url in sorted(visual_urls))
+    return paths
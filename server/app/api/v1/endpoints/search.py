@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException, Query, Depends, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 
 from app.models.database import get_db
 from app.models.recording import Recording
+from app.models.transcript_index import TranscriptIndex
+from app.services.transcript_index_service import transcript_index_service
 
 logger = logging.getLogger(__name__)
 
@@ -54,55 +56,14 @@ async def search_recordings(
             )
         ).limit(limit).all()
         
-        results = []
-        for recording in recordings:
-            # Find the best matching excerpt from transcript
-            transcript = recording.transcript_with_speakers or recording.transcript or ""
-            
-            # Find the position of the query in the transcript
-            query_lower = query.lower()
-            transcript_lower = transcript.lower()
-            
-            excerpt = ""
-            similarity = 0.8  # Default similarity for text matches
-            
-            if query_lower in transcript_lower:
-                # Find the position and create an excerpt around it
-                pos = transcript_lower.find(query_lower)
-                start = max(0, pos - 75)  # 75 chars before
-                end = min(len(transcript), pos + len(query) + 75)  # 75 chars after
-                excerpt = transcript[start:end]
-                
-                # Add ellipsis if we truncated
-                if start > 0:
-                    excerpt = "..." + excerpt
-                if end < len(transcript):
-                    excerpt = excerpt + "..."
-                    
-                similarity = 0.9  # Higher similarity for exact matches
-            else:
-                # Fallback to beginning of transcript
-                excerpt = transcript[:150]
-                if len(transcript) > 150:
-                    excerpt += "..."
-            
-            results.append({
-                "chunk_id": recording.id,  # Using recording ID as chunk ID for compatibility
-                "recording_id": recording.id,
-                "recording_title": recording.original_filename,
-                "chunk_text": excerpt,
-                "chunk_index": 0,  # Always 0 since we're not chunking
-                "similarity": similarity,
-                "created_at": recording.created_at.isoformat(),
-                "duration": recording.duration
-            })
+        # Timestamped indexes let each hit point at the moment it was said
+        indexes = transcript_index_service.get_indexes([recording.id for recording in recordings])
         
-        # Sort by relevance (exact filename matches first, then by date)
-        results.sort(key=lambda x: (
-            -1 if query.lower() in x["recording_title"].lower() else 0,
-            -x["similarity"],
-            x["created_at"]
-        ), reverse=True)
+        results = [
+            _build_search_result(recording, query, indexes.get(recording.id))
+            for recording in recordings
+        ]
+        _rank_results(results, query)
         
         logger.info(f"✅ Text search completed - Found {len(results)} results")
         
@@ -118,4 +79,65 @@ async def search_recordings(
         
     except Exception as e:
         logger.error(f"❌ Search failed: {e}")
-        raise HTTPException(status_code=500, detail="Search failed") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Search failed") 
+
+
+def _build_search_result(recording: Recording, query: str, index: Optional[TranscriptIndex]) -> Dict[str, Any]:
+    """Build one search hit with an excerpt around the first match and its playback time"""
+    # Find the best matching excerpt from transcript
+    transcript = recording.transcript_with_speakers or recording.transcript or ""
+    
+    # Find the position of the query in the transcript
+    query_lower = query.lower()
+    transcript_lower = transcript.lower()
+    
+    excerpt = ""
+    similarity = 0.8  # Default similarity for text matches
+    start_time = None
+    
+    # Index offsets refer to the plain transcript, not the speaker-labelled one
+    if index is not None and recording.transcript:
+        match_offset = recording.transcript.lower().find(query_lower)
+        if match_offset >= 0:
+            start_time = transcript_index_service.time_at_offset(index, match_offset)
+    
+    if query_lower in transcript_lower:
+        # Find the position and create an excerpt around it
+        pos = transcript_lower.find(query_lower)
+        start = max(0, pos - 75)  # 75 chars before
+        end = min(len(transcript), pos + len(query) + 75)  # 75 chars after
+        excerpt = transcript[start:end]
+        
+        # Add ellipsis if we truncated
+        if start > 0:
+            excerpt = "..." + excerpt
+        if end < len(transcript):
+            excerpt = excerpt + "..."
+            
+        similarity = 0.9  # Higher similarity for exact matches
+    else:
+        # Fallback to beginning of transcript
+        excerpt = transcript[:150]
+        if len(transcript) > 150:
+            excerpt += "..."
+    
+    return {
+        "chunk_id": recording.id,  # Using recording ID as chunk ID for compatibility
+        "recording_id": recording.id,
+        "recording_title": recording.original_filename,
+        "chunk_text": excerpt,
+        "chunk_index": 0,  # Always 0 since we're not chunking
+        "similarity": similarity,
+        "created_at": recording.created_at.isoformat(),
+        "duration": recording.duration,
+        "start_time": start_time
+    }
+
+
+def _rank_results(results: List[Dict[str, Any]], query: str) -> None:
+    """Sort by relevance in place (exact filename matches first, then by date)"""
+    results.sort(key=lambda x: (
+        -1 if query.lower() in x["recording_title"].lower() else 0,
+        -x["similarity"],
+        x["created_at"]
+    ), reverse=True)
\ No newline at end of file
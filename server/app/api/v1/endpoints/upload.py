@@ -1,13 +1,24 @@
-from fastapi import APIRouter, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, File, UploadFile, Request, Response, Header, HTTPException
 from typing import Any, List
 import logging
 
-from app.models.schemas import FileUploadResponse, MultipleFileUploadResponse, RecordingResponse
-from app.services.storage_service import storage_service
+from app.models.schemas import (
+    FileUploadResponse,
+    MultipleFileUploadResponse,
+    RecordingResponse,
+    UploadSessionCreate,
+    UploadSessionResponse,
+    SignedUploadRequest,
+    SignedUploadResponse,
+    SignedUploadComplete,
+    BasicResponse
+)
+from app.services.storage_service import storage_service, iter_upload_file, iter_local_file
 from app.services.file_service import file_service
 from app.services.recording_service import recording_service
 from app.services.task_service import task_service
-from app.tasks.processing_tasks import process_transcription_task
+from app.services.upload_session_service import upload_session_service
+from app.services.tracing_service import tracing_service
 
 
 logger = logging.getLogger(__name__)
@@ -15,7 +26,9 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-# Background processing moved to app.tasks.processing_tasks
+# Background processing moved to app.tasks.processing_tasks; it is enqueued by
+# path so the API process never imports the task module or the SDKs it uses
+PROCESS_TRANSCRIPTION_TASK = "app.tasks.processing_tasks.process_transcription_task"
 
 
 def should_transcribe(content_type: str) -> bool:
@@ -51,40 +64,20 @@ async def upload_file(
         file_service.validate_file(file)
         logger.info("✅ File validation passed")
         
-        # Read file content
-        file_content = await file.read()
-        logger.info(f"📖 Read {len(file_content)} bytes from file")
-        
-        # Upload to Supabase Storage
-        file_details = storage_service.upload_file(
-            file_content=file_content,
-            filename=file.filename,
-            content_type=file.content_type
-        )
-        logger.info("☁️  File uploaded to storage successfully")
-        
-        # Create recording entry in database
-        recording = recording_service.create_recording(
-            original_filename=file_details['original_filename'],
-            media_url=file_details['public_url'],
-            storage_path=file_details['storage_path'],
-            file_size=file_details['file_size'],
-            content_type=file_details['content_type']
-        )
-        logger.info(f"📝 Recording entry created with ID: {recording.id}")
-        
-        # Start transcription and analysis process if it's an audio/video file
-        if should_transcribe(file.content_type or ""):
-            logger.info(f"🎤 Scheduling transcription and analysis for {file.filename}")
-            job_id = task_service.enqueue_task(
-                process_transcription_task,
-                recording.id,
-                file_details['public_url'],
-                file_content
-            )
-            logger.info(f"📋 Task queued with job ID: {job_id}")
-        else:
-            logger.info(f"⏭️  Skipping transcription for {file.content_type} file")
+        # The upload span roots the trace that follows the recording through the workers
+        with tracing_service.span("upload", filename=file.filename, size=file.size):
+            # Stream to storage without buffering the whole file in memory
+            with tracing_service.span("storage.upload"):
+                file_details = await storage_service.upload_stream(
+                    iter_upload_file(file),
+                    filename=file.filename,
+                    content_type=file.content_type,
+                    file_size=file.size
+                )
+            logger.info("☁️  File uploaded to storage successfully")
+            
+            # Create recording entry and schedule transcription for audio/video files
+            recording = _create_recording_and_schedule(file_details)
         
         logger.info(f"✅ Single file upload completed: {file.filename}")
         return RecordingResponse.from_orm(recording)
@@ -126,40 +119,17 @@ async def upload_multiple_files(
             file_service.validate_file(file)
             logger.debug("✅ File validation passed")
             
-            # Read file content
-            file_content = await file.read()
-            logger.debug(f"📖 Read {len(file_content)} bytes from file")
-            
-            # Upload to Supabase Storage
-            file_details = storage_service.upload_file(
-                file_content=file_content,
+            # Stream to storage without buffering the whole file in memory
+            file_details = await storage_service.upload_stream(
+                iter_upload_file(file),
                 filename=file.filename,
-                content_type=file.content_type
+                content_type=file.content_type,
+                file_size=file.size
             )
             logger.debug("☁️  File uploaded to storage successfully")
             
-            # Create recording entry in database
-            recording = recording_service.create_recording(
-                original_filename=file_details['original_filename'],
-                media_url=file_details['public_url'],
-                storage_path=file_details['storage_path'],
-                file_size=file_details['file_size'],
-                content_type=file_details['content_type']
-            )
-            logger.debug(f"📝 Recording entry created with ID: {recording.id}")
-            
-            # Start transcription and analysis process if it's an audio/video file
-            if should_transcribe(file.content_type or ""):
-                logger.info(f"🎤 Scheduling transcription and analysis for {file.filename}")
-                job_id = task_service.enqueue_task(
-                    process_transcription_task,
-                    recording.id,
-                    file_details['public_url'],
-                    file_content
-                )
-                logger.info(f"📋 Task queued with job ID: {job_id}")
-            else:
-                logger.debug(f"⏭️  Skipping transcription for {file.content_type} file")
+            # Create recording entry and schedule transcription for audio/video files
+            _create_recording_and_schedule(file_details)
             
             uploaded_files.append(file_details)
             logger.info(f"✅ Successfully processed file {i+1}/{len(files)}: {file.filename}")
@@ -181,4 +151,207 @@ async def upload_multiple_files(
         failed_uploads=len(failed_files),
         file_details=uploaded_files,
         failed_files=failed_files
-    ) 
\ No newline at end of file
+    )
+
+
+def _set_upload_headers(response: Response, session: dict) -> None:
+    """Expose tus-style offset headers so clients can resume without parsing JSON"""
+    response.headers["Upload-Offset"] = str(session["offset"])
+    response.headers["Upload-Length"] = str(session["total_size"])
+    response.headers["Cache-Control"] = "no-store"
+
+
+@router.post("/uploads", response_model=UploadSessionResponse, status_code=201)
+async def create_upload_session(
+    session_data: UploadSessionCreate,
+    response: Response
+) -> Any:
+    """
+    Start a resumable upload
+    
+    The client then sends the file body in one or more PATCH requests to
+    /uploads/{upload_id}, each carrying the current offset in the
+    Upload-Offset header.
+    """
+    logger.info(f"📦 Starting resumable upload: {session_data.filename} ({session_data.total_size} bytes)")
+    
+    content_type = file_service.validate_upload_metadata(
+        filename=session_data.filename,
+        file_size=session_data.total_size,
+        content_type=session_data.content_type
+    )
+    
+    session = upload_session_service.create_session(
+        filename=session_data.filename,
+        total_size=session_data.total_size,
+        content_type=content_type
+    )
+    _set_upload_headers(response, session)
+    response.headers["Location"] = f"/api/v1/uploads/{session['upload_id']}"
+    return session
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def get_upload_session(upload_id: str, response: Response) -> Any:
+    """Get the progress of a resumable upload"""
+    session = upload_session_service.get_session(upload_id)
+    _set_upload_headers(response, session)
+    return session
+
+
+@router.head("/uploads/{upload_id}")
+async def head_upload_session(upload_id: str) -> Response:
+    """Get the current offset of a resumable upload from headers only"""
+    session = upload_session_service.get_session(upload_id)
+    response = Response(status_code=200)
+    _set_upload_headers(response, session)
+    return response
+
+
+@router.patch("/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def append_upload_chunk(
+    upload_id: str,
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    upload_offset: int = Header(..., alias="Upload-Offset")
+) -> Any:
+    """
+    Append a chunk to a resumable upload
+    
+    The request body is streamed straight to the staging area. Once the final
+    byte lands the session reports completing=true and the file is moved to
+    storage after the response is sent; the client polls GET /uploads/{upload_id}
+    until completed is set along with recording_id. Repeating the final PATCH
+    returns the current state and never creates a second recording.
+    """
+    session = await upload_session_service.append_chunk(
+        upload_id=upload_id,
+        offset=upload_offset,
+        chunks=request.stream()
+    )
+    
+    if session["offset"] == session["total_size"] and upload_session_service.begin_completion(upload_id):
+        logger.info(f"📦 Final chunk received for upload {upload_id}, moving file to storage")
+        background_tasks.add_task(_complete_upload, upload_id, session)
+        session = upload_session_service.get_session(upload_id)
+    
+    _set_upload_headers(response, session)
+    return session
+
+
+async def _complete_upload(upload_id: str, session: dict) -> None:
+    """Move a fully received upload to storage and create its recording"""
+    try:
+        file_details = await storage_service.upload_stream(
+            iter_local_file(upload_session_service.get_assembled_path(upload_id)),
+            filename=session["filename"],
+            content_type=session["content_type"],
+            file_size=session["total_size"]
+        )
+        recording = _create_recording_and_schedule(file_details)
+        upload_session_service.mark_completed(upload_id, recording.id)
+    except Exception as e:
+        logger.error(f"❌ Failed to complete upload {upload_id}: {e}")
+        upload_session_service.fail_completion(upload_id, str(e))
+
+
+@router.delete("/uploads/{upload_id}", response_model=BasicResponse)
+async def cancel_upload_session(upload_id: str) -> Any:
+    """Abort a resumable upload and discard its staged bytes"""
+    if not upload_session_service.delete_session(upload_id):
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return BasicResponse(message="Upload session cancelled", status="success")
+
+
+@router.post("/uploads/signed", response_model=SignedUploadResponse)
+async def create_signed_upload(upload_request: SignedUploadRequest) -> Any:
+    """
+    Issue a signed URL so the client can upload straight to the storage bucket
+    
+    Once the upload has finished the client calls /uploads/signed/complete
+    with the returned storage_path to create the recording.
+    """
+    logger.info(f"✍️  Signed upload requested: {upload_request.filename} ({upload_request.file_size} bytes)")
+    
+    content_type = file_service.validate_upload_metadata(
+        filename=upload_request.filename,
+        file_size=upload_request.file_size,
+        content_type=upload_request.content_type
+    )
+    
+    signed = storage_service.create_signed_upload_url(upload_request.filename)
+    return SignedUploadResponse(
+        storage_path=signed['storage_path'],
+        signed_url=signed['signed_url'],
+        token=signed['token'],
+        content_type=content_type
+    )
+
+
+@router.post("/uploads/signed/complete", response_model=RecordingResponse)
+async def complete_signed_upload(completion: SignedUploadComplete) -> Any:
+    """Create the recording for a direct-to-storage upload and queue its processing"""
+    logger.info(f"📬 Signed upload completed: {completion.storage_path}")
+    
+    if not completion.storage_path.startswith("uploads/") or ".." in completion.storage_path:
+        raise HTTPException(status_code=400, detail="Invalid storage path")
+    
+    # Completion callbacks may be retried by the client; don't create duplicates
+    existing = recording_service.get_recording_by_storage_path(completion.storage_path)
+    if existing:
+        return RecordingResponse.from_orm(existing)
+    
+    metadata = storage_service.get_file_metadata(completion.storage_path)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="Uploaded file not found in storage")
+    
+    content_type = file_service.validate_upload_metadata(
+        filename=completion.filename,
+        file_size=metadata['file_size'] or 0,
+        content_type=completion.content_type or metadata['content_type']
+    )
+    
+    file_details = {
+        'original_filename': completion.filename,
+        'storage_path': completion.storage_path,
+        'public_url': metadata['public_url'],
+        'file_size': metadata['file_size'],
+        'content_type': content_type
+    }
+    recording = _create_recording_and_schedule(file_details)
+    return RecordingResponse.from_orm(recording)
+
+
+def _create_recording_and_schedule(file_details: dict):
+    """
+    Create the recording entry for stored media and queue its processing
+    
+    Only the storage path is queued; the worker fetches the media itself so
+    file bytes never pass through Redis.
+    """
+    with tracing_service.span("recording.schedule", storage_path=file_details['storage_path']):
+        recording = recording_service.create_recording(
+            original_filename=file_details['original_filename'],
+            media_url=file_details['public_url'],
+            storage_path=file_details['storage_path'],
+            file_size=file_details['file_size'],
+            content_type=file_details['content_type']
+        )
+        logger.info(f"📝 Recording entry created with ID: {recording.id}")
+        tracing_service.set_attribute("recording_id", recording.id)
+        
+        if should_transcribe(file_details['content_type'] or ""):
+            logger.info(f"🎤 Scheduling transcription and analysis for {file_details['original_filename']}")
+            job_id = task_service.enqueue_task(
+                PROCESS_TRANSCRIPTION_TASK,
+                recording.id,
+                file_details['public_url'],
+                storage_path=file_details['storage_path'],
+                trace_context=tracing_service.current_context()
+            )
+            logger.info(f"📋 Task queued with job ID: {job_id}")
+        else:
+            logger.info(f"⏭️  Skipping transcription for {file_details['content_type']} file")
+    
+    return recording
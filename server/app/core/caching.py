@@ -0,0 +1,39 @@
+from fastapi import Request, Response
+import hashlib
+from typing import Any
+
+# Clients may store responses but must revalidate them with If-None-Match
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the values that identify a representation
+    
+    Weak because SelectiveGZipMiddleware may compress the body after the
+    validator is set: the identity and gzip encodings are semantically
+    equivalent but not byte-identical, which a strong ETag would promise.
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Check whether the client's If-None-Match already matches the current ETag (weak comparison)"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified_response(etag: str) -> Response:
+    """Empty 304 response carrying the validator"""
+    return Response(status_code=304, headers=cache_headers(etag))
+
+
+def cache_headers(etag: str) -> dict:
+    """Headers attached to every cacheable response"""
+    return {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
@@ -1,4 +1,6 @@
 import os
+import secrets
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -19,12 +21,83 @@ class Settings(BaseSettings):
     supabase_service_key: Optional[str] = None
     storage_bucket_name: Optional[str] = None
     
+    # Storage Backend Settings
+    storage_backend: str = "supabase"  # "supabase" or "local"
+    local_storage_path: str = "./storage"  # Root directory for the local backend
+    local_storage_public_url: str = "http://localhost:8000/api/v1/media"  # Base URL local files are served from
+    # Signs local upload URLs; set explicitly when running more than one API process
+    storage_signing_secret: str = Field(default_factory=lambda: secrets.token_hex(32))
+    signed_upload_ttl_seconds: int = 7200
+    
+    # Async storage client pooling (Supabase backend)
+    storage_max_connections: int = 20
+    storage_max_keepalive_connections: int = 10
+    storage_keepalive_expiry_seconds: float = 30.0
+    storage_timeout_seconds: float = 300.0  # Large media uploads can take minutes
+    
     # OpenAI Settings
     openai_api_key: Optional[str] = None
+    openai_base_url: Optional[str] = None  # Override the API endpoint, e.g. the load-test stand-in in benchmarks/
+    
+    # LLM Prompt Budget Settings (token counts; longer transcripts keep only their most informative segments)
+    analysis_max_input_tokens: int = 24000  # Transcript tokens per analysis request, below the model's context window
+    labeling_max_transcript_tokens: int = 1000  # Transcript excerpt sent along with the labeling rules
+    
+    # LLM Model Routing Settings (per task, by input size, recording duration and latency SLO)
+    llm_fast_model: str = "gpt-4o-mini"  # Short meetings and small prompts
+    llm_quality_model: str = "gpt-4o"  # Long meetings, unless it would miss the latency SLO
+    llm_fallback_model: str = "gpt-4o-mini"  # Retried once when the routed model times out or is overloaded
+    llm_fast_max_input_tokens: int = 4000
+    llm_fast_max_duration_seconds: float = 1200.0  # Recordings up to 20 minutes
+    llm_latency_slo_seconds: dict[str, float] = {  # Target time for one completion, per task
+        "analysis": 120.0,  # Background processing
+        "analysis_fallback": 60.0,
+        "labeling": 15.0,  # Interactive, a user is waiting
+    }
+    llm_timeout_slo_multiple: float = 2.0  # Request timeout, as a multiple of the SLO
+    llm_route_overrides: dict[str, str] = {}  # Pin a task to a model, e.g. {"labeling": "gpt-4o"}
+    
+    # Transcript Compression Settings (local, extractive; runs before analysis and labeling)
+    transcript_compression_enabled: bool = True
+    transcript_compression_ratio: float = 0.6  # Fraction of the transcript's characters kept
+    transcript_compression_min_chars: int = 4000  # Shorter transcripts only get filler removal
+    
+    # Visual Summary Settings (decision flowchart rendered locally by the worker)
+    visual_summary_raster_format: str = "png"  # "png" or "webp"; an SVG is always stored alongside
+    visual_summary_max_items: int = 8  # Decisions and action items drawn per lane; the rest become "+N more"
+    visual_summary_illustration_enabled: bool = False  # Also request a DALL·E 3 illustration in a background job
+    
+    # Media Derivatives Settings (WebP and thumbnail variants stored with every generated image)
+    image_thumbnail_width: int = 320  # Pixels; list views load this instead of the full image
+    image_webp_quality: int = 85
+    image_cache_max_age_seconds: int = 365 * 24 * 3600  # Generated images get unique paths and never change
     
     # HuggingFace Settings (for speaker diarization)
     huggingface_access_token: Optional[str] = None
     
+    # Speaker Diarization Settings (served by dedicated workers: python worker.py diarization)
+    diarization_enabled: bool = True  # Also requires huggingface_access_token
+    diarization_threads: int = 2  # torch CPU threads per diarization worker
+    diarization_timeout_seconds: int = 1800
+    
+    # Transcription Backend Settings (local backend served by: python worker.py transcription-local)
+    transcription_backend: str = "openai"  # "openai", "local", or "auto" (local for short recordings)
+    local_transcription_model: str = "small"  # faster-whisper model size or path to a CTranslate2 model
+    local_transcription_compute_type: str = "int8"  # CTranslate2 quantization used on CPU
+    local_transcription_threads: int = 4  # CPU threads per local transcription worker
+    local_transcription_batch_size: int = 4  # Short recordings transcribed together by one worker
+    local_transcription_max_bytes: int = 10 * 1024 * 1024  # "auto" sends larger files to the Whisper API
+    local_transcription_max_seconds: float = 600.0  # Same cut-off by duration, when it is known up front
+    local_transcription_timeout_seconds: int = 600
+    
+    # Media Ingest Settings (probe and waveform peaks before transcription; needs ffmpeg/ffprobe on the worker)
+    media_ingest_enabled: bool = True
+    ffmpeg_path: str = "ffmpeg"
+    ffprobe_path: str = "ffprobe"
+    waveform_peak_count: int = 1000  # Buckets per recording, stored as one byte each
+    waveform_sample_rate: int = 8000  # Audio is decoded to mono at this rate for the peaks
+    media_ingest_timeout_seconds: float = 300.0
+    
     # Database Settings (PostgreSQL via Supabase)
     database_url: Optional[str] = None
     postgres_db: Optional[str] = None
@@ -50,11 +123,49 @@ class Settings(BaseSettings):
             
         return f"postgresql://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
     
+    # Health Check Settings
+    health_check_interval_seconds: float = 15.0  # How often dependencies are probed in the background
+    health_check_timeout_seconds: float = 5.0
+    health_critical_checks: list[str] = ["database", "storage"]  # Checks that gate readiness
+    
+    # Logging Settings
+    log_level: str = "INFO"
+    log_format: str = "json"  # "json" for structured output, "text" for the classic line format
+    log_to_file: bool = True  # Also write kirki_app_YYYYMMDD.log next to stdout
+    log_levels: dict[str, str] = {
+        "sqlalchemy.engine": "WARNING",  # INFO logs every SQL statement
+        "uvicorn.access": "WARNING",  # Requests are already logged by the request middleware
+        "httpx": "WARNING",
+    }
+    request_log_slow_ms: float = 1000.0  # Slower requests are always logged
+    request_log_sample_rates: dict[str, float] = {  # Route template -> fraction of requests logged (default 1.0)
+        "/api/v1/health": 0.01,
+        "/api/v1/health/live": 0.01,
+        "/api/v1/health/ready": 0.01,
+        "/api/v1/metrics": 0.01,
+        "/api/v1/uploads/{upload_id}": 0.1,
+    }
+    
+    # Metrics Settings
+    metrics_enabled: bool = True  # Exposed at /api/v1/metrics in Prometheus text format
+    
+    # Tracing Settings
+    tracing_enabled: bool = True
+    trace_export_path: str = "kirki_traces.jsonl"  # Finished spans as JSON lines; empty disables the file export
+    
     # CORS Settings
     cors_origins: list[str] = ["*"]
     cors_methods: list[str] = ["*"]
     cors_headers: list[str] = ["*"]
     
+    # Response Compression Settings
+    gzip_minimum_size: int = 1024  # Smaller bodies are sent uncompressed
+    gzip_compress_level: int = 6
+    compression_excluded_paths: list[str] = [  # Byte-range media must not be re-encoded; streams must not be buffered
+        "/api/v1/media",
+        "/api/v1/labeling/stream",
+    ]
+    
     # File Upload Settings
     max_file_size: int = 500 * 1024 * 1024  # 500MB
     allowed_file_types: list[str] = [
@@ -69,7 +180,11 @@ class Settings(BaseSettings):
         "application/pdf", "text/plain", "application/json",
         "application/msword", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
     ]
-    
+
+    # Resumable Upload Settings
+    upload_staging_dir: str = "/tmp/kirki_uploads"  # Local staging area for in-flight chunked uploads
+    upload_session_ttl_hours: int = 24  # Incomplete sessions older than this are discarded
+
     class Config:
         env_file = [".env", "../.env", "../../.env"]  # Check multiple paths
         case_sensitive = False
@@ -0,0 +1,101 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core.config import settings
+from app.services.tracing_service import tracing_service
+
+# Attributes every LogRecord has; anything else was passed via extra= and is emitted as a field
+_STANDARD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any extra= fields and the active trace ID"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "function": f"{record.funcName}:{record.lineno}",
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TraceContextFilter(logging.Filter):
+    """Stamp records with the current trace ID while still on the logging thread"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = tracing_service.current_context()
+        if context:
+            record.trace_id = context["trace_id"]
+        return True
+
+
+def setup_logging(log_file: Optional[str] = None, use_queue: bool = True) -> None:
+    """
+    Configure root logging from settings
+    
+    With use_queue the calling thread only enqueues records; formatting and
+    I/O happen on a background listener thread. Forking RQ workers pass
+    use_queue=False because the listener thread does not survive fork().
+    
+    Args:
+        log_file: Optional file to write alongside stdout
+        use_queue: Hand records to a background listener instead of writing inline
+    """
+    global _listener
+    
+    formatter = JsonFormatter() if settings.log_format == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.setLevel(logging.DEBUG if settings.debug else settings.log_level.upper())
+    
+    if use_queue:
+        if _listener is not None:
+            _listener.stop()
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.addFilter(TraceContextFilter())
+        root.addHandler(queue_handler)
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    else:
+        for handler in handlers:
+            handler.addFilter(TraceContextFilter())
+            root.addHandler(handler)
+    
+    # Per-module overrides, e.g. keep sqlalchemy.engine from logging every statement
+    for name, level in settings.log_levels.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
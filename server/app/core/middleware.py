@@ -1,12 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import time
 import logging
+import random
 from starlette.requests import Request
 from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.core.config import settings
+from app.services.metrics_service import metrics_service
 
 logger = logging.getLogger(__name__)
 
@@ -31,25 +35,66 @@ def setup_trusted_hosts(app: FastAPI) -> None:
         )
 
 
-async def log_requests(request: Request, call_next):
-    """Middleware to log all requests"""
-    start_time = time.time()
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """Gzip responses for clients that accept it, except on excluded path prefixes"""
     
-    # Log request
-    logger.info(f"Request: {request.method} {request.url}")
+    def __init__(self, app: ASGIApp, excluded_paths: list[str], **kwargs) -> None:
+        super().__init__(app, **kwargs)
+        self.excluded_paths = tuple(excluded_paths)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+def setup_compression(app: FastAPI) -> None:
+    """Setup negotiated gzip compression for large JSON bodies such as transcripts"""
+    app.add_middleware(
+        SelectiveGZipMiddleware,
+        excluded_paths=settings.compression_excluded_paths,
+        minimum_size=settings.gzip_minimum_size,
+        compresslevel=settings.gzip_compress_level,
+    )
+
+
+def should_log_request(route_path: str, status_code: int, process_time: float) -> bool:
+    """Errors and slow requests are always logged; high-volume routes are sampled"""
+    if status_code >= 500 or process_time * 1000 >= settings.request_log_slow_ms:
+        return True
+    sample_rate = settings.request_log_sample_rates.get(route_path, 1.0)
+    return sample_rate >= 1.0 or random.random() < sample_rate
+
+
+async def log_requests(request: Request, call_next):
+    """Middleware to time, measure and (sampled) log every request"""
+    start_time = time.perf_counter()
     
     # Process request
     response: Response = await call_next(request)
     
     # Calculate processing time
-    process_time = time.time() - start_time
+    process_time = time.perf_counter() - start_time
     
-    # Log response
-    logger.info(
-        f"Response: {response.status_code} - "
-        f"Time: {process_time:.4f}s - "
-        f"Path: {request.url.path}"
-    )
+    # Label by route template rather than raw path to keep metric cardinality bounded
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", "unmatched")
+    metrics_service.observe_request(request.method, route_path, response.status_code, process_time)
+    
+    # One line per request, formatted lazily and only when it will be emitted
+    if logger.isEnabledFor(logging.INFO) and should_log_request(route_path, response.status_code, process_time):
+        logger.info(
+            "%s %s %s %.1fms",
+            request.method, request.url.path, response.status_code, process_time * 1000,
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "route": route_path,
+                "status": response.status_code,
+                "duration_ms": round(process_time * 1000, 2)
+            }
+        )
     
     # Add processing time to response headers
     response.headers["X-Process-Time"] = str(process_time)
@@ -66,4 +111,7 @@ def setup_middleware(app: FastAPI) -> None:
     setup_cors(app)
     
     # Trusted hosts middleware
-    setup_trusted_hosts(app) 
\ No newline at end of file
+    setup_trusted_hosts(app)
+    
+    # Compression middleware (outermost, so it sees the final response body)
+    setup_compression(app) 
\ No newline at end of file
@@ -1,29 +1,22 @@
 from fastapi import FastAPI, HTTPException
 import logging
-import sys
 from datetime import datetime
 
 from app.core.config import settings
+from app.core.logging_config import setup_logging, shutdown_logging
 from app.core.middleware import setup_middleware
 from app.core.exceptions import http_exception_handler, general_exception_handler
 from app.api.v1.api import api_router
 from app.models.database import engine, Base
+from app.services.storage_service import storage_service
+from app.services.health_service import health_service
 
-# Configure comprehensive logging
-logging.basicConfig(
-    level=logging.INFO if not settings.debug else logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler(f"kirki_app_{datetime.now().strftime('%Y%m%d')}.log")
-    ]
+# Configure logging; records are written by a background listener thread so
+# request handlers never block on stdout or file I/O
+setup_logging(
+    log_file=f"kirki_app_{datetime.now().strftime('%Y%m%d')}.log" if settings.log_to_file else None
 )
 
-# Set specific log levels for different modules
-logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
-logging.getLogger("uvicorn.access").setLevel(logging.INFO)
-logging.getLogger("httpx").setLevel(logging.WARNING)
-
 logger = logging.getLogger(__name__)
 
 
@@ -68,11 +61,17 @@ def create_application() -> FastAPI:
         except Exception as e:
             logger.error(f"❌ Failed to create database tables: {e}")
             raise e
+        
+        # Dependency checks run in the background; probes read the cached results
+        await health_service.start()
     
     # Add shutdown event
     @app.on_event("shutdown")
     async def shutdown_event():
         logger.info("Shutting down application")
+        await health_service.stop()
+        await storage_service.aclose()
+        shutdown_logging()
     
     return app
 
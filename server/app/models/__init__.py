@@ -1,4 +1,6 @@
 # Import all models to ensure they are properly registered with SQLAlchemy
 from .recording import Recording
+from .transcript_index import TranscriptIndex
+from .media_probe import MediaProbe
 
-__all__ = ["Recording"]
\ No newline at end of file
+__all__ = ["Recording", "TranscriptIndex", "MediaProbe"]
\ No newline at end of file
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Float, LargeBinary, DateTime, ForeignKey
+from datetime import datetime
+
+from app.models.database import Base
+
+
+class MediaProbe(Base):
+    """Container/stream details and waveform peaks of a recording, taken at ingest"""
+    __tablename__ = "media_probes"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    recording_id = Column(Integer, ForeignKey("recordings.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    format_name = Column(String)  # Container, e.g. "mov,mp4,m4a,3gp,3g2,mj2"
+    duration = Column(Float)  # Seconds
+    bit_rate = Column(Integer)  # Overall bits per second
+    audio_codec = Column(String)
+    channels = Column(Integer)
+    sample_rate = Column(Integer)
+    video_codec = Column(String)  # None for audio-only media
+    peaks = Column(LargeBinary)  # One uint8 per bucket, 255 = loudest point of the recording
+    peak_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
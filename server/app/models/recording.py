@@ -22,8 +22,11 @@ class Recording(Base):
     summary = Column(Text)  # Meeting/recording summary
     action_items = Column(JSON)  # List of action items with details
     decisions = Column(JSON)  # List of decisions with owners
-    visual_summary_url = Column(String)  # DALL·E 3 generated visual summary
+    visual_summary_url = Column(String)  # Decision flowchart image shown for the recording
+    visual_assets = Column(JSON)  # Public URL per stored visual, e.g. {"svg": ..., "png": ..., "illustration": ...}
     labels = Column(JSON)  # List of applied labels based on rules
+    processing_timings = Column(JSON)  # Seconds spent per pipeline span, e.g. {"queue.wait": 2.1, "stage.transcribe": 61.4}
+    llm_usage = Column(JSON)  # OpenAI calls, tokens and model route per operation, e.g. {"openai.analysis": {"calls": 1, "prompt_tokens": 9120, "model": "gpt-4o", "tier": "quality", ...}}
     
     processing_status = Column(String, default="pending")  # pending, processing, completed, failed
     processing_error = Column(Text)
@@ -28,11 +28,56 @@ class MultipleFileUploadResponse(BaseModel):
     failed_files: List[dict]
 
 
+class UploadSessionCreate(BaseModel):
+    """Request model for starting a resumable upload"""
+    filename: str = Field(..., min_length=1)
+    total_size: int = Field(..., gt=0)
+    content_type: Optional[str] = None
+
+
+class UploadSessionResponse(BaseModel):
+    """State of a resumable upload session"""
+    upload_id: str
+    filename: str
+    content_type: Optional[str]
+    total_size: int
+    offset: int
+    progress: float
+    completed: bool
+    completing: bool = False  # Fully received and being moved to storage
+    error: Optional[str] = None  # Why the last completion attempt failed
+    recording_id: Optional[int] = None
+    created_at: str
+
+
+class SignedUploadRequest(BaseModel):
+    """Request model for a direct-to-storage upload URL"""
+    filename: str = Field(..., min_length=1)
+    file_size: int = Field(..., gt=0)
+    content_type: Optional[str] = None
+
+
+class SignedUploadResponse(BaseModel):
+    """Signed URL the client uploads the file body to"""
+    storage_path: str
+    signed_url: str
+    token: str
+    content_type: Optional[str]
+
+
+class SignedUploadComplete(BaseModel):
+    """Completion callback sent once a direct-to-storage upload has finished"""
+    storage_path: str = Field(..., min_length=1)
+    filename: str = Field(..., min_length=1)
+    content_type: Optional[str] = None
+
+
 class HealthResponse(BaseModel):
     """Health check response model"""
     api: str = "healthy"
     storage: str
     timestamp: str
+    checks: Dict[str, Dict[str, Any]] = {}
 
 
 class ErrorResponse(BaseModel):
@@ -87,11 +132,14 @@ class RecordingResponse(BaseModel):
     action_items: Optional[List[Dict[str, Any]]]
     decisions: Optional[List[Dict[str, Any]]]
     visual_summary_url: Optional[str]
+    visual_assets: Optional[Dict[str, str]] = None
     labels: Optional[List[AppliedLabel]] = None
     
     processing_status: str
     processing_error: Optional[str]
     duration: Optional[float]
+    processing_timings: Optional[Dict[str, float]] = None
+    llm_usage: Optional[Dict[str, Dict[str, Any]]] = None
     created_at: datetime
     updated_at: datetime
     
@@ -99,6 +147,35 @@ class RecordingResponse(BaseModel):
         from_attributes = True
 
 
+class TranscriptSegment(BaseModel):
+    """A timestamped slice of a transcript"""
+    index: int
+    start: float
+    end: float
+    speaker: Optional[str] = None
+    text: str
+
+
+class TranscriptRangeResponse(BaseModel):
+    """Transcript segments of a recording within a time or segment range"""
+    recording_id: int
+    total_segments: int
+    segments: List[TranscriptSegment]
+
+
+class WaveformResponse(BaseModel):
+    """Media details and downsampled waveform of a recording, for rendering a player without the media"""
+    recording_id: int
+    duration: Optional[float]
+    format_name: Optional[str]
+    bit_rate: Optional[int]
+    audio_codec: Optional[str]
+    channels: Optional[int]
+    sample_rate: Optional[int]
+    video_codec: Optional[str]
+    peaks: List[int]  # 0-255, evenly spaced over the duration
+
+
 class LabelingRuleCreate(BaseModel):
     """Schema for creating a new labeling rule"""
     label_name: str = Field(..., min_length=1, max_length=100)
@@ -132,4 +209,15 @@ class LabelingRuleResponse(BaseModel):
 class RecordingListResponse(BaseModel):
     """Recording list response model"""
     recordings: List[RecordingResponse]
-    total: int 
\ No newline at end of file
+    total: int
+
+
+class BulkDeleteRequest(BaseModel):
+    """Request model for deleting several recordings at once"""
+    recording_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
+class BulkDeleteResponse(BaseModel):
+    """Result of a bulk recording delete"""
+    deleted: int
+    not_found: List[int]
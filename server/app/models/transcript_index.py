@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, LargeBinary, DateTime, JSON, ForeignKey
+from datetime import datetime
+
+from app.models.database import Base
+
+
+class TranscriptIndex(Base):
+    """Timestamped word and segment index of a recording's transcript"""
+    __tablename__ = "transcript_indexes"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    recording_id = Column(Integer, ForeignKey("recordings.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    speakers = Column(JSON)  # Speaker labels; words and segments store indexes into this list
+    segments = Column(JSON)  # Columnar: {"start": [...], "end": [...], "speaker": [...], "text_start": [...], "text_end": [...]}
+    words = Column(LargeBinary)  # Packed little-endian records, see transcript_index_service.WORD_DTYPE
+    word_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
@@ -1,12 +1,20 @@
 import logging
 import json
-from typing import Dict, List, Optional, Any
-from openai import OpenAI
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 
 from app.core.config import settings
+from app.services.openai_client import get_openai_client
+from app.services.model_router import model_router
+from app.services.prompt_budget import count_message_tokens, count_tokens, fit_to_budget, input_budget
+from app.services.transcript_compression import compress_transcript
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
+FALLBACK_PROMPT = "Please provide a concise 2-3 paragraph summary of this transcript:\n\n"
+
 
 class AnalysisService:
     """Service for analyzing transcripts to extract insights"""
@@ -14,20 +22,27 @@ class AnalysisService:
     def __init__(self):
         logger.info("🧠 Initializing AnalysisService")
         
-        if settings.openai_api_key:
-            self.openai_client = OpenAI(api_key=settings.openai_api_key)
-            logger.info("✅ OpenAI client initialized for analysis")
-        else:
-            self.openai_client = None
+        if not settings.openai_api_key:
             logger.warning("⚠️  OpenAI API key not configured - analysis will not be available")
     
-    async def analyze_transcript(self, transcript: str, transcript_with_speakers: Optional[str] = None) -> Dict[str, Any]:
+    @property
+    def openai_client(self) -> Optional["OpenAI"]:
+        """Shared OpenAI client, created on first use"""
+        return get_openai_client()
+    
+    async def analyze_transcript(
+        self,
+        transcript: str,
+        transcript_with_speakers: Optional[str] = None,
+        duration: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Analyze transcript to extract summary, action items, and decisions
         
         Args:
             transcript: Raw transcript text
             transcript_with_speakers: Speaker-diarized transcript (preferred if available)
+            duration: Recording duration in seconds, used to pick the model
             
         Returns:
             Dict containing analysis results
@@ -56,8 +71,11 @@ class AnalysisService:
         logger.info(f"🔍 Starting transcript analysis ({len(text_to_analyze)} characters)")
         
         try:
+            # Drop fillers, repeats and low-information sentences before paying for tokens
+            text_to_analyze = compress_transcript(text_to_analyze)
+            
             # Create comprehensive analysis prompt
-            analysis_result = await self._perform_comprehensive_analysis(text_to_analyze)
+            analysis_result = await self._perform_comprehensive_analysis(text_to_analyze, duration)
             logger.info("✅ Transcript analysis completed successfully")
             return analysis_result
             
@@ -70,7 +88,7 @@ class AnalysisService:
                 "error": str(e)
             }
     
-    async def _perform_comprehensive_analysis(self, transcript: str) -> Dict[str, Any]:
+    async def _perform_comprehensive_analysis(self, transcript: str, duration: Optional[float] = None) -> Dict[str, Any]:
         """Perform comprehensive analysis using OpenAI GPT"""
         
         system_prompt = """You are an AI assistant specialized in analyzing meeting transcripts and recordings. Your task is to:
@@ -108,22 +126,32 @@ Guidelines:
 - Keep descriptions concise but informative
 - Focus on business outcomes and next steps"""
 
-        user_prompt = f"""Please analyze this transcript and extract the summary, action items, and decisions:
+        user_prompt = """Please analyze this transcript and extract the summary, action items, and decisions:
 
 TRANSCRIPT:
 {transcript}
 
 Return only valid JSON in the specified format."""
 
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt.format(transcript="")}
+        ]
+        prompt_tokens = count_message_tokens(messages, settings.llm_quality_model)
+        route = model_router.route(
+            "analysis",
+            prompt_tokens + min(count_tokens(transcript, settings.llm_quality_model), settings.analysis_max_input_tokens),
+            duration
+        )
+        budget = input_budget(route.model, prompt_tokens, route.max_tokens, cap=settings.analysis_max_input_tokens)
+        messages[1]["content"] = user_prompt.format(transcript=fit_to_budget(transcript, budget, route.model))
+
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",  # Use GPT-4 for better analysis quality
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3,  # Lower temperature for more consistent output
-                max_tokens=2000,
+            response = model_router.create_completion(
+                self.openai_client.chat.completions.create,
+                route,
+                "analysis",
+                messages=messages,
                 response_format={"type": "json_object"}  # Ensure JSON response
             )
             
@@ -140,25 +168,33 @@ Return only valid JSON in the specified format."""
             
         except json.JSONDecodeError as e:
             logger.error(f"❌ Failed to parse analysis JSON: {e}")
-            return await self._fallback_analysis(transcript)
+            return await self._fallback_analysis(transcript, duration)
         except Exception as e:
             logger.error(f"❌ OpenAI analysis failed: {e}")
             raise e
     
-    async def _fallback_analysis(self, transcript: str) -> Dict[str, Any]:
+    async def _fallback_analysis(self, transcript: str, duration: Optional[float] = None) -> Dict[str, Any]:
         """Fallback analysis with simpler prompts if JSON parsing fails"""
         logger.info("🔄 Attempting fallback analysis with simpler prompts")
         
+        prompt_tokens = count_message_tokens([{"role": "user", "content": FALLBACK_PROMPT}], settings.llm_quality_model)
+        route = model_router.route(
+            "analysis_fallback",
+            prompt_tokens + min(count_tokens(transcript, settings.llm_quality_model), settings.analysis_max_input_tokens),
+            duration
+        )
+        budget = input_budget(route.model, prompt_tokens, route.max_tokens, cap=settings.analysis_max_input_tokens)
+        
         try:
             # Simple summary
-            summary_response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
+            summary_response = model_router.create_completion(
+                self.openai_client.chat.completions.create,
+                route,
+                "analysis_fallback",
                 messages=[{
                     "role": "user", 
-                    "content": f"Please provide a concise 2-3 paragraph summary of this transcript:\n\n{transcript}"
-                }],
-                temperature=0.3,
-                max_tokens=500
+                    "content": FALLBACK_PROMPT + fit_to_budget(transcript, budget, route.model)
+                }]
             )
             
             summary = summary_response.choices[0].message.content
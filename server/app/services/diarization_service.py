@@ -0,0 +1,103 @@
+import gc
+import logging
+import os
+import threading
+from typing import List, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# A speaker turn as (start seconds, end seconds, speaker label); plain tuples so
+# results can travel through the task queue without pickling pyannote objects
+SpeakerTurn = Tuple[float, float, str]
+
+DIARIZATION_MODEL = "pyannote/speaker-diarization-3.1"
+
+
+class DiarizationService:
+    """
+    Speaker diarization backed by a pyannote pipeline that is loaded once
+    
+    Only the dedicated diarization worker calls load(); the API and the
+    general worker import this module without touching torch or pyannote.
+    """
+    
+    def __init__(self):
+        self.hf_token = settings.huggingface_access_token
+        self.num_threads = settings.diarization_threads
+        self.pipeline = None
+        self._lock = threading.Lock()
+    
+    @property
+    def is_available(self) -> bool:
+        """Whether diarization can run at all with the current configuration"""
+        return settings.diarization_enabled and bool(self.hf_token)
+    
+    def load(self) -> None:
+        """Load the pyannote pipeline on CPU with bounded thread usage"""
+        if self.pipeline is not None:
+            return
+        if not self.is_available:
+            raise ValueError("Speaker diarization is disabled or HuggingFace token not configured")
+        
+        with self._lock:
+            if self.pipeline is not None:
+                return
+            
+            logger.info(f"🔧 Loading {DIARIZATION_MODEL} with {self.num_threads} CPU threads...")
+            
+            # Heavy imports stay local so only diarization workers pay for them
+            import torch
+            from pyannote.audio import Pipeline
+            
+            torch.set_num_threads(self.num_threads)
+            torch.set_num_interop_threads(1)
+            
+            try:
+                pipeline = Pipeline.from_pretrained(DIARIZATION_MODEL, use_auth_token=self.hf_token)
+            except TypeError:
+                # Newer pyannote versions renamed the argument
+                pipeline = Pipeline.from_pretrained(DIARIZATION_MODEL, token=self.hf_token)
+            
+            if pipeline is None:
+                logger.error("❌ Make sure you have accepted user conditions for both pyannote/segmentation-3.0 and pyannote/speaker-diarization-3.1 models")
+                raise ValueError(f"Failed to load {DIARIZATION_MODEL}")
+            
+            pipeline.to(torch.device("cpu"))
+            self.pipeline = pipeline
+            logger.info("✅ Speaker diarization pipeline loaded and warm")
+    
+    def diarize(self, audio_path: str) -> List[SpeakerTurn]:
+        """
+        Run speaker diarization on an audio file
+        
+        Args:
+            audio_path: Path to a local audio/video file
+        
+        Returns:
+            List of (start, end, speaker) turns sorted by start time
+        """
+        self.load()
+        logger.info(f"👥 Diarizing {audio_path} ({os.path.getsize(audio_path)} bytes)")
+        
+        # The pipeline is not thread-safe; a warm worker serves one job at a time
+        with self._lock:
+            try:
+                diarization = self.pipeline(audio_path)
+            finally:
+                gc.collect()
+        
+        turns = [
+            (float(segment.start), float(segment.end), str(speaker))
+            for segment, _, speaker in diarization.itertracks(yield_label=True)
+        ]
+        turns.sort(key=lambda turn: turn[0])
+        
+        speaker_count = len({speaker for _, _, speaker in turns})
+        logger.info(f"✅ Diarization found {len(turns)} turns from {speaker_count} speakers")
+        return turns
+
+
+# Global diarization service instance (the pipeline itself loads lazily)
+diarization_service = DiarizationService()
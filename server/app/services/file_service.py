@@ -75,6 +75,45 @@ class FileService:
                        f"Allowed types: {', '.join(self.allowed_file_types)}"
             )
     
+    def validate_upload_metadata(
+        self,
+        filename: str,
+        file_size: int,
+        content_type: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Validate a file declared ahead of a chunked or direct upload
+        
+        Args:
+            filename: Original filename
+            file_size: Declared size in bytes
+            content_type: Declared MIME type, guessed from filename if missing
+            
+        Returns:
+            Optional[str]: The resolved content type
+            
+        Raises:
+            HTTPException: If the declared file is too large or not allowed
+        """
+        if file_size > self.max_file_size:
+            max_size_mb = self.max_file_size / (1024 * 1024)
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size allowed: {max_size_mb:.1f}MB"
+            )
+        
+        if not content_type:
+            content_type, _ = mimetypes.guess_type(filename)
+        
+        if self.allowed_file_types and content_type not in self.allowed_file_types:
+            raise HTTPException(
+                status_code=415,
+                detail=f"File type '{content_type}' not allowed. "
+                       f"Allowed types: {', '.join(self.allowed_file_types)}"
+            )
+        
+        return content_type
+    
     def get_file_info(self, file: UploadFile) -> dict:
         """
         Get file information
@@ -0,0 +1,321 @@
+import logging
+import textwrap
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+# Layout, in SVG user units (the raster is drawn RASTER_SCALE times larger)
+MARGIN = 40
+LANE_WIDTH = 360
+LANE_GAP = 80
+ROW_GAP = 36
+HEADER_HEIGHT = 32
+FONT_SIZE = 14
+LINE_HEIGHT = 18
+# Average glyph width as a fraction of the font size, used to wrap text identically in SVG and raster
+CHAR_WIDTH = 0.56
+PADDING = 14
+TERMINAL_HEIGHT = 48
+MAX_LINES = 4
+RASTER_SCALE = 2
+
+COLORS = {
+    "terminal": ("#f1f5f9", "#475569"),
+    "decision": ("#dbeafe", "#2563eb"),
+    "action": ("#f8fafc", "#64748b"),
+    "high": ("#fee2e2", "#dc2626"),
+    "medium": ("#fef3c7", "#d97706"),
+    "low": ("#dcfce7", "#16a34a"),
+}
+TEXT_COLOR = "#0f172a"
+MUTED_COLOR = "#64748b"
+EDGE_COLOR = "#94a3b8"
+
+# Fonts tried in order for the raster; Pillow's bundled font is the last resort
+FONT_FILES = ("DejaVuSans.ttf", "Arial.ttf", "LiberationSans-Regular.ttf")
+
+
+class FlowNode:
+    """A box in the flowchart: shape, wrapped text and position of its top-left corner"""
+    
+    def __init__(self, shape: str, lines: List[str], x: float, y: float, width: float, height: float, palette: str):
+        self.shape = shape  # "terminal", "decision" or "action"
+        self.lines = lines
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.fill, self.stroke = COLORS[palette]
+    
+    @property
+    def center_x(self) -> float:
+        return self.x + self.width / 2
+    
+    @property
+    def bottom(self) -> float:
+        return self.y + self.height
+
+
+class Flowchart:
+    """Laid-out flowchart, rendered by render_svg() and render_image()"""
+    
+    def __init__(self, width: float, height: float):
+        self.width = width
+        self.height = height
+        self.nodes: List[FlowNode] = []
+        self.edges: List[List[Tuple[float, float]]] = []  # Polylines, arrowhead at the last point
+        self.labels: List[Tuple[float, float, str]] = []  # Lane headers, left-aligned clear of the connectors
+
+
+def _wrap(text: str, width: float) -> List[str]:
+    """Wrap text to a box width, keeping at most MAX_LINES lines"""
+    chars = max(int(width / (FONT_SIZE * CHAR_WIDTH)), 8)
+    lines = textwrap.wrap(" ".join(text.split()), chars) or [""]
+    if len(lines) > MAX_LINES:
+        lines = lines[:MAX_LINES]
+        lines[-1] = lines[-1][:chars - 1].rstrip() + "…"
+    return lines
+
+
+def _text_height(lines: List[str]) -> float:
+    return len(lines) * LINE_HEIGHT + 2 * PADDING
+
+
+def _item_text(item: Any) -> str:
+    """Description of an analysis item, which may be a dict or a plain string"""
+    if isinstance(item, dict):
+        return str(item.get("description") or "")
+    return str(item)
+
+
+def _action_node(item: Any, number: Optional[int], x: float, y: float, flow: Dict[str, Any]) -> FlowNode:
+    text = _item_text(item)
+    if number is not None:
+        text = f"{number}. {text}"
+    lines = _wrap(text, LANE_WIDTH - 2 * PADDING)
+    
+    details = []
+    palette = "action"
+    if isinstance(item, dict):
+        if item.get("assignee"):
+            details.append(str(item["assignee"]))
+        if item.get("due_date"):
+            details.append(f"due {item['due_date']}")
+        priority = str(item.get("priority") or "").lower()
+        if flow.get("has_priorities") and priority in ("high", "medium", "low"):
+            palette = priority
+    if details:
+        lines.append(" · ".join(details)[:int((LANE_WIDTH - 2 * PADDING) / (FONT_SIZE * CHAR_WIDTH))])
+    return FlowNode("action", lines, x, y, LANE_WIDTH, _text_height(lines), palette)
+
+
+def _decision_node(item: Any, number: Optional[int], x: float, y: float) -> FlowNode:
+    text = _item_text(item)
+    if number is not None:
+        text = f"{number}. {text}"
+    # Text sits in the rectangle inscribed in the diamond, half its width and height
+    lines = _wrap(text, LANE_WIDTH / 2 + 2 * PADDING)
+    if isinstance(item, dict) and item.get("owner"):
+        lines.append(str(item["owner"])[:24])
+    height = max(2 * _text_height(lines) - 2 * PADDING, 96)
+    return FlowNode("decision", lines, x, y, LANE_WIDTH, height, "decision")
+
+
+def _elbow(start: Tuple[float, float], end: Tuple[float, float]) -> List[Tuple[float, float]]:
+    """Vertical-horizontal-vertical connector from the bottom of one node to the top of another"""
+    if start[0] == end[0]:
+        return [start, end]
+    middle = start[1] + min(ROW_GAP / 2, (end[1] - start[1]) / 2)
+    return [start, (start[0], middle), (end[0], middle), end]
+
+
+def build_flowchart(title: str, decisions: list, action_items: list, flow: Dict[str, Any], max_items: int = 8) -> Flowchart:
+    """
+    Lay out decisions and action items as a top-down flowchart
+    
+    Decisions form a chain of diamonds in the left lane and action items a
+    lane of boxes on the right, both fed from a start node and merging into an
+    end node. Following _analyze_decision_flow(): items are numbered when the
+    meeting implied an order, actions are coloured by priority when any was
+    given, and actions are chained with arrows only when they depend on each
+    other. Lanes longer than max_items end in a "+N more" box.
+    """
+    decisions = list(decisions or [])
+    action_items = list(action_items or [])
+    numbered = flow.get("has_timeline", False)
+    
+    lanes = [lane for lane in (("Decisions", decisions), ("Action items", action_items)) if lane[1]]
+    if not lanes:
+        lanes = [("", ["No decisions or action items were recorded"])]
+    width = 2 * MARGIN + len(lanes) * LANE_WIDTH + (len(lanes) - 1) * LANE_GAP
+    
+    chart = Flowchart(width, 0)
+    start_lines = _wrap(title, LANE_WIDTH - 2 * PADDING)[:2]
+    start = FlowNode("terminal", start_lines, (width - LANE_WIDTH) / 2, MARGIN, LANE_WIDTH, max(TERMINAL_HEIGHT, _text_height(start_lines)), "terminal")
+    chart.nodes.append(start)
+    
+    lane_top = start.bottom + ROW_GAP + HEADER_HEIGHT
+    lane_ends: List[FlowNode] = []
+    for index, (header, items) in enumerate(lanes):
+        x = MARGIN + index * (LANE_WIDTH + LANE_GAP)
+        if header:
+            chart.labels.append((x, lane_top - HEADER_HEIGHT / 2, header))
+        
+        shown = items[:max_items]
+        hidden = len(items) - len(shown)
+        y = lane_top
+        lane_nodes: List[FlowNode] = []
+        for number, item in enumerate(shown, start=1):
+            label = number if numbered else None
+            if header == "Decisions":
+                node = _decision_node(item, label, x, y)
+            else:
+                node = _action_node(item, label, x, y, flow)
+            lane_nodes.append(node)
+            y = node.bottom + ROW_GAP
+        if hidden:
+            lines = [f"+{hidden} more"]
+            lane_nodes.append(FlowNode("action", lines, x, y, LANE_WIDTH, _text_height(lines), "action"))
+        chart.nodes.extend(lane_nodes)
+        
+        chart.edges.append(_elbow((start.center_x, start.bottom), (lane_nodes[0].center_x, lane_nodes[0].y)))
+        chained = header == "Decisions" or flow.get("has_dependencies", False)
+        for previous, node in zip(lane_nodes, lane_nodes[1:]):
+            if chained:
+                chart.edges.append([(previous.center_x, previous.bottom), (node.center_x, node.y)])
+        lane_ends.append(lane_nodes[-1])
+    
+    end_y = max(node.bottom for node in lane_ends) + ROW_GAP
+    end = FlowNode("terminal", ["End"], start.x, end_y, LANE_WIDTH, TERMINAL_HEIGHT, "terminal")
+    chart.nodes.append(end)
+    for node in lane_ends:
+        # Lanes end at different heights; drop straight down to the merge point
+        chart.edges.append(_elbow((node.center_x, node.bottom), (end.center_x, end.y)))
+    
+    chart.height = end.bottom + MARGIN
+    return chart
+
+
+def _shape_points(node: FlowNode) -> List[Tuple[float, float]]:
+    """Outline of a diamond node"""
+    return [
+        (node.center_x, node.y),
+        (node.x + node.width, node.y + node.height / 2),
+        (node.center_x, node.bottom),
+        (node.x, node.y + node.height / 2),
+    ]
+
+
+def _arrowhead(points: List[Tuple[float, float]], size: float = 8) -> List[Tuple[float, float]]:
+    """Triangle at the end of a polyline whose last segment points down"""
+    x, y = points[-1]
+    return [(x, y), (x - size / 2, y - size), (x + size / 2, y - size)]
+
+
+def _text_origin(node: FlowNode) -> float:
+    """y of the first baseline, with the lines centred vertically in the node"""
+    return node.y + (node.height - len(node.lines) * LINE_HEIGHT) / 2 + LINE_HEIGHT * 0.75
+
+
+def render_svg(chart: Flowchart) -> str:
+    """Flowchart as a standalone SVG document"""
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{chart.width:g}" height="{chart.height:g}" '
+        f'viewBox="0 0 {chart.width:g} {chart.height:g}" font-family="DejaVu Sans, Arial, sans-serif" font-size="{FONT_SIZE}">',
+        '<rect width="100%" height="100%" fill="#ffffff"/>',
+    ]
+    
+    for points in chart.edges:
+        path = " ".join(f"{x:g},{y:g}" for x, y in points)
+        head = " ".join(f"{x:g},{y:g}" for x, y in _arrowhead(points))
+        parts.append(f'<polyline points="{path}" fill="none" stroke="{EDGE_COLOR}" stroke-width="2"/>')
+        parts.append(f'<polygon points="{head}" fill="{EDGE_COLOR}"/>')
+    
+    for x, y, text in chart.labels:
+        parts.append(
+            f'<text x="{x:g}" y="{y + FONT_SIZE / 3:g}" font-weight="bold" '
+            f'fill="{MUTED_COLOR}">{escape(text)}</text>'
+        )
+    
+    for node in chart.nodes:
+        style = f'fill="{node.fill}" stroke="{node.stroke}" stroke-width="2"'
+        if node.shape == "decision":
+            points = " ".join(f"{x:g},{y:g}" for x, y in _shape_points(node))
+            parts.append(f'<polygon points="{points}" {style}/>')
+        else:
+            radius = node.height / 2 if node.shape == "terminal" else 8
+            parts.append(
+                f'<rect x="{node.x:g}" y="{node.y:g}" width="{node.width:g}" height="{node.height:g}" '
+                f'rx="{radius:g}" {style}/>'
+            )
+        baseline = _text_origin(node)
+        for offset, line in enumerate(node.lines):
+            parts.append(
+                f'<text x="{node.center_x:g}" y="{baseline + offset * LINE_HEIGHT:g}" text-anchor="middle" '
+                f'fill="{TEXT_COLOR}">{escape(line)}</text>'
+            )
+    
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+@lru_cache(maxsize=None)
+def _get_font(size: int) -> Optional[Any]:
+    """Raster font, loaded once per process (None if Pillow is not installed)"""
+    try:
+        from PIL import ImageFont
+    except ImportError:
+        logger.warning("⚠️  Pillow not installed - visual summaries are stored as SVG only")
+        return None
+    
+    for name in FONT_FILES:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+
+def render_image(chart: Flowchart) -> Optional[Any]:
+    """
+    Flowchart as a Pillow image, drawn from the same layout as the SVG
+    
+    Returns None when Pillow is unavailable.
+    """
+    font = _get_font(FONT_SIZE * RASTER_SCALE)
+    if font is None:
+        return None
+    from PIL import Image, ImageDraw
+    
+    scale = RASTER_SCALE
+    
+    def scaled(points: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        return [(x * scale, y * scale) for x, y in points]
+    
+    image = Image.new("RGB", (int(chart.width * scale), int(chart.height * scale)), "#ffffff")
+    draw = ImageDraw.Draw(image)
+    
+    for points in chart.edges:
+        draw.line(scaled(points), fill=EDGE_COLOR, width=2 * scale, joint="curve")
+        draw.polygon(scaled(_arrowhead(points)), fill=EDGE_COLOR)
+    
+    for x, y, text in chart.labels:
+        draw.text((x * scale, y * scale), text, fill=MUTED_COLOR, font=font, anchor="lm")
+    
+    for node in chart.nodes:
+        if node.shape == "decision":
+            draw.polygon(scaled(_shape_points(node)), fill=node.fill, outline=node.stroke, width=2 * scale)
+        else:
+            radius = node.height / 2 if node.shape == "terminal" else 8
+            box = (node.x * scale, node.y * scale, (node.x + node.width) * scale, node.bottom * scale)
+            draw.rounded_rectangle(box, radius=radius * scale, fill=node.fill, outline=node.stroke, width=2 * scale)
+        baseline = _text_origin(node)
+        for offset, line in enumerate(node.lines):
+            draw.text(
+                (node.center_x * scale, (baseline + offset * LINE_HEIGHT) * scale),
+                line, fill=TEXT_COLOR, font=font, anchor="ms"
+            )
+    
+    return image
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.models.database import engine
+from app.services.storage_service import storage_service
+from app.services.task_service import task_service
+
+logger = logging.getLogger(__name__)
+
+# Endpoint the OpenAI SDK uses when openai_base_url is not set
+DEFAULT_OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+
+class HealthService:
+    """Runs dependency checks in the background and serves cached results to probes"""
+    
+    def __init__(self):
+        self.interval = settings.health_check_interval_seconds
+        self.timeout = settings.health_check_timeout_seconds
+        self.critical_checks = set(settings.health_critical_checks)
+        self.checks: Dict[str, Callable[[], Optional[str]]] = {
+            "database": self._check_database,
+            "storage": self._check_storage,
+            "redis": self._check_redis,
+            "openai": self._check_openai,
+        }
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._last_run: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self) -> None:
+        """Schedule the check loop; readiness stays false until the first round finishes"""
+        if self._task is not None:
+            return
+        logger.info(f"🩺 Starting background health checks every {self.interval}s")
+        self._task = asyncio.create_task(self._run_forever())
+    
+    async def stop(self) -> None:
+        """Cancel the background check loop"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def run_checks(self) -> Dict[str, Dict[str, Any]]:
+        """Run every dependency check concurrently and cache the results"""
+        names = list(self.checks)
+        results = await asyncio.gather(*(self._run_check(name) for name in names))
+        self._results = dict(zip(names, results))
+        self._last_run = time.monotonic()
+        return self._results
+    
+    def get_results(self) -> Dict[str, Dict[str, Any]]:
+        """Get the cached results of the latest check round"""
+        return self._results
+    
+    def is_ready(self) -> bool:
+        """True when every critical dependency passed its last check and results are fresh"""
+        if self._last_run is None:
+            return False
+        # A stalled check loop must not keep reporting stale "healthy" results
+        if time.monotonic() - self._last_run > self.interval * 3 + self.timeout:
+            return False
+        return all(
+            self._results.get(name, {}).get("status") in ("healthy", "not configured")
+            for name in self.critical_checks
+        )
+    
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_checks()
+            except Exception as e:
+                logger.error(f"❌ Health check round failed: {e}")
+            await asyncio.sleep(self.interval)
+    
+    async def _run_check(self, name: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            # Checks use blocking clients, so keep them off the event loop
+            status = await asyncio.wait_for(
+                asyncio.to_thread(self.checks[name]),
+                timeout=self.timeout
+            )
+            status = status or "healthy"
+        except asyncio.TimeoutError:
+            status = f"error: timed out after {self.timeout}s"
+        except Exception as e:
+            status = f"error: {str(e)}"
+        
+        if status.startswith("error"):
+            logger.warning(f"⚠️  Health check '{name}' failed: {status}")
+        
+        return {
+            "status": status,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            "checked_at": datetime.now().isoformat()
+        }
+    
+    def _check_database(self) -> Optional[str]:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return None
+    
+    def _check_storage(self) -> Optional[str]:
+        status = storage_service.get_bucket_info()["status"]
+        return "healthy" if status == "connected" else status
+    
+    def _check_redis(self) -> Optional[str]:
+        if task_service.redis_conn is None:
+            return "error: task queue not initialized"
+        task_service.redis_conn.ping()
+        return None
+    
+    def _check_openai(self) -> Optional[str]:
+        # Workers that transcribe and analyse cannot do anything useful without a key
+        if not settings.openai_api_key:
+            return "error: API key not configured"
+        # Reachability only: an unauthenticated request is enough to prove the route works.
+        # Probe the endpoint the clients actually use, which may be a proxy or compatible API
+        base_url = (settings.openai_base_url or DEFAULT_OPENAI_BASE_URL).rstrip("/")
+        response = httpx.get(f"{base_url}/models", timeout=self.timeout)
+        if response.status_code >= 500:
+            return f"error: status {response.status_code}"
+        return None
+
+
+# Global health service instance
+health_service = HealthService()
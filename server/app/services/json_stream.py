@@ -0,0 +1,75 @@
+import json
+import logging
+import re
+from typing import Any, List
+
+logger = logging.getLogger(__name__)
+
+
+class JSONArrayStreamParser:
+    """
+    Incrementally extract the elements of one array from a streamed JSON object
+    
+    Completions like {"labels": [{...}, {...}]} arrive a few characters at a
+    time; feed() returns each element of the named array as soon as its
+    closing brace has arrived, without waiting for the rest of the document.
+    Only object elements are supported, which is all the prompts ask for.
+    """
+    
+    def __init__(self, key: str):
+        self._array_start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._buffer = ""
+        self._position = 0  # Next character of the buffer to scan
+        self._in_array = False
+        self._done = False
+        self._element_start = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+    
+    def feed(self, chunk: str) -> List[Any]:
+        """Add streamed text and return the array elements completed by it"""
+        self._buffer += chunk
+        elements: List[Any] = []
+        if self._done:
+            return elements
+        
+        if not self._in_array:
+            match = self._array_start.search(self._buffer)
+            if not match:
+                return elements
+            self._in_array = True
+            self._position = match.end()
+        
+        buffer = self._buffer
+        for index in range(self._position, len(buffer)):
+            char = buffer[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._element_start = index
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._element_start is not None:
+                    text = buffer[self._element_start:index + 1]
+                    self._element_start = None
+                    try:
+                        elements.append(json.loads(text))
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"⚠️  Skipping malformed streamed element: {e}")
+            elif char == "]" and self._depth == 0:
+                self._done = True
+                break
+        self._position = len(buffer)
+        return elements
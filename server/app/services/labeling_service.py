@@ -1,16 +1,30 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Dict, Any
 from datetime import datetime
+import asyncio
 import logging
 import json
-from openai import OpenAI
 
 from app.models.labeling_rule import LabelingRule
 from app.models.database import SessionLocal
 from app.core.config import settings
+from app.services.openai_client import get_async_openai_client, get_openai_client
+from app.services.json_stream import JSONArrayStreamParser
+from app.services.metrics_service import metrics_service
+from app.services.model_router import model_router
+from app.services.prompt_budget import count_tokens, fit_to_budget
+from app.services.tracing_service import tracing_service
+from app.services.transcript_compression import compress_transcript
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
+# Tokenizer used to size the transcript excerpt; the routed models share it
+LABELING_TOKENIZER_MODEL = "gpt-4o"
+
 
 class LabelingService:
     """Service for managing labeling rules and applying them to recordings"""
@@ -18,13 +32,14 @@ class LabelingService:
     def __init__(self):
         logger.info("🏷️  Initializing LabelingService")
         
-        if settings.openai_api_key:
-            self.openai_client = OpenAI(api_key=settings.openai_api_key)
-            logger.info("✅ OpenAI client initialized for labeling")
-        else:
-            self.openai_client = None
+        if not settings.openai_api_key:
             logger.warning("⚠️  OpenAI API key not configured - labeling will not be available")
     
+    @property
+    def openai_client(self) -> Optional["OpenAI"]:
+        """Shared OpenAI client, created on first use"""
+        return get_openai_client()
+    
     def create_rule(
         self,
         db: Session,
@@ -58,6 +73,19 @@ class LabelingService:
             query = query.filter(LabelingRule.is_active == True)
         return query.order_by(LabelingRule.created_at.desc()).all()
     
+    def get_rules_version(self, db: Session) -> tuple:
+        """
+        Get a version for the rule set that changes on every create, update and delete
+        
+        Derived from the table itself rather than an in-memory counter, so all
+        API processes agree on it.
+        """
+        return tuple(db.query(
+            func.count(LabelingRule.id),
+            func.max(LabelingRule.id),
+            func.max(LabelingRule.updated_at)
+        ).one())
+    
     def get_rule(self, db: Session, rule_id: int) -> Optional[LabelingRule]:
         """Get a labeling rule by ID"""
         return db.query(LabelingRule).filter(LabelingRule.id == rule_id).first()
@@ -121,47 +149,24 @@ class LabelingService:
             logger.warning("⚠️  OpenAI API key not configured for labeling")
             return []
         
-        # Get active rules using a new session
-        db = SessionLocal()
-        try:
-            active_rules = self.get_rules(db, active_only=True)
-            if not active_rules:
-                logger.info("📋 No active labeling rules found")
-                return []
-        finally:
-            db.close()
+        active_rules = self._get_active_rules()
+        if not active_rules:
+            return []
         
         logger.info(f"🏷️  Applying {len(active_rules)} labeling rules to recording")
         
         try:
-            # Prepare rules for AI analysis
-            rules_prompt = "Apply the following labeling rules to this meeting recording:\n\n"
-            for rule in active_rules:
-                rules_prompt += f"**{rule.label_name}**: {rule.rule_description}\n"
+            rules_prompt = self._build_rules_prompt(active_rules, summary, action_items, decisions, transcript)
+            route = model_router.route("labeling", count_tokens(rules_prompt, LABELING_TOKENIZER_MODEL))
             
-            rules_prompt += f"""
-Based on the meeting content below, determine which labels should be applied.
-Return a JSON array of objects with: {{"label_name": "string", "confidence": 0.0-1.0, "reasoning": "string"}}
-
-Meeting Summary: {summary or "No summary available"}
-
-Action Items: {len(action_items)} items found
-{json.dumps(action_items[:3], indent=2) if action_items else "None"}
-
-Decisions: {len(decisions)} decisions found
-{json.dumps(decisions[:3], indent=2) if decisions else "None"}
-
-Transcript Preview: {transcript[:500] if transcript else "No transcript available"}...
-"""
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
+            response = model_router.create_completion(
+                self.openai_client.chat.completions.create,
+                route,
+                "labeling",
                 messages=[{
                     "role": "user",
                     "content": rules_prompt
                 }],
-                temperature=0.3,
-                max_tokens=1000,
                 response_format={"type": "json_object"}
             )
             
@@ -170,17 +175,9 @@ Transcript Preview: {transcript[:500] if transcript else "No transcript availabl
             # Convert AI response to our format and add colors
             applied_labels = []
             for ai_label in result.get("labels", []):
-                # Find the matching rule to get the color
-                matching_rule = next(
-                    (rule for rule in active_rules if rule.label_name == ai_label["label_name"]),
-                    None
-                )
-                if matching_rule and ai_label.get("confidence", 0) > 0.6:  # Only apply if confidence > 60%
-                    applied_labels.append({
-                        "label_name": matching_rule.label_name,
-                        "label_color": matching_rule.label_color,
-                        "confidence": ai_label.get("confidence", 0.8)
-                    })
+                applied_label = self._to_applied_label(ai_label, active_rules)
+                if applied_label:
+                    applied_labels.append(applied_label)
             
             logger.info(f"✅ Applied {len(applied_labels)} labels to recording")
             return applied_labels
@@ -188,6 +185,134 @@ Transcript Preview: {transcript[:500] if transcript else "No transcript availabl
         except Exception as e:
             logger.error(f"❌ Failed to apply labeling rules: {e}")
             return []
+    
+    async def stream_rules_to_recording(
+        self,
+        summary: str,
+        action_items: List[Dict[str, Any]],
+        decisions: List[Dict[str, Any]],
+        transcript: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Apply labeling rules with a streamed completion, yielding each label as soon as it is decided
+        
+        Same rules, thresholds and model route as apply_rules_to_recording; the
+        fallback model is only tried if the stream fails before it starts.
+        Errors propagate so the caller can report them to the client mid-stream.
+        """
+        client = get_async_openai_client()
+        if not client:
+            raise ValueError("OpenAI API key not configured")
+        
+        active_rules = await asyncio.to_thread(self._get_active_rules)
+        if not active_rules:
+            return
+        
+        logger.info(f"🏷️  Streaming {len(active_rules)} labeling rules for recording")
+        rules_prompt = self._build_rules_prompt(active_rules, summary, action_items, decisions, transcript)
+        route = model_router.route("labeling", count_tokens(rules_prompt, LABELING_TOKENIZER_MODEL))
+        parser = JSONArrayStreamParser("labels")
+        applied = 0
+        
+        async def open_stream(model: str) -> Any:
+            return await client.chat.completions.create(
+                model=model,
+                messages=[{
+                    "role": "user",
+                    "content": rules_prompt
+                }],
+                temperature=route.temperature,
+                max_tokens=route.max_tokens,
+                timeout=route.timeout,
+                response_format={"type": "json_object"},
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+        
+        model, tier = route.model, route.tier
+        try:
+            stream = await open_stream(model)
+        except Exception as e:
+            if not route.fallback_model or not model_router.is_retryable(e):
+                raise
+            logger.warning(f"⚠️  {model} failed to start the labeling stream ({type(e).__name__}), retrying on {route.fallback_model}")
+            model, tier = route.fallback_model, "fallback"
+            stream = await open_stream(model)
+        
+        with metrics_service.track_openai_call("labeling_stream", model) as call:
+            tracing_service.set_attribute("tier", tier)
+            async for chunk in stream:
+                # The final chunk carries token usage and no choices
+                if chunk.usage is not None:
+                    call.record(chunk)
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                for ai_label in parser.feed(chunk.choices[0].delta.content):
+                    applied_label = self._to_applied_label(ai_label, active_rules)
+                    if applied_label:
+                        applied += 1
+                        yield applied_label
+        
+        logger.info(f"✅ Streamed {applied} labels to recording")
+    
+    def _get_active_rules(self) -> List[LabelingRule]:
+        """Active rules, read with a short-lived session"""
+        db = SessionLocal()
+        try:
+            active_rules = self.get_rules(db, active_only=True)
+            if not active_rules:
+                logger.info("📋 No active labeling rules found")
+            return active_rules
+        finally:
+            db.close()
+    
+    def _build_rules_prompt(
+        self,
+        active_rules: List[LabelingRule],
+        summary: str,
+        action_items: List[Dict[str, Any]],
+        decisions: List[Dict[str, Any]],
+        transcript: str
+    ) -> str:
+        """Prompt asking the model which rules apply to a recording"""
+        transcript = compress_transcript(transcript)
+        
+        # Prepare rules for AI analysis
+        rules_prompt = "Apply the following labeling rules to this meeting recording:\n\n"
+        for rule in active_rules:
+            rules_prompt += f"**{rule.label_name}**: {rule.rule_description}\n"
+        
+        rules_prompt += f"""
+Based on the meeting content below, determine which labels should be applied.
+Return a JSON object {{"labels": [...]}} whose array holds objects with: {{"label_name": "string", "confidence": 0.0-1.0, "reasoning": "string"}}
+
+Meeting Summary: {summary or "No summary available"}
+
+Action Items: {len(action_items)} items found
+{json.dumps(action_items[:3], indent=2) if action_items else "None"}
+
+Decisions: {len(decisions)} decisions found
+{json.dumps(decisions[:3], indent=2) if decisions else "None"}
+
+Transcript Excerpts:
+{fit_to_budget(transcript, settings.labeling_max_transcript_tokens, LABELING_TOKENIZER_MODEL) if transcript else "No transcript available"}
+"""
+        return rules_prompt
+    
+    def _to_applied_label(self, ai_label: Dict[str, Any], active_rules: List[LabelingRule]) -> Optional[Dict[str, Any]]:
+        """Match a label suggested by the model to its rule; None unless confident enough"""
+        # Find the matching rule to get the color
+        matching_rule = next(
+            (rule for rule in active_rules if rule.label_name == ai_label.get("label_name")),
+            None
+        )
+        if matching_rule and ai_label.get("confidence", 0) > 0.6:  # Only apply if confidence > 60%
+            return {
+                "label_name": matching_rule.label_name,
+                "label_color": matching_rule.label_color,
+                "confidence": ai_label.get("confidence", 0.8)
+            }
+        return None
 
 
 # Global labeling service instance
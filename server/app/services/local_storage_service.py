@@ -0,0 +1,310 @@
+from typing import Optional, Dict, Any, AsyncIterator, Iterator, List, Tuple
+import asyncio
+import hashlib
+import hmac
+import mimetypes
+import mmap
+import os
+import time
+import uuid
+import logging
+from datetime import datetime
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.services.storage_service import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+
+class LocalStorageService(StorageBackend):
+    """Storage backend that keeps media on a local (or shared) filesystem"""
+    
+    def __init__(self, root_path: Optional[str] = None, public_base_url: Optional[str] = None):
+        self.root_path = os.path.abspath(root_path or settings.local_storage_path)
+        self.public_base_url = (public_base_url or settings.local_storage_public_url).rstrip("/")
+        logger.info(f"🏗️  Initializing LocalStorageService at {self.root_path}")
+    
+    def upload_file(
+        self,
+        file_content: bytes,
+        filename: str,
+        content_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Write a file to the local storage root
+        
+        Args:
+            file_content: The file content as bytes
+            filename: Original filename
+            content_type: MIME type of the file
+        
+        Returns:
+            Dict containing upload details
+        
+        Raises:
+            HTTPException: If the file cannot be written
+        """
+        logger.info(f"📤 Storing file locally: {filename} ({len(file_content)} bytes, {content_type})")
+        storage_path = self._generate_storage_path(filename)
+        
+        try:
+            self._write_atomically(storage_path, file_content)
+        except OSError as e:
+            logger.error(f"❌ Local upload failed for {filename}: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
+        
+        return {
+            'original_filename': filename,
+            'storage_path': storage_path,
+            'public_url': self._generate_public_url(storage_path),
+            'file_size': len(file_content),
+            'content_type': content_type,
+            'upload_timestamp': datetime.now().isoformat()
+        }
+    
+    async def save_stream(
+        self,
+        storage_path: str,
+        chunks: AsyncIterator[bytes],
+        max_bytes: Optional[int] = None
+    ) -> int:
+        """
+        Stream a request body straight to disk
+        
+        Args:
+            storage_path: Destination storage path
+            chunks: Async iterator over the body
+            max_bytes: Reject bodies larger than this
+        
+        Returns:
+            int: Number of bytes written
+        
+        Raises:
+            HTTPException: If the body exceeds max_bytes
+        """
+        full_path = self._resolve(storage_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        tmp_path = self._temp_path(full_path)
+        
+        written = 0
+        try:
+            with open(tmp_path, "wb") as output:
+                async for chunk in chunks:
+                    written += len(chunk)
+                    if max_bytes is not None and written > max_bytes:
+                        raise HTTPException(status_code=413, detail="File too large")
+                    # Disk writes stay off the event loop
+                    await asyncio.to_thread(output.write, chunk)
+            os.replace(tmp_path, full_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        
+        logger.info(f"✅ Stored {written} bytes at {storage_path}")
+        return written
+    
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        content_type: Optional[str] = None,
+        file_size: Optional[int] = None,
+        cache_control: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream a file into local storage under a newly generated path
+        
+        cache_control is not stored; the media endpoint sets caching headers by content type.
+        """
+        storage_path = self._generate_storage_path(filename)
+        written = await self.save_stream(storage_path, chunks)
+        return {
+            'original_filename': filename,
+            'storage_path': storage_path,
+            'public_url': self._generate_public_url(storage_path),
+            'file_size': written,
+            'content_type': content_type,
+            'upload_timestamp': datetime.now().isoformat()
+        }
+    
+    async def delete_files(self, storage_paths: List[str]) -> bool:
+        """Delete several files in one worker-thread hop"""
+        paths = [path for path in storage_paths if path and path.strip()]
+        results = await asyncio.to_thread(lambda: [self.delete_file(path) for path in paths])
+        return all(results)
+    
+    def storage_path_from_url(self, url: str) -> str:
+        """Map a /media URL back to its storage path"""
+        if url.startswith(self.public_base_url):
+            return url[len(self.public_base_url):].lstrip("/")
+        return url
+    
+    def create_signed_upload_url(self, filename: str) -> Dict[str, Any]:
+        """
+        Create an HMAC-signed URL for uploading straight into local storage
+        
+        Stand-in for Supabase signed upload URLs so the direct-upload flow can
+        run without network access. The client PUTs the body to signed_url.
+        """
+        storage_path = self._generate_storage_path(filename)
+        token = self._sign(storage_path, int(time.time()) + settings.signed_upload_ttl_seconds)
+        return {
+            'storage_path': storage_path,
+            'signed_url': f"{self._generate_public_url(storage_path)}?token={token}",
+            'token': token,
+            'public_url': self._generate_public_url(storage_path)
+        }
+    
+    def verify_upload_token(self, storage_path: str, token: str) -> bool:
+        """Check that a token was issued for this path and has not expired"""
+        try:
+            expires_at = int(token.split(".", 1)[0])
+        except ValueError:
+            return False
+        
+        if expires_at < time.time():
+            return False
+        return hmac.compare_digest(token, self._sign(storage_path, expires_at))
+    
+    def get_file_metadata(self, storage_path: str) -> Optional[Dict[str, Any]]:
+        """Return size, content type and public URL of a stored file, or None if missing"""
+        try:
+            stat = os.stat(self._resolve(storage_path))
+        except (FileNotFoundError, HTTPException):
+            return None
+        
+        content_type, _ = mimetypes.guess_type(storage_path)
+        return {
+            'file_size': stat.st_size,
+            'content_type': content_type,
+            'public_url': self._generate_public_url(storage_path)
+        }
+    
+    def download_file(self, storage_path: str) -> bytes:
+        """Read a whole stored file; workers that only need a path use get_local_path() instead"""
+        logger.info(f"📥 Reading file from local storage: {storage_path}")
+        with open(self._resolve(storage_path), "rb") as source:
+            return source.read()
+    
+    def iter_range(
+        self,
+        storage_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = 1024 * 1024
+    ) -> Iterator[bytes]:
+        """
+        Yield the bytes in [start, end] of a stored file from a memory map
+        
+        Pages are faulted in by the kernel on demand, so serving a small range
+        of a large recording never reads the rest of it.
+        """
+        with open(self._resolve(storage_path), "rb") as source:
+            size = os.fstat(source.fileno()).st_size
+            if size == 0:
+                return
+            last = size - 1 if end is None else min(end, size - 1)
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                position = start
+                while position <= last:
+                    next_position = min(position + chunk_size, last + 1)
+                    yield mapped[position:next_position]
+                    position = next_position
+    
+    def get_local_path(self, storage_path: str) -> Optional[str]:
+        """Get the filesystem path of a stored file"""
+        full_path = self._resolve(storage_path)
+        return full_path if os.path.isfile(full_path) else None
+    
+    def check_bucket_access(self) -> bool:
+        """Check that the storage root exists and is writable"""
+        return os.path.isdir(self.root_path) and os.access(self.root_path, os.W_OK)
+    
+    def get_bucket_info(self) -> Dict[str, str]:
+        """Get information about local storage availability"""
+        try:
+            os.makedirs(self.root_path, exist_ok=True)
+        except OSError as e:
+            return {"status": f"error: {str(e)}"}
+        return {"status": "connected" if self.check_bucket_access() else "error: storage root not writable"}
+    
+    def delete_file(self, storage_path: str) -> bool:
+        """Delete a file from local storage"""
+        if not storage_path or not storage_path.strip():
+            logger.error("❌ Cannot delete file: storage_path is empty")
+            return False
+        
+        try:
+            os.unlink(self._resolve(storage_path))
+            logger.info(f"✅ Successfully deleted: {storage_path}")
+            return True
+        except (OSError, HTTPException) as e:
+            logger.error(f"❌ Failed to delete {storage_path}: {str(e)}")
+            return False
+    
+    def delete_visual_summary(self, recording_id: int, visual_summary_url: str = None) -> bool:
+        """Delete the generated visual summary of a recording"""
+        if not visual_summary_url:
+            logger.warning(f"🎨 No visual summary URL provided for recording {recording_id}")
+            return False
+        
+        return self.delete_file(self.storage_path_from_url(visual_summary_url))
+    
+    def parse_range_header(self, range_header: str, size: int) -> Optional[Tuple[int, int]]:
+        """
+        Parse a single-range "bytes=start-end" header into inclusive offsets
+        
+        Returns:
+            The (start, end) offsets, or None if the range is not satisfiable
+        """
+        unit, _, spec = range_header.partition("=")
+        if unit.strip() != "bytes" or "," in spec:
+            return None
+        
+        start_text, _, end_text = spec.strip().partition("-")
+        try:
+            if start_text:
+                start = int(start_text)
+                end = int(end_text) if end_text else size - 1
+            else:
+                # Suffix range: the last N bytes
+                start = max(0, size - int(end_text))
+                end = size - 1
+        except ValueError:
+            return None
+        
+        if start > end or start >= size:
+            return None
+        return start, min(end, size - 1)
+    
+    def _generate_public_url(self, storage_path: str) -> str:
+        return f"{self.public_base_url}/{storage_path}"
+    
+    def _write_atomically(self, storage_path: str, file_content: bytes) -> None:
+        full_path = self._resolve(storage_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        tmp_path = self._temp_path(full_path)
+        with open(tmp_path, "wb") as output:
+            output.write(file_content)
+        os.replace(tmp_path, full_path)
+    
+    def _temp_path(self, full_path: str) -> str:
+        # Unique per write: a signed PUT URL can be reused, so two writes to one path may overlap
+        return f"{full_path}.{uuid.uuid4().hex}.part"
+    
+    def _resolve(self, storage_path: str) -> str:
+        """Map a storage path onto the root, refusing anything that escapes it"""
+        full_path = os.path.abspath(os.path.join(self.root_path, storage_path))
+        if not full_path.startswith(self.root_path + os.sep):
+            raise HTTPException(status_code=400, detail="Invalid storage path")
+        return full_path
+    
+    def _sign(self, storage_path: str, expires_at: int) -> str:
+        digest = hmac.new(
+            settings.storage_signing_secret.encode(),
+            f"{storage_path}:{expires_at}".encode(),
+            hashlib.sha256
+        ).hexdigest()
+        return f"{expires_at}.{digest}"
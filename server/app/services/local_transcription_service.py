@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.task_service import task_service
+
+logger = logging.getLogger(__name__)
+
+# Requests waiting for a local transcription worker, drained in batches
+PENDING_KEY = "kirki:local-transcription:pending"
+# Each requester blocks on its own result list
+RESULT_KEY = "kirki:local-transcription:result:{request_id}"
+RESULT_TTL_SECONDS = 600
+
+DRAIN_TASK = "app.tasks.local_transcription_tasks.process_local_transcription_batch"
+
+
+class LocalTranscriptionService:
+    """
+    CPU transcription with faster-whisper (CTranslate2, int8 by default)
+    
+    Produces the same shape as the Whisper API's verbose_json response: text,
+    duration, and word and segment timestamps. Only the dedicated local
+    transcription worker calls load(); the API and the general worker import
+    this module without touching faster_whisper.
+    
+    Short recordings from concurrent jobs are batched: each job pushes a
+    request onto a Redis list and enqueues a drain task, and whichever drain
+    runs first on the warm worker transcribes everything pending at once.
+    """
+    
+    def __init__(self):
+        self.model_name = settings.local_transcription_model
+        self.compute_type = settings.local_transcription_compute_type
+        self.num_threads = settings.local_transcription_threads
+        self.batch_size = max(settings.local_transcription_batch_size, 1)
+        self.model = None
+        self._lock = threading.Lock()
+    
+    def should_use(self, file_size: int, duration: Optional[float] = None) -> bool:
+        """Whether a recording should be transcribed locally under the configured backend"""
+        backend = settings.transcription_backend.lower()
+        if backend == "local":
+            return True
+        if backend != "auto":
+            return False
+        if file_size > settings.local_transcription_max_bytes:
+            return False
+        return duration is None or duration <= settings.local_transcription_max_seconds
+    
+    def load(self) -> None:
+        """Load the CTranslate2 Whisper model on CPU with bounded thread usage"""
+        if self.model is not None:
+            return
+        
+        with self._lock:
+            if self.model is not None:
+                return
+            
+            logger.info(
+                f"🔧 Loading faster-whisper {self.model_name} ({self.compute_type}) "
+                f"with {self.num_threads} CPU threads..."
+            )
+            
+            # Heavy import stays local so only local transcription workers pay for it
+            from faster_whisper import WhisperModel
+            
+            # num_workers lets up to batch_size transcriptions share the model concurrently
+            self.model = WhisperModel(
+                self.model_name,
+                device="cpu",
+                compute_type=self.compute_type,
+                cpu_threads=self.num_threads,
+                num_workers=self.batch_size
+            )
+            logger.info("✅ Local transcription model loaded and warm")
+    
+    def transcribe(self, audio_path: str) -> Dict[str, Any]:
+        """
+        Transcribe one file with word timestamps
+        
+        Returns:
+            Dict with text, duration, words and segments, as in verbose_json
+        """
+        self.load()
+        logger.info(f"🎤 Transcribing {audio_path} locally ({os.path.getsize(audio_path)} bytes)")
+        
+        segments_iter, info = self.model.transcribe(audio_path, word_timestamps=True, vad_filter=True)
+        segments = []
+        words = []
+        # Decoding happens lazily while the generator is consumed
+        for segment in segments_iter:
+            segments.append({"start": segment.start, "end": segment.end, "text": segment.text})
+            words.extend(
+                {"start": word.start, "end": word.end, "word": word.word}
+                for word in (segment.words or [])
+            )
+        
+        return {
+            "text": "".join(segment["text"] for segment in segments).strip(),
+            "duration": info.duration,
+            "words": words,
+            "segments": segments,
+        }
+    
+    def transcribe_many(self, audio_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Transcribe several files concurrently on the shared model
+        
+        Returns:
+            One result per path, in order; failures carry an "error" key
+        """
+        def run(audio_path: str) -> Dict[str, Any]:
+            try:
+                return self.transcribe(audio_path)
+            except Exception as e:
+                logger.error(f"❌ Local transcription of {audio_path} failed: {e}")
+                return {"error": str(e)}
+        
+        self.load()
+        with ThreadPoolExecutor(max_workers=min(len(audio_paths), self.batch_size) or 1) as pool:
+            return list(pool.map(run, audio_paths))
+    
+    def request(self, storage_path: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Transcribe a stored file on the local transcription workers and wait
+        
+        Returns:
+            The verbose_json-shaped result, or None if no worker is available,
+            the transcription failed, or it did not finish in time
+        """
+        redis_conn = task_service.redis_conn
+        if redis_conn is None:
+            return None
+        
+        request_id = uuid.uuid4().hex
+        payload = json.dumps({"request_id": request_id, "storage_path": storage_path})
+        timeout = timeout or settings.local_transcription_timeout_seconds
+        
+        try:
+            redis_conn.rpush(PENDING_KEY, payload)
+            if task_service.enqueue_local_transcription(DRAIN_TASK) is None:
+                redis_conn.lrem(PENDING_KEY, 1, payload)
+                return None
+            
+            reply = redis_conn.blpop(RESULT_KEY.format(request_id=request_id), timeout=int(timeout))
+        except Exception as e:
+            logger.error(f"❌ Local transcription request failed: {e}")
+            return None
+        
+        if reply is None:
+            logger.error(f"❌ Timed out after {timeout}s waiting for local transcription of {storage_path}")
+            # Drop the request if no worker has claimed it yet
+            redis_conn.lrem(PENDING_KEY, 1, payload)
+            return None
+        
+        result = json.loads(reply[1])
+        if result.get("error"):
+            logger.error(f"❌ Local transcription of {storage_path} failed: {result['error']}")
+            return None
+        return result
+    
+    def claim_pending(self, limit: int) -> List[Dict[str, str]]:
+        """Pop up to `limit` waiting requests; called by the drain task"""
+        redis_conn = task_service.redis_conn
+        requests = []
+        while len(requests) < limit:
+            raw = redis_conn.lpop(PENDING_KEY)
+            if raw is None:
+                break
+            requests.append(json.loads(raw))
+        return requests
+    
+    def publish_result(self, request_id: str, result: Dict[str, Any]) -> None:
+        """Hand a result back to the job blocked in request()"""
+        key = RESULT_KEY.format(request_id=request_id)
+        pipe = task_service.redis_conn.pipeline()
+        pipe.rpush(key, json.dumps(result))
+        pipe.expire(key, RESULT_TTL_SECONDS)
+        pipe.execute()
+
+
+# Global local transcription service instance (the model itself loads lazily)
+local_transcription_service = LocalTranscriptionService()
@@ -0,0 +1,151 @@
+import asyncio
+import io
+import logging
+import mimetypes
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.services.storage_service import storage_service
+from app.services.tracing_service import tracing_service
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "webp": "image/webp",
+}
+
+
+def cache_control() -> str:
+    """Cache-Control for generated images, which are stored under unique paths and never rewritten"""
+    return f"public, max-age={settings.image_cache_max_age_seconds}, immutable"
+
+
+def encode_image(image: Any, image_format: str) -> bytes:
+    """Encode a Pillow image as PNG or WebP"""
+    output = io.BytesIO()
+    if image_format == "webp":
+        image.save(output, format="WEBP", quality=settings.image_webp_quality, method=2)
+    else:
+        # optimize=True would try every filter, doubling the encode time for a few percent
+        image.save(output, format="PNG")
+    return output.getvalue()
+
+
+def make_thumbnail(image: Any) -> Any:
+    """Copy of the image scaled down to image_thumbnail_width, keeping its aspect ratio"""
+    from PIL import Image
+    
+    width = settings.image_thumbnail_width
+    if image.width <= width:
+        return image
+    height = max(round(image.height * width / image.width), 1)
+    return image.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+
+
+def _encode_variants(image: Any, formats: Iterable[str]) -> Dict[str, bytes]:
+    """Every full-size format plus a WebP thumbnail, all from the one decoded image"""
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    variants = {image_format: encode_image(image, image_format) for image_format in formats}
+    variants["thumbnail"] = encode_image(make_thumbnail(image), "webp")
+    return variants
+
+
+async def _single_chunk(content: bytes) -> AsyncIterator[bytes]:
+    yield content
+
+
+async def upload_bytes(content: bytes, filename: str, content_type: str) -> str:
+    """Upload generated content with long-lived cache headers and return its public URL"""
+    with tracing_service.span("storage.upload", size=len(content)):
+        file_details = await storage_service.upload_stream(
+            _single_chunk(content),
+            filename,
+            content_type,
+            file_size=len(content),
+            cache_control=cache_control()
+        )
+    return file_details["public_url"]
+
+
+async def store_image_derivatives(image: Any, basename: str, formats: Iterable[str] = ("webp",)) -> Dict[str, str]:
+    """
+    Encode and upload full-size variants and a WebP thumbnail of a decoded image
+    
+    Args:
+        image: Pillow image
+        basename: Filename without extension, e.g. "visual_summary_12"
+        formats: Full-size formats to store, from CONTENT_TYPES
+    
+    Returns:
+        Public URL per variant, e.g. {"png": ..., "webp": ..., "thumbnail": ...}
+    """
+    formats = list(dict.fromkeys(formats))
+    with tracing_service.span("image.encode", formats=",".join(formats)):
+        variants = await asyncio.to_thread(_encode_variants, image, formats)
+    
+    names = list(variants)
+    urls = await asyncio.gather(*(
+        upload_bytes(
+            variants[name],
+            f"{basename}_thumb.webp" if name == "thumbnail" else f"{basename}.{name}",
+            CONTENT_TYPES["webp" if name == "thumbnail" else name]
+        )
+        for name in names
+    ))
+    logger.info(
+        f"🖼️  Stored {basename} as {', '.join(names)} "
+        f"({', '.join(f'{len(variants[name]) // 1024}KB' for name in names)})"
+    )
+    return dict(zip(names, urls))
+
+
+async def store_remote_image(url: str, basename: str, formats: Iterable[str] = ("webp",)) -> Dict[str, str]:
+    """
+    Stream a remote image into storage while decoding it for its derivatives
+    
+    The downloaded chunks are uploaded as they arrive and fed to Pillow's
+    incremental parser on the way through, so the original is never held in
+    memory as a whole and is decoded exactly once. Without Pillow only the
+    original is stored.
+    
+    Returns:
+        Public URL per variant: "original" plus those of store_image_derivatives()
+    """
+    try:
+        from PIL import ImageFile
+        parser: Optional[Any] = ImageFile.Parser()
+    except ImportError:
+        logger.warning("⚠️  Pillow not installed - storing the original image without derivatives")
+        parser = None
+    
+    with tracing_service.span("image.stream", url_host=httpx.URL(url).host):
+        async with httpx.AsyncClient(timeout=30) as client:
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("content-type", "image/png").split(";")[0]
+                content_length = response.headers.get("content-length")
+                extension = mimetypes.guess_extension(content_type) or ".png"
+                
+                async def tee() -> AsyncIterator[bytes]:
+                    async for chunk in response.aiter_bytes():
+                        if parser is not None:
+                            parser.feed(chunk)
+                        yield chunk
+                
+                with tracing_service.span("storage.upload", size=int(content_length or 0)):
+                    file_details = await storage_service.upload_stream(
+                        tee(),
+                        f"{basename}{extension}",
+                        content_type,
+                        file_size=int(content_length) if content_length else None,
+                        cache_control=cache_control()
+                    )
+    
+    assets = {"original": file_details["public_url"]}
+    if parser is not None:
+        assets.update(await store_image_derivatives(parser.close(), basename, formats))
+    return assets
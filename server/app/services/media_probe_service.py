@@ -0,0 +1,204 @@
+import json
+import logging
+import shutil
+import subprocess
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.database import SessionLocal
+from app.models.media_probe import MediaProbe
+
+logger = logging.getLogger(__name__)
+
+# Decoded PCM is read from ffmpeg in chunks of this many bytes (s16le mono)
+READ_CHUNK_BYTES = 256 * 1024
+# Peaks are first taken over 10 ms blocks, then merged into the stored buckets
+BLOCKS_PER_SECOND = 100
+
+
+class MediaProbeService:
+    """
+    Probe and waveform peaks of a recording, taken once at ingest
+    
+    ffprobe reads the container headers for codec, duration, channels and bit
+    rate; ffmpeg then decodes the audio once to low-rate mono PCM, which is
+    streamed through NumPy into per-block peaks without ever holding the
+    decoded audio in memory. The player UI draws the stored peaks instead of
+    downloading the media, and the pipeline knows the duration before
+    transcription starts.
+    """
+    
+    @property
+    def is_available(self) -> bool:
+        """Whether ffmpeg and ffprobe are installed on this host"""
+        return bool(shutil.which(settings.ffmpeg_path) and shutil.which(settings.ffprobe_path))
+    
+    def probe(self, path: str) -> Dict[str, Any]:
+        """
+        Container and stream details of a media file
+        
+        Returns:
+            Dict with format_name, duration, bit_rate, audio_codec, channels,
+            sample_rate and video_codec (None where not present)
+        """
+        result = subprocess.run(
+            [
+                settings.ffprobe_path, "-v", "error",
+                "-print_format", "json", "-show_format", "-show_streams",
+                path
+            ],
+            capture_output=True,
+            text=True,
+            timeout=settings.media_ingest_timeout_seconds,
+            check=False
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"ffprobe failed: {result.stderr.strip()[:500]}")
+        return self._parse_probe(json.loads(result.stdout or "{}"))
+    
+    def _parse_probe(self, output: Dict[str, Any]) -> Dict[str, Any]:
+        media_format = output.get("format", {})
+        streams = output.get("streams", [])
+        audio = next((stream for stream in streams if stream.get("codec_type") == "audio"), {})
+        # Cover art in audio files shows up as a single-frame video stream
+        video = next(
+            (stream for stream in streams
+             if stream.get("codec_type") == "video" and not stream.get("disposition", {}).get("attached_pic")),
+            {}
+        )
+        
+        def number(value: Any, kind=float) -> Optional[Any]:
+            try:
+                return kind(float(value)) if value not in (None, "N/A") else None
+            except (TypeError, ValueError):
+                return None
+        
+        return {
+            "format_name": media_format.get("format_name"),
+            "duration": number(media_format.get("duration")) or number(audio.get("duration")),
+            "bit_rate": number(media_format.get("bit_rate"), int),
+            "audio_codec": audio.get("codec_name"),
+            "channels": number(audio.get("channels"), int),
+            "sample_rate": number(audio.get("sample_rate"), int),
+            "video_codec": video.get("codec_name"),
+        }
+    
+    def compute_peaks(self, path: str, peak_count: Optional[int] = None) -> Tuple[np.ndarray, float]:
+        """
+        Downsampled waveform peaks from a single streaming decode
+        
+        Args:
+            path: Media file
+            peak_count: Number of buckets (default waveform_peak_count)
+        
+        Returns:
+            (peaks, decoded_seconds): uint8 peaks scaled so the loudest bucket
+            is 255, fewer than peak_count for very short recordings
+        """
+        peak_count = peak_count or settings.waveform_peak_count
+        sample_rate = settings.waveform_sample_rate
+        block = max(sample_rate // BLOCKS_PER_SECOND, 1)
+        
+        # stderr goes to a file so a noisy decode can never fill a pipe and stall ffmpeg
+        stderr_file = tempfile.TemporaryFile()
+        process = subprocess.Popen(
+            [
+                settings.ffmpeg_path, "-v", "error", "-nostdin",
+                "-i", path,
+                "-vn", "-ac", "1", "-ar", str(sample_rate),
+                "-f", "s16le", "-acodec", "pcm_s16le", "-"
+            ],
+            stdout=subprocess.PIPE,
+            stderr=stderr_file
+        )
+        timer = threading.Timer(settings.media_ingest_timeout_seconds, process.kill)
+        timer.start()
+        
+        block_peaks: List[np.ndarray] = []
+        carry = np.empty(0, dtype=np.int16)
+        samples = 0
+        try:
+            while True:
+                # Buffered reads return short only at the end of the stream
+                chunk = process.stdout.read(READ_CHUNK_BYTES)
+                if len(chunk) % 2:
+                    chunk = chunk[:-1]
+                if not chunk:
+                    break
+                pcm = np.frombuffer(chunk, dtype="<i2")
+                samples += len(pcm)
+                if len(carry):
+                    pcm = np.concatenate((carry, pcm))
+                usable = len(pcm) - len(pcm) % block
+                if usable:
+                    # int32 so that abs(-32768) does not wrap
+                    block_peaks.append(np.abs(pcm[:usable].astype(np.int32)).reshape(-1, block).max(axis=1))
+                carry = pcm[usable:]
+            returncode = process.wait()
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace")
+        finally:
+            timer.cancel()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            stderr_file.close()
+        
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg failed ({returncode}): {stderr.strip()[:500]}")
+        
+        if len(carry):
+            block_peaks.append(np.abs(carry.astype(np.int32)).max(keepdims=True))
+        blocks = np.concatenate(block_peaks) if block_peaks else np.zeros(0, dtype=np.int32)
+        
+        if len(blocks) > peak_count:
+            edges = np.linspace(0, len(blocks), peak_count + 1).astype(np.int64)[:-1]
+            blocks = np.maximum.reduceat(blocks, edges)
+        loudest = blocks.max() if len(blocks) else 0
+        peaks = np.round(blocks * (255.0 / loudest)).astype(np.uint8) if loudest else blocks.astype(np.uint8)
+        return peaks, samples / sample_rate
+    
+    def save(self, recording_id: int, result: Dict[str, Any]) -> MediaProbe:
+        """Store (or replace) the probe of a recording"""
+        db = SessionLocal()
+        try:
+            row = db.query(MediaProbe).filter(MediaProbe.recording_id == recording_id).first()
+            if row is None:
+                row = MediaProbe(recording_id=recording_id)
+                db.add(row)
+            
+            for field in ("format_name", "duration", "bit_rate", "audio_codec", "channels", "sample_rate", "video_codec"):
+                setattr(row, field, result[field])
+            row.peaks = result["peaks"].tobytes()
+            row.peak_count = len(result["peaks"])
+            row.created_at = datetime.utcnow()
+            db.commit()
+            db.refresh(row)
+            return row
+        except Exception as e:
+            logger.error(f"❌ Failed to store media probe for recording {recording_id}: {e}")
+            db.rollback()
+            raise e
+        finally:
+            db.close()
+    
+    def get(self, recording_id: int) -> Optional[MediaProbe]:
+        """Get the stored probe of a recording"""
+        db = SessionLocal()
+        try:
+            return db.query(MediaProbe).filter(MediaProbe.recording_id == recording_id).first()
+        finally:
+            db.close()
+    
+    def decode_peaks(self, row: MediaProbe) -> np.ndarray:
+        """Get the stored peaks of a probe without copying them"""
+        return np.frombuffer(row.peaks or b"", dtype=np.uint8)
+
+
+# Global media probe service instance
+media_probe_service = MediaProbeService()
@@ -0,0 +1,300 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Tuple
+
+from app.core.config import settings
+from app.models.database import engine, background_engine
+from app.services.task_service import task_service
+from app.services.tracing_service import tracing_service
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "kirki:metrics:"
+
+# Request latencies are mostly sub-second; pipeline stages and OpenAI calls run for minutes
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LONG_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0)
+
+# name -> (type, help, histogram buckets)
+METRICS: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {
+    "kirki_http_request_duration_seconds": ("histogram", "API request latency by route", REQUEST_BUCKETS),
+    "kirki_pipeline_stage_duration_seconds": ("histogram", "Duration of recording processing stages", LONG_BUCKETS),
+    "kirki_openai_request_duration_seconds": ("histogram", "Latency of OpenAI API calls", LONG_BUCKETS),
+    "kirki_openai_requests_total": ("counter", "OpenAI API calls by outcome (HTTP status on error)", ()),
+    "kirki_openai_tokens_total": ("counter", "OpenAI tokens consumed", ()),
+}
+
+
+class MetricsStore:
+    """
+    Counters and histograms kept as flat hashes of label-string -> value
+    
+    Backed by Redis when a connection is given, so metrics recorded in forked
+    RQ workers are visible to the API's /metrics endpoint; otherwise in memory.
+    """
+    
+    def __init__(self, redis_conn=None):
+        self.redis_conn = redis_conn
+        self._data: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, name: str, labels: Dict[str, str], value: float = 1.0) -> None:
+        """Increment a counter"""
+        self._increment(name, {_format_labels(labels): value})
+    
+    def observe(self, name: str, labels: Dict[str, str], value: float) -> None:
+        """Record one histogram observation"""
+        buckets = METRICS[name][2]
+        bucket = next((str(bound) for bound in buckets if value <= bound), "+Inf")
+        label_str = _format_labels(labels)
+        self._increment(name, {
+            f"{label_str}\x1fbucket\x1f{bucket}": 1,
+            f"{label_str}\x1fsum": value,
+            f"{label_str}\x1fcount": 1,
+        })
+    
+    def read(self, name: str) -> Dict[str, float]:
+        """Get every field of a metric"""
+        if self.redis_conn is None:
+            with self._lock:
+                return dict(self._data.get(name, {}))
+        raw = self.redis_conn.hgetall(REDIS_KEY_PREFIX + name)
+        return {field.decode(): float(value) for field, value in raw.items()}
+    
+    def _increment(self, name: str, increments: Dict[str, float]) -> None:
+        if self.redis_conn is None:
+            with self._lock:
+                fields = self._data.setdefault(name, {})
+                for field, value in increments.items():
+                    fields[field] = fields.get(field, 0.0) + value
+            return
+        
+        try:
+            pipe = self.redis_conn.pipeline(transaction=False)
+            for field, value in increments.items():
+                pipe.hincrbyfloat(REDIS_KEY_PREFIX + name, field, value)
+            pipe.execute()
+        except Exception as e:
+            # Metrics must never break the work they measure
+            logger.debug(f"Failed to record metric {name}: {e}")
+
+
+class StageTimer:
+    """Handle yielded by track_stage; set outcome for failures reported without raising"""
+    
+    def __init__(self):
+        self.outcome = "success"
+
+
+class OpenAICall:
+    """Handle yielded by track_openai_call for attaching the response"""
+    
+    def __init__(self):
+        self.response: Any = None
+    
+    def record(self, response: Any) -> Any:
+        self.response = response
+        return response
+
+
+class MetricsService:
+    """Collects API, pipeline and OpenAI metrics and renders them in Prometheus text format"""
+    
+    def __init__(self):
+        self.enabled = settings.metrics_enabled
+        # Request latencies are recorded per API process on the hot path;
+        # pipeline and OpenAI metrics are shared through Redis
+        self.local = MetricsStore()
+        self.shared = MetricsStore(task_service.redis_conn)
+    
+    def observe_request(self, method: str, route: str, status_code: int, duration: float) -> None:
+        """Record the latency of one API request"""
+        if not self.enabled:
+            return
+        self.local.observe(
+            "kirki_http_request_duration_seconds",
+            {"method": method, "route": route, "status": str(status_code)},
+            duration
+        )
+    
+    @contextmanager
+    def track_stage(self, stage: str) -> Iterator[StageTimer]:
+        """Time a processing stage (ingest, waveform, transcribe, analyze, visualize, label), also as a trace span"""
+        timer = StageTimer()
+        started = time.perf_counter()
+        try:
+            with tracing_service.span(f"stage.{stage}") as span:
+                yield timer
+                if timer.outcome != "success":
+                    span["status"] = timer.outcome
+        except Exception:
+            timer.outcome = "error"
+            raise
+        finally:
+            if self.enabled:
+                self.shared.observe(
+                    "kirki_pipeline_stage_duration_seconds",
+                    {"stage": stage, "outcome": timer.outcome},
+                    time.perf_counter() - started
+                )
+    
+    @contextmanager
+    def track_openai_call(self, operation: str, model: str) -> Iterator[OpenAICall]:
+        """
+        Time an OpenAI call and count its outcome and token usage
+        
+        Usage:
+            with metrics_service.track_openai_call("chat", "gpt-4o") as call:
+                response = call.record(client.chat.completions.create(...))
+        """
+        call = OpenAICall()
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            with tracing_service.span(f"openai.{operation}", model=model):
+                yield call
+                # Token counts on the span roll up into the recording's llm_usage
+                usage = getattr(call.response, "usage", None)
+                if usage is not None:
+                    tracing_service.set_attribute("prompt_tokens", getattr(usage, "prompt_tokens", None) or 0)
+                    tracing_service.set_attribute("completion_tokens", getattr(usage, "completion_tokens", None) or 0)
+        except Exception as e:
+            # openai.APIStatusError carries the HTTP status; 429s show up as rate limiting
+            status = str(getattr(e, "status_code", None) or "error")
+            raise
+        finally:
+            if self.enabled:
+                self._record_openai_call(operation, model, status, time.perf_counter() - started, call.response)
+    
+    def summarize_openai_usage(self, spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Calls, tokens and route per OpenAI operation
+        
+        e.g. {"openai.analysis": {"calls": 1, "prompt_tokens": 9120, "completion_tokens": 850,
+        "model": "gpt-4o", "tier": "quality"}}; model and tier are those of the last call.
+        """
+        usage: Dict[str, Dict[str, Any]] = {}
+        for span in spans:
+            if not span["name"].startswith("openai."):
+                continue
+            totals = usage.setdefault(span["name"], {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+            totals["calls"] += 1
+            for kind in ("prompt_tokens", "completion_tokens"):
+                totals[kind] += span["attributes"].get(kind, 0)
+            for key in ("model", "tier"):
+                if key in span["attributes"]:
+                    totals[key] = span["attributes"][key]
+        return usage
+    
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for name, (metric_type, help_text, buckets) in METRICS.items():
+            store = self.local if name == "kirki_http_request_duration_seconds" else self.shared
+            try:
+                fields = store.read(name)
+            except Exception as e:
+                logger.warning(f"⚠️  Failed to read metric {name}: {e}")
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            if metric_type == "histogram":
+                lines.extend(_render_histogram(name, fields, buckets))
+            else:
+                lines.extend(f"{name}{{{labels}}} {_format_value(value)}" for labels, value in sorted(fields.items()))
+        
+        lines.extend(self._render_gauges())
+        return "\n".join(lines) + "\n"
+    
+    def _record_openai_call(self, operation: str, model: str, status: str, duration: float, response: Any) -> None:
+        labels = {"operation": operation, "model": model}
+        self.shared.observe("kirki_openai_request_duration_seconds", labels, duration)
+        self.shared.inc("kirki_openai_requests_total", {**labels, "status": status})
+        
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            for kind in ("prompt", "completion"):
+                tokens = getattr(usage, f"{kind}_tokens", None)
+                if tokens:
+                    self.shared.inc("kirki_openai_tokens_total", {**labels, "kind": kind}, tokens)
+    
+    def _render_gauges(self) -> List[str]:
+        """Point-in-time gauges read at scrape time"""
+        gauges: Dict[str, Tuple[str, List[Tuple[Dict[str, str], float]]]] = {
+            "kirki_db_pool_size": ("Configured connection pool size", []),
+            "kirki_db_pool_checked_out": ("Connections currently in use", []),
+            "kirki_db_pool_overflow": ("Connections opened beyond the pool size", []),
+            "kirki_queue_depth": ("Jobs waiting in an RQ queue", []),
+            "kirki_queue_oldest_job_age_seconds": ("Age of the oldest waiting job", []),
+        }
+        
+        for engine_name, db_engine in (("api", engine), ("background", background_engine)):
+            pool = db_engine.pool
+            labels = {"engine": engine_name}
+            for gauge, method in (
+                ("kirki_db_pool_size", "size"),
+                ("kirki_db_pool_checked_out", "checkedout"),
+                ("kirki_db_pool_overflow", "overflow"),
+            ):
+                if hasattr(pool, method):
+                    # QueuePool.overflow() counts up from -pool_size until the pool is exhausted
+                    gauges[gauge][1].append((labels, max(getattr(pool, method)(), 0)))
+        
+        for queue in (task_service.queue, task_service.diarization_queue, task_service.local_transcription_queue):
+            if queue is None:
+                continue
+            try:
+                labels = {"queue": queue.name}
+                gauges["kirki_queue_depth"][1].append((labels, queue.count))
+                oldest = queue.get_jobs(0, 1)
+                age = 0.0
+                if oldest and oldest[0].enqueued_at:
+                    age = max((datetime.utcnow() - oldest[0].enqueued_at.replace(tzinfo=None)).total_seconds(), 0.0)
+                gauges["kirki_queue_oldest_job_age_seconds"][1].append((labels, age))
+            except Exception as e:
+                logger.warning(f"⚠️  Failed to read queue metrics for {queue.name}: {e}")
+        
+        lines = []
+        for name, (help_text, samples) in gauges.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{{{_format_labels(labels)}}} {_format_value(value)}" for labels, value in samples)
+        return lines
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in sorted(labels.items())
+    )
+    return ",".join(f'{key}="{value}"' for key, value in escaped)
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _render_histogram(name: str, fields: Dict[str, float], buckets: Tuple[float, ...]) -> List[str]:
+    """Turn per-bucket counts back into cumulative Prometheus buckets"""
+    series: Dict[str, Dict[str, float]] = {}
+    for field, value in fields.items():
+        label_str, _, rest = field.partition("\x1f")
+        series.setdefault(label_str, {})[rest] = value
+    
+    lines = []
+    for label_str, values in sorted(series.items()):
+        prefix = f"{label_str}," if label_str else ""
+        cumulative = 0.0
+        for bound in [str(bound) for bound in buckets] + ["+Inf"]:
+            cumulative += values.get(f"bucket\x1f{bound}", 0.0)
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {_format_value(cumulative)}')
+        lines.append(f"{name}_sum{{{label_str}}} {_format_value(values.get('sum', 0.0))}")
+        lines.append(f"{name}_count{{{label_str}}} {_format_value(values.get('count', 0.0))}")
+    return lines
+
+
+# Global metrics service instance
+metrics_service = MetricsService()
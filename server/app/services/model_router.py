@@ -0,0 +1,151 @@
+import logging
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.services.metrics_service import metrics_service
+from app.services.tracing_service import tracing_service
+
+logger = logging.getLogger(__name__)
+
+# Per task: completion budget at the smallest and largest input, and temperature
+TASK_DEFAULTS = {
+    "analysis": {"min_tokens": 600, "max_tokens": 2000, "temperature": 0.3},
+    "analysis_fallback": {"min_tokens": 300, "max_tokens": 500, "temperature": 0.3},
+    "labeling": {"min_tokens": 300, "max_tokens": 1000, "temperature": 0.3},
+}
+# For tasks without a configured latency SLO
+DEFAULT_SLO_SECONDS = 60.0
+# Output needed grows with the input, e.g. more action items in longer meetings
+OUTPUT_TOKENS_PER_INPUT_TOKEN = 0.1
+
+# Rough per-model speed for the latency estimate: (seconds to first token, output tokens per second)
+MODEL_SPEEDS = {
+    "gpt-4o-mini": (0.5, 120.0),
+    "gpt-4o": (0.8, 70.0),
+}
+DEFAULT_SPEED = (1.0, 50.0)
+# Prompt processing is much faster than generation but not free
+INPUT_TOKENS_PER_SECOND = 5000.0
+
+# Errors worth retrying on the fallback model, matched by name so the openai SDK need not be imported
+RETRYABLE_ERRORS = ("APITimeoutError", "APIConnectionError", "RateLimitError", "InternalServerError")
+
+
+class ModelRoute:
+    """Model and request parameters chosen for one LLM call"""
+    
+    def __init__(
+        self,
+        task: str,
+        tier: str,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+        timeout: float,
+        fallback_model: Optional[str]
+    ):
+        self.task = task
+        self.tier = tier
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.timeout = timeout
+        self.fallback_model = fallback_model
+    
+    def __repr__(self) -> str:
+        return f"ModelRoute({self.task}: {self.tier} {self.model}, max_tokens={self.max_tokens})"
+
+
+class ModelRouter:
+    """
+    Routing policy that picks the model and request parameters per LLM task
+    
+    Small inputs from short recordings go to the fast tier; everything else to
+    the quality tier, unless its estimated completion time would miss the
+    latency SLO. Calls made through create_completion() are retried once on
+    the fallback model when the routed model times out or is overloaded.
+    """
+    
+    def route(self, task: str, input_tokens: int, duration: Optional[float] = None) -> ModelRoute:
+        """
+        Choose a route for one call
+        
+        Args:
+            task: Key of TASK_DEFAULTS
+            input_tokens: Prompt size in tokens
+            duration: Recording duration in seconds, if known
+        """
+        defaults = TASK_DEFAULTS[task]
+        slo = settings.llm_latency_slo_seconds.get(task, DEFAULT_SLO_SECONDS)
+        max_tokens = int(min(
+            max(input_tokens * OUTPUT_TOKENS_PER_INPUT_TOKEN, defaults["min_tokens"]),
+            defaults["max_tokens"]
+        ))
+        
+        override = settings.llm_route_overrides.get(task)
+        if override:
+            tier, model = "override", override
+        elif input_tokens <= settings.llm_fast_max_input_tokens and (duration or 0) <= settings.llm_fast_max_duration_seconds:
+            tier, model = "fast", settings.llm_fast_model
+        elif self.estimate_seconds(settings.llm_quality_model, input_tokens, max_tokens) > slo:
+            tier, model = "fast_slo", settings.llm_fast_model
+        else:
+            tier, model = "quality", settings.llm_quality_model
+        
+        fallback_model = settings.llm_fallback_model if settings.llm_fallback_model != model else None
+        route = ModelRoute(
+            task=task,
+            tier=tier,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=defaults["temperature"],
+            timeout=slo * settings.llm_timeout_slo_multiple,
+            fallback_model=fallback_model
+        )
+        logger.info(f"🧭 Routed {task} ({input_tokens} input tokens) to {route.model} [{route.tier}]")
+        return route
+    
+    def estimate_seconds(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        """Expected completion time if the model writes its whole output budget"""
+        first_token, tokens_per_second = next(
+            (speed for name, speed in sorted(MODEL_SPEEDS.items(), key=lambda item: -len(item[0])) if model.startswith(name)),
+            DEFAULT_SPEED
+        )
+        return first_token + input_tokens / INPUT_TOKENS_PER_SECOND + output_tokens / tokens_per_second
+    
+    def is_retryable(self, error: Exception) -> bool:
+        """Whether a failed call should be retried on the fallback model"""
+        return type(error).__name__ in RETRYABLE_ERRORS or getattr(error, "status_code", None) in (429, 500, 502, 503)
+    
+    def create_completion(self, create: Callable[..., Any], route: ModelRoute, operation: str, **request: Any) -> Any:
+        """
+        Make a chat completion on the routed model, falling back once on timeouts and overload
+        
+        Args:
+            create: The client's chat.completions.create
+            route: Route from route()
+            operation: Metrics and tracing name of the call
+            **request: Remaining request arguments (messages, response_format, ...)
+        """
+        try:
+            return self._create(create, route, operation, route.model, route.tier, **request)
+        except Exception as e:
+            if not route.fallback_model or not self.is_retryable(e):
+                raise
+            logger.warning(f"⚠️  {route.model} failed for {operation} ({type(e).__name__}), retrying on {route.fallback_model}")
+            return self._create(create, route, operation, route.fallback_model, "fallback", **request)
+    
+    def _create(self, create: Callable[..., Any], route: ModelRoute, operation: str, model: str, tier: str, **request: Any) -> Any:
+        with metrics_service.track_openai_call(operation, model) as call:
+            tracing_service.set_attribute("tier", tier)
+            return call.record(create(
+                model=model,
+                max_tokens=route.max_tokens,
+                temperature=route.temperature,
+                timeout=route.timeout,
+                **request
+            ))
+
+
+# Global model router instance
+model_router = ModelRouter()
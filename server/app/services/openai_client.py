@@ -0,0 +1,60 @@
+import logging
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+logger = logging.getLogger(__name__)
+
+_client: Optional["OpenAI"] = None
+_async_client: Optional["AsyncOpenAI"] = None
+_lock = threading.Lock()
+
+
+def get_openai_client() -> Optional["OpenAI"]:
+    """
+    Get the OpenAI client shared by all services, creating it on first use
+    
+    The openai SDK is only imported here, so the API process does not pay for
+    it at startup and processes that never call OpenAI never load it.
+    
+    Returns:
+        The client, or None if no API key is configured
+    """
+    global _client
+    if _client is not None or not settings.openai_api_key:
+        return _client
+    
+    with _lock:
+        if _client is None:
+            from openai import OpenAI
+            
+            _client = OpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
+            logger.info("✅ OpenAI client initialized")
+    return _client
+
+
+def get_async_openai_client() -> Optional["AsyncOpenAI"]:
+    """
+    Get the shared asyncio OpenAI client, creating it on first use
+    
+    Used for streamed completions served by the API, which must not block its
+    event loop while tokens arrive. Bound to the loop it is first used on.
+    
+    Returns:
+        The client, or None if no API key is configured
+    """
+    global _async_client
+    if _async_client is not None or not settings.openai_api_key:
+        return _async_client
+    
+    with _lock:
+        if _async_client is None:
+            from openai import AsyncOpenAI
+            
+            _async_client = AsyncOpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
+            logger.info("✅ Async OpenAI client initialized")
+    return _async_client
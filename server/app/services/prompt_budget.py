@@ -0,0 +1,188 @@
+import logging
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Context window per model family; unknown models get the smallest one listed
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Chat formatting adds a few tokens per message plus the reply primer
+TOKENS_PER_MESSAGE = 3
+REPLY_PRIMER_TOKENS = 3
+
+# Rough ratio used only when tiktoken or its encoding files are unavailable
+CHARS_PER_TOKEN = 4
+
+# Inserted where segments were left out of a fitted transcript
+GAP_MARKER = "[...]"
+
+# Words that tend to mark the segments an analysis or labeling prompt needs
+CUE_WORDS = frozenset((
+    "decide", "decided", "decision", "agree", "agreed", "approve", "approved",
+    "action", "owner", "deadline", "due", "will", "next", "plan", "budget",
+    "priority", "risk", "blocker", "launch", "ship", "follow", "assign",
+))
+
+_WORD = re.compile(r"[a-z0-9']+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str) -> Optional[Any]:
+    """tiktoken encoding for a model, loaded once per process (None if unavailable)"""
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("⚠️  tiktoken not installed - estimating prompt tokens from text length")
+        return None
+    
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # The first use downloads the BPE file, which fails on hosts without internet access
+        logger.warning(f"⚠️  Failed to load tiktoken encoding for {model} - estimating prompt tokens: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Number of tokens `text` encodes to for `model`"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode_ordinary(text))
+
+
+def count_message_tokens(messages: Sequence[Dict[str, str]], model: str) -> int:
+    """Prompt tokens a chat completion request will be billed for"""
+    return sum(
+        TOKENS_PER_MESSAGE + count_tokens(message["content"], model)
+        for message in messages
+    ) + REPLY_PRIMER_TOKENS
+
+
+def context_window(model: str) -> int:
+    """Context window of a model, matched by longest known prefix"""
+    for name in sorted(MODEL_CONTEXT_WINDOWS, key=len, reverse=True):
+        if model.startswith(name):
+            return MODEL_CONTEXT_WINDOWS[name]
+    return DEFAULT_CONTEXT_WINDOW
+
+
+def input_budget(model: str, prompt_tokens: int, max_output_tokens: int, cap: Optional[int] = None) -> int:
+    """
+    Tokens left for variable content (e.g. a transcript) in one request
+    
+    Args:
+        model: Model the request goes to
+        prompt_tokens: Tokens already used by the fixed parts of the prompt
+        max_output_tokens: max_tokens reserved for the completion
+        cap: Optional configured ceiling, to bound latency and cost below the model limit
+    """
+    budget = context_window(model) - prompt_tokens - max_output_tokens
+    if cap is not None:
+        budget = min(budget, cap)
+    return max(budget, 0)
+
+
+def _split_segments(text: str) -> List[str]:
+    """Speaker-labelled lines, with long lines further split into sentences"""
+    segments = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        segments.extend(sentence for sentence in _SENTENCE_END.split(line) if sentence)
+    return segments
+
+
+def _score_segments(segments: List[str]) -> List[float]:
+    """
+    Informativeness of each segment: summed inverse document frequency of its
+    distinct words plus a bonus for cue words, per word so long segments do
+    not win just by length
+    """
+    terms = [set(_WORD.findall(segment.lower())) for segment in segments]
+    document_frequency = Counter(term for segment_terms in terms for term in segment_terms)
+    total = len(segments)
+    
+    scores = []
+    for segment, segment_terms in zip(segments, terms):
+        if not segment_terms:
+            scores.append(0.0)
+            continue
+        idf = sum(math.log(total / document_frequency[term]) for term in segment_terms)
+        cues = len(segment_terms & CUE_WORDS)
+        scores.append((idf + 2.0 * cues) / math.sqrt(len(_WORD.findall(segment.lower())) or 1))
+    return scores
+
+
+def fit_to_budget(text: str, max_tokens: int, model: str) -> str:
+    """
+    Shorten a transcript to at most `max_tokens` by keeping its most informative segments
+    
+    Text that already fits is returned unchanged. Otherwise segments are
+    ranked by informativeness and taken greedily, always starting with the
+    opening and closing segments; the kept ones are joined in their original
+    order with a gap marker where anything was left out.
+    """
+    if max_tokens <= 0 or not text:
+        return ""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    
+    segments = _split_segments(text)
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        costs = [len(tokens) for tokens in encoding.encode_ordinary_batch(segments)]
+    else:
+        costs = [math.ceil(len(segment) / CHARS_PER_TOKEN) for segment in segments]
+    gap_cost = count_tokens(f"\n{GAP_MARKER}\n", model)
+    
+    scores = _score_segments(segments)
+    order = sorted(range(len(segments)), key=lambda i: scores[i], reverse=True)
+    if len(segments) > 1:
+        order = [0, len(segments) - 1] + [i for i in order if i not in (0, len(segments) - 1)]
+    
+    kept = set()
+    used = 0
+    for i in order:
+        # Budget a gap marker for every kept segment so the join always fits
+        cost = costs[i] + gap_cost
+        if used + cost <= max_tokens:
+            kept.add(i)
+            used += cost
+    
+    if not kept:
+        # A single segment larger than the whole budget: keep its opening tokens
+        if encoding is not None:
+            return encoding.decode(encoding.encode_ordinary(text)[:max_tokens])
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    
+    parts: List[str] = []
+    previous = -1
+    for i in sorted(kept):
+        if i != previous + 1:
+            parts.append(GAP_MARKER)
+        parts.append(segments[i])
+        previous = i
+    if previous != len(segments) - 1:
+        parts.append(GAP_MARKER)
+    
+    logger.info(f"✂️  Fitted transcript to {max_tokens} tokens: kept {len(kept)} of {len(segments)} segments")
+    return "\n".join(parts)
@@ -1,9 +1,12 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
 
 from app.models.recording import Recording
+from app.models.transcript_index import TranscriptIndex
+from app.models.media_probe import MediaProbe
 from app.models.database import SessionLocal
 
 logger = logging.getLogger(__name__)
@@ -116,9 +119,19 @@ class RecordingService:
         self,
         recording_id: int,
         visual_summary_url: Optional[str] = None,
-        labels: Optional[List[Dict[str, Any]]] = None
+        visual_assets: Optional[Dict[str, str]] = None,
+        duration: Optional[float] = None,
+        labels: Optional[List[Dict[str, Any]]] = None,
+        processing_timings: Optional[Dict[str, float]] = None,
+        llm_usage: Optional[Dict[str, Dict[str, Any]]] = None,
+        add_llm_usage: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> Optional[Recording]:
-        """Update recording with additional data like visual summary"""
+        """
+        Update recording with additional data like visual summary
+        
+        llm_usage replaces the stored LLM usage; add_llm_usage adds the usage of
+        later calls, such as on-demand labeling, to it.
+        """
         logger.info(f"📝 Updating recording {recording_id}")
         
         db = SessionLocal()
@@ -127,8 +140,18 @@ class RecordingService:
             if recording:
                 if visual_summary_url:
                     recording.visual_summary_url = visual_summary_url
+                if visual_assets is not None:
+                    recording.visual_assets = visual_assets
+                if duration is not None:
+                    recording.duration = duration
                 if labels is not None:
                     recording.labels = labels
+                if processing_timings is not None:
+                    recording.processing_timings = processing_timings
+                if llm_usage is not None:
+                    recording.llm_usage = llm_usage
+                if add_llm_usage:
+                    recording.llm_usage = _merge_llm_usage(recording.llm_usage, add_llm_usage)
                 recording.updated_at = datetime.utcnow()
                 db.commit()
                 db.refresh(recording)
@@ -141,11 +164,58 @@ class RecordingService:
         finally:
             db.close()
     
-    def get_recording(self, recording_id: int) -> Optional[Recording]:
-        """Get a recording by ID"""
+    def get_recording(self, recording_id: int, fields: Optional[List[str]] = None) -> Optional[Recording]:
+        """
+        Get a recording by ID
+        
+        Args:
+            recording_id: Recording ID
+            fields: Column names to load; other columns (e.g. large transcripts)
+                    are never read from the database. Loads everything if None.
+        """
+        db = SessionLocal()
+        try:
+            query = db.query(Recording)
+            if fields is not None:
+                query = query.options(load_only(*(getattr(Recording, field) for field in fields)))
+            return query.filter(Recording.id == recording_id).first()
+        finally:
+            db.close()
+    
+    def get_recording_version(self, recording_id: int) -> Optional[datetime]:
+        """Get only the last-modified time of a recording (None if it does not exist)"""
+        db = SessionLocal()
+        try:
+            row = db.query(Recording.updated_at).filter(Recording.id == recording_id).first()
+            return row.updated_at if row else None
+        finally:
+            db.close()
+    
+    def get_recordings_version(self) -> tuple:
+        """Get (count, max ID, latest update) which changes whenever any recording does"""
+        db = SessionLocal()
+        try:
+            return tuple(db.query(
+                func.count(Recording.id),
+                func.max(Recording.id),
+                func.max(Recording.updated_at)
+            ).one())
+        finally:
+            db.close()
+    
+    def get_recording_by_storage_path(self, storage_path: str) -> Optional[Recording]:
+        """Get a recording by the storage path of its media file"""
         db = SessionLocal()
         try:
-            return db.query(Recording).filter(Recording.id == recording_id).first()
+            return db.query(Recording).filter(Recording.storage_path == storage_path).first()
+        finally:
+            db.close()
+    
+    def get_recordings_by_ids(self, recording_ids: List[int]) -> List[Recording]:
+        """Get all recordings with the given IDs"""
+        db = SessionLocal()
+        try:
+            return db.query(Recording).filter(Recording.id.in_(recording_ids)).all()
         finally:
             db.close()
     
@@ -171,13 +241,56 @@ class RecordingService:
         try:
             recording = db.query(Recording).filter(Recording.id == recording_id).first()
             if recording:
+                # SQLite does not enforce ON DELETE CASCADE, so drop the index and probe explicitly
+                db.query(TranscriptIndex).filter(TranscriptIndex.recording_id == recording_id).delete()
+                db.query(MediaProbe).filter(MediaProbe.recording_id == recording_id).delete()
                 db.delete(recording)
                 db.commit()
                 return True
             return False
         finally:
             db.close()
+    
+    def delete_recordings(self, recording_ids: List[int]) -> int:
+        """Delete several recordings in one statement, returning how many were removed"""
+        if not recording_ids:
+            return 0
+        
+        db = SessionLocal()
+        try:
+            db.query(TranscriptIndex).filter(
+                TranscriptIndex.recording_id.in_(recording_ids)
+            ).delete(synchronize_session=False)
+            db.query(MediaProbe).filter(
+                MediaProbe.recording_id.in_(recording_ids)
+            ).delete(synchronize_session=False)
+            deleted = db.query(Recording).filter(
+                Recording.id.in_(recording_ids)
+            ).delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        except Exception as e:
+            logger.error(f"❌ Failed to delete recordings {recording_ids}: {e}")
+            db.rollback()
+            raise e
+        finally:
+            db.close()
+
 
+def _merge_llm_usage(
+    existing: Optional[Dict[str, Dict[str, Any]]],
+    usage: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """Sum calls and tokens per operation; model and tier are those of the latest call"""
+    merged = {operation: dict(totals) for operation, totals in (existing or {}).items()}
+    for operation, totals in usage.items():
+        target = merged.setdefault(operation, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+        for key, value in totals.items():
+            if key in ("calls", "prompt_tokens", "completion_tokens"):
+                target[key] = target.get(key, 0) + value
+            else:
+                target[key] = value
+    return merged
 
 
 # Global recording service instance
@@ -0,0 +1,91 @@
+import logging
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from app.services.diarization_service import SpeakerTurn
+
+logger = logging.getLogger(__name__)
+
+
+class SpeakerTimeline:
+    """
+    Diarization turns packed into sorted NumPy arrays for fast lookups
+    
+    Building the timeline is O(S log S); assigning W words is O(W log S),
+    versus scanning every turn for every word.
+    """
+    
+    def __init__(self, turns: Sequence[SpeakerTurn]):
+        ordered = sorted(turns, key=lambda turn: (turn[0], turn[1]))
+        self.starts = np.array([turn[0] for turn in ordered], dtype=np.float64)
+        self.ends = np.array([turn[1] for turn in ordered], dtype=np.float64)
+        
+        labels = [turn[2] for turn in ordered]
+        self.speakers, self.speaker_codes = np.unique(np.array(labels, dtype=object), return_inverse=True)
+        
+        # Index of the turn with the furthest end among turns[0..i], so a long
+        # turn that started well before a word is still considered
+        if len(ordered):
+            running_max = np.maximum.accumulate(self.ends)
+            is_new_max = np.concatenate(([True], self.ends[1:] >= running_max[:-1]))
+            self.longest_so_far = np.maximum.accumulate(np.where(is_new_max, np.arange(len(ordered)), 0))
+        else:
+            self.longest_so_far = np.array([], dtype=np.int64)
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def assign(self, word_starts: np.ndarray, word_ends: np.ndarray) -> np.ndarray:
+        """
+        Assign a turn index to every word
+        
+        Each word is compared with up to three candidate turns: the last turn
+        starting at or before it, the longest-running earlier turn and the next
+        turn. The candidate that overlaps the word most wins; words falling in a
+        gap between turns go to the nearest turn.
+        """
+        count = len(self.starts)
+        last_started = np.searchsorted(self.starts, word_starts, side="right") - 1
+        clamped = np.clip(last_started, 0, count - 1)
+        
+        candidates = np.stack([
+            clamped,
+            self.longest_so_far[clamped],
+            np.clip(last_started + 1, 0, count - 1),
+        ])
+        
+        candidate_starts = self.starts[candidates]
+        candidate_ends = self.ends[candidates]
+        overlap = np.minimum(word_ends, candidate_ends) - np.maximum(word_starts, candidate_starts)
+        distance = np.maximum(candidate_starts - word_ends, word_starts - candidate_ends)
+        
+        # Positive overlap always beats a gap; among gaps the nearest turn wins
+        score = np.where(overlap > 0, overlap, -np.maximum(distance, 0) - 1e-9)
+        best = np.argmax(score, axis=0)
+        return candidates[best, np.arange(len(word_starts))]
+    
+    def speakers_for(self, word_starts: np.ndarray, word_ends: np.ndarray) -> List[str]:
+        """Get the speaker label of every word"""
+        if not len(self) or not len(word_starts):
+            return ["Unknown"] * len(word_starts)
+        turn_indices = self.assign(word_starts, word_ends)
+        return self.speakers[self.speaker_codes[turn_indices]].tolist()
+
+
+def align_words_to_speakers(words: List[Dict[str, Any]], turns: Sequence[SpeakerTurn]) -> List[str]:
+    """
+    Label each Whisper word with the diarization speaker talking over it
+    
+    Args:
+        words: Whisper word timestamps as dicts with start and end
+        turns: Diarization turns as (start, end, speaker) tuples
+    
+    Returns:
+        One speaker label per word
+    """
+    word_starts = np.fromiter((word["start"] for word in words), dtype=np.float64, count=len(words))
+    word_ends = np.fromiter((word["end"] for word in words), dtype=np.float64, count=len(words))
+    # Guard against zero-length words so overlap is still measurable
+    word_ends = np.maximum(word_ends, word_starts + 1e-3)
+    return SpeakerTimeline(turns).speakers_for(word_starts, word_ends)
@@ -1,5 +1,7 @@
-from supabase import create_client, Client
-from typing import Optional, Dict, Any
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, AsyncIterator
+import asyncio
+import httpx
 import uuid
 import os
 import logging
@@ -8,15 +10,122 @@ from fastapi import HTTPException
 
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 logger = logging.getLogger(__name__)
 
 
-class SupabaseStorageService:
+class StorageBackend(ABC):
+    """Interface shared by all media storage backends"""
+    
+    @abstractmethod
+    def upload_file(
+        self, 
+        file_content: bytes, 
+        filename: str, 
+        content_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Store a file and return its upload details"""
+    
+    @abstractmethod
+    def create_signed_upload_url(self, filename: str) -> Dict[str, Any]:
+        """Create a URL the client can upload a file to without going through the API"""
+    
+    @abstractmethod
+    def get_file_metadata(self, storage_path: str) -> Optional[Dict[str, Any]]:
+        """Return size, content type and public URL of a stored file, or None if missing"""
+    
+    @abstractmethod
+    def download_file(self, storage_path: str) -> bytes:
+        """Read a stored file into memory"""
+    
+    @abstractmethod
+    def check_bucket_access(self) -> bool:
+        """Check whether the storage backend is reachable"""
+    
+    @abstractmethod
+    def get_bucket_info(self) -> Dict[str, str]:
+        """Return storage connectivity information for health checks"""
+    
+    @abstractmethod
+    def delete_file(self, storage_path: str) -> bool:
+        """Delete a stored file"""
+    
+    @abstractmethod
+    def delete_visual_summary(self, recording_id: int, visual_summary_url: str = None) -> bool:
+        """Delete the generated visual summary of a recording"""
+    
+    def storage_path_from_url(self, url: str) -> str:
+        """Map a public URL produced by this backend back to its storage path"""
+        return url
+    
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        content_type: Optional[str] = None,
+        file_size: Optional[int] = None,
+        cache_control: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Store a file from an async byte stream without blocking the event loop
+        
+        Backends without a native streaming client buffer the stream and run
+        upload_file in a worker thread. cache_control is applied by backends
+        that store it with the object.
+        """
+        file_content = b"".join([chunk async for chunk in chunks])
+        return await asyncio.to_thread(self.upload_file, file_content, filename, content_type)
+    
+    async def delete_files(self, storage_paths: List[str]) -> bool:
+        """
+        Delete several files without blocking the event loop
+        
+        Returns:
+            bool: True if every file was deleted
+        """
+        paths = [path for path in storage_paths if path]
+        if not paths:
+            return True
+        results = await asyncio.to_thread(lambda: [self.delete_file(path) for path in paths])
+        return all(results)
+    
+    async def aclose(self) -> None:
+        """Release any pooled connections held by the backend"""
+    
+    def get_local_path(self, storage_path: str) -> Optional[str]:
+        """
+        Get a filesystem path for a stored file, if the backend has one
+        
+        Co-located workers use this to read media without a network hop.
+        """
+        return None
+    
+    def _generate_storage_path(self, filename: str) -> str:
+        """
+        Generate a unique storage path with timestamp folder structure
+        
+        Args:
+            filename: Original filename
+            
+        Returns:
+            str: Generated storage path
+        """
+        file_extension = os.path.splitext(filename)[1]
+        unique_filename = f"{uuid.uuid4()}{file_extension}"
+        timestamp = datetime.now().strftime("%Y/%m/%d")
+        return f"uploads/{timestamp}/{unique_filename}"
+
+
+class SupabaseStorageService(StorageBackend):
     """Service class for handling Supabase Storage operations"""
     
-    def __init__(self):
+    def __init__(self, bucket_name: Optional[str] = None):
         logger.info("🏗️  Initializing SupabaseStorageService")
-        self._client: Optional[Client] = None
+        self.bucket_name = bucket_name or settings.storage_bucket_name
+        self._client: Optional["Client"] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
         # Don't initialize client during import - do it lazily
     
     def _initialize_client(self) -> None:
@@ -34,6 +143,9 @@ class SupabaseStorageService:
             raise ValueError("Supabase key not configured")
         
         try:
+            # Imported here so processes using local storage never load the Supabase SDK
+            from supabase import create_client
+            
             logger.debug(f"🌐 Connecting to Supabase: {settings.supabase_url}")
             self._client = create_client(
                 settings.supabase_url,
@@ -52,6 +164,140 @@ class SupabaseStorageService:
             self._initialize_client()
         return self._client
     
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled async HTTP client for the Storage REST API
+        
+        Connections are kept alive between requests, so uploads and deletes
+        from the API process skip the TCP/TLS handshake after the first call.
+        """
+        if self._async_client is None or self._async_client.is_closed:
+            supabase_key = settings.supabase_service_key or settings.supabase_key
+            if not settings.supabase_url or not supabase_key:
+                raise ValueError("Supabase URL or key not configured")
+            
+            self._async_client = httpx.AsyncClient(
+                base_url=f"{settings.supabase_url.rstrip('/')}/storage/v1",
+                headers={
+                    "Authorization": f"Bearer {supabase_key}",
+                    "apikey": supabase_key
+                },
+                limits=httpx.Limits(
+                    max_connections=settings.storage_max_connections,
+                    max_keepalive_connections=settings.storage_max_keepalive_connections,
+                    keepalive_expiry=settings.storage_keepalive_expiry_seconds
+                ),
+                timeout=httpx.Timeout(settings.storage_timeout_seconds, connect=10.0)
+            )
+        return self._async_client
+    
+    async def aclose(self) -> None:
+        """Close the pooled async HTTP client"""
+        if self._async_client is not None and not self._async_client.is_closed:
+            await self._async_client.aclose()
+        self._async_client = None
+    
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        content_type: Optional[str] = None,
+        file_size: Optional[int] = None,
+        cache_control: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream a file to Supabase Storage over the pooled async client
+        
+        Args:
+            chunks: Async iterator over the file content
+            filename: Original filename
+            content_type: MIME type of the file
+            file_size: Size in bytes, sent as Content-Length when known
+            cache_control: Cache-Control served with the object (default max-age=3600)
+            
+        Returns:
+            Dict containing upload details
+            
+        Raises:
+            HTTPException: If upload fails
+        """
+        storage_path = self._generate_storage_path(filename)
+        logger.info(f"📤 Streaming upload: {filename} -> {storage_path} ({file_size or 'unknown'} bytes)")
+        
+        headers = {
+            "content-type": content_type or 'application/octet-stream',
+            "cache-control": cache_control or "max-age=3600",
+            "x-upsert": "false"
+        }
+        if file_size is not None:
+            headers["content-length"] = str(file_size)
+        
+        try:
+            response = await self.async_client.post(
+                f"/object/{self.bucket_name}/{storage_path}",
+                content=chunks,
+                headers=headers
+            )
+        except Exception as e:
+            logger.error(f"❌ Upload failed for {filename}: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
+        
+        if response.status_code not in [200, 201]:
+            logger.error(f"❌ Upload failed with status {response.status_code}: {response.text}")
+            raise HTTPException(status_code=500, detail=f"Upload failed: {response.text}")
+        
+        logger.info(f"✅ File upload completed successfully: {filename}")
+        return {
+            'original_filename': filename,
+            'storage_path': storage_path,
+            'public_url': self._public_url_for(storage_path),
+            'file_size': file_size,
+            'content_type': content_type,
+            'upload_timestamp': datetime.now().isoformat()
+        }
+    
+    async def delete_files(self, storage_paths: List[str]) -> bool:
+        """
+        Delete many files with a single batched remove request
+        
+        Args:
+            storage_paths: Storage paths to delete
+            
+        Returns:
+            bool: True if the batch was accepted, False otherwise
+        """
+        paths = [path for path in storage_paths if path and path.strip()]
+        if not paths:
+            return True
+        
+        if not self.bucket_name:
+            logger.error("❌ Cannot delete files: storage bucket not configured")
+            return False
+        
+        try:
+            logger.info(f"🗑️  Deleting {len(paths)} files in one batch")
+            response = await self.async_client.request(
+                "DELETE",
+                f"/object/{self.bucket_name}",
+                json={"prefixes": paths}
+            )
+            if response.status_code not in [200, 204]:
+                logger.error(f"❌ Batch delete failed with status {response.status_code}: {response.text}")
+                return False
+            logger.info(f"✅ Successfully deleted {len(paths)} files")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Batch delete failed: {str(e)}")
+            return False
+    
+    def storage_path_from_url(self, url: str) -> str:
+        """Map a public object URL back to its path inside the bucket"""
+        marker = f"/storage/v1/object/public/{self.bucket_name}/"
+        if marker in url:
+            return url.split(marker, 1)[1].split("?", 1)[0]
+        return url
+    
     def upload_file(
         self, 
         file_content: bytes, 
@@ -80,8 +326,8 @@ class SupabaseStorageService:
             logger.debug(f"🗂️  Generated storage path: {storage_path}")
             
             # Upload to Supabase Storage
-            logger.info(f"☁️  Uploading to Supabase bucket: {settings.storage_bucket_name}")
-            response = self.client.storage.from_(settings.storage_bucket_name).upload(
+            logger.info(f"☁️  Uploading to Supabase bucket: {self.bucket_name}")
+            response = self.client.storage.from_(self.bucket_name).upload(
                 path=storage_path,
                 file=file_content,
                 file_options={
@@ -123,6 +369,80 @@ class SupabaseStorageService:
                 detail=f"Upload failed: {str(e)}"
             )
     
+    def create_signed_upload_url(self, filename: str) -> Dict[str, Any]:
+        """
+        Create a signed URL the client can upload to directly, bypassing the API
+        
+        Args:
+            filename: Original filename, used to derive the storage path
+            
+        Returns:
+            Dict containing the storage path, signed URL and upload token
+            
+        Raises:
+            HTTPException: If the signed URL cannot be created
+        """
+        storage_path = self._generate_storage_path(filename)
+        logger.info(f"✍️  Creating signed upload URL for {filename} -> {storage_path}")
+        
+        try:
+            signed = self.client.storage.from_(self.bucket_name).create_signed_upload_url(storage_path)
+            return {
+                'storage_path': storage_path,
+                'signed_url': signed['signed_url'],
+                'token': signed['token'],
+                'public_url': self._generate_public_url(storage_path)
+            }
+        except Exception as e:
+            logger.error(f"❌ Failed to create signed upload URL for {filename}: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to create signed upload URL: {str(e)}"
+            )
+    
+    def get_file_metadata(self, storage_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an object in the bucket without downloading it
+        
+        Args:
+            storage_path: The storage path of the file
+            
+        Returns:
+            Dict with the object's size, content type and public URL, or None if it does not exist
+        """
+        folder, _, name = storage_path.rpartition("/")
+        try:
+            entries = self.client.storage.from_(self.bucket_name).list(
+                folder,
+                {"limit": 1, "offset": 0, "search": name}
+            )
+        except Exception as e:
+            logger.error(f"❌ Failed to look up {storage_path}: {str(e)}")
+            return None
+        
+        for entry in entries or []:
+            if entry.get("name") == name:
+                metadata = entry.get("metadata") or {}
+                return {
+                    'file_size': metadata.get("size"),
+                    'content_type': metadata.get("mimetype"),
+                    'public_url': self._generate_public_url(storage_path)
+                }
+        return None
+    
+    def download_file(self, storage_path: str) -> bytes:
+        """
+        Download a file from Supabase Storage
+        
+        Args:
+            storage_path: The storage path of the file
+            
+        Returns:
+            bytes: The file content
+        """
+        logger.info(f"📥 Downloading file from storage: {storage_path}")
+        return self.client.storage.from_(self.bucket_name).download(storage_path)
+    
     def check_bucket_access(self) -> bool:
         """
         Check if the Supabase Storage bucket is accessible
@@ -131,8 +451,8 @@ class SupabaseStorageService:
             bool: True if bucket is accessible, False otherwise
         """
         try:
-            # Try to list files in the bucket to check access
-            response = self.client.storage.from_(settings.storage_bucket_name).list()
+            # List a single entry - enough to prove access without scanning the bucket
+            self.client.storage.from_(self.bucket_name).list(None, {"limit": 1})
             return True
         except Exception:
             return False
@@ -148,27 +468,12 @@ class SupabaseStorageService:
             return {"status": "not configured"}
         
         try:
-            # Try to access the bucket
-            self.client.storage.from_(settings.storage_bucket_name).list()
+            # Try to access the bucket, listing a single entry regardless of bucket size
+            self.client.storage.from_(self.bucket_name).list(None, {"limit": 1})
             return {"status": "connected"}
         except Exception as e:
             return {"status": f"error: {str(e)}"}
     
-    def _generate_storage_path(self, filename: str) -> str:
-        """
-        Generate a unique storage path with timestamp folder structure
-        
-        Args:
-            filename: Original filename
-            
-        Returns:
-            str: Generated storage path
-        """
-        file_extension = os.path.splitext(filename)[1]
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        timestamp = datetime.now().strftime("%Y/%m/%d")
-        return f"uploads/{timestamp}/{unique_filename}"
-    
     def _generate_public_url(self, storage_path: str) -> str:
         """
         Generate the public URL for a file in Supabase Storage
@@ -180,11 +485,15 @@ class SupabaseStorageService:
             str: Public URL
         """
         try:
-            response = self.client.storage.from_(settings.storage_bucket_name).get_public_url(storage_path)
+            response = self.client.storage.from_(self.bucket_name).get_public_url(storage_path)
             return response
         except Exception as e:
             # Fallback to constructed URL if get_public_url fails
-            return f"{settings.supabase_url}/storage/v1/object/public/{settings.storage_bucket_name}/{storage_path}"
+            return self._public_url_for(storage_path)
+    
+    def _public_url_for(self, storage_path: str) -> str:
+        """Build a public URL without going through the SDK client"""
+        return f"{settings.supabase_url}/storage/v1/object/public/{self.bucket_name}/{storage_path}"
 
     def delete_file(self, storage_path: str) -> bool:
         """
@@ -200,13 +509,13 @@ class SupabaseStorageService:
             logger.error("❌ Cannot delete file: storage_path is empty")
             return False
             
-        if not settings.storage_bucket_name:
+        if not self.bucket_name:
             logger.error("❌ Cannot delete file: storage bucket not configured")
             return False
         
         try:
             logger.info(f"🗑️  Deleting file: {storage_path}")
-            response = self.client.storage.from_(settings.storage_bucket_name).remove([storage_path])
+            response = self.client.storage.from_(self.bucket_name).remove([storage_path])
             
             # Handle successful deletion (response is typically a list or has status_code)
             if (isinstance(response, list) or 
@@ -236,14 +545,14 @@ class SupabaseStorageService:
             logger.warning(f"🎨 No visual summary URL provided for recording {recording_id}")
             return False
             
-        if not settings.storage_bucket_name:
+        if not self.bucket_name:
             logger.error("❌ Cannot delete visual summary: storage bucket not configured")
             return False
         
         try:
-        
-            
-            response = self.client.storage.from_(settings.storage_bucket_name).remove([visual_summary_url])
+            # Visual summaries are stored by URL; remove() needs the object path
+            storage_path = self.storage_path_from_url(visual_summary_url)
+            response = self.client.storage.from_(self.bucket_name).remove([storage_path])
             
             if (isinstance(response, list) or 
                 (hasattr(response, 'status_code') and response.status_code in [200, 204])):
@@ -257,4 +566,37 @@ class SupabaseStorageService:
             logger.error(f"❌ Failed to delete visual summary for recording {recording_id}: {str(e)}")
             return False
 
-storage_service = SupabaseStorageService()
\ No newline at end of file
+async def iter_upload_file(upload_file, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    """Yield an UploadFile's content in chunks without reading it all into memory"""
+    while True:
+        chunk = await upload_file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def iter_local_file(path: str, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    """Yield a local file's content in chunks, reading in a worker thread"""
+    with open(path, "rb") as source:
+        while True:
+            chunk = await asyncio.to_thread(source.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def create_storage_service() -> StorageBackend:
+    """Create the storage backend selected by settings.storage_backend"""
+    backend = (settings.storage_backend or "supabase").lower()
+    
+    if backend == "local":
+        from app.services.local_storage_service import LocalStorageService
+        return LocalStorageService()
+    if backend == "supabase":
+        return SupabaseStorageService()
+    
+    raise ValueError(f"Unknown storage backend: {settings.storage_backend}")
+
+
+# Global storage service instance
+storage_service = create_storage_service()
@@ -1,12 +1,20 @@
 import redis
-from rq import Queue
+from rq import Queue, Worker
+from rq.job import Job, JobStatus
+from rq.utils import import_attribute
 import logging
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Optional
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Queue served by the dedicated, warm-model diarization workers
+DIARIZATION_QUEUE = "diarization"
+# Queue served by the warm-model local (faster-whisper) transcription workers
+LOCAL_TRANSCRIPTION_QUEUE = "transcription-local"
+
 
 class TaskService:
     """Service for managing background tasks with Redis Queue"""
@@ -21,21 +29,26 @@ class TaskService:
                 decode_responses=False  # Keep binary data for file processing
             )
             
-            # Create queue
+            # Create queues
             self.queue = Queue(connection=self.redis_conn)
+            self.diarization_queue = Queue(DIARIZATION_QUEUE, connection=self.redis_conn)
+            self.local_transcription_queue = Queue(LOCAL_TRANSCRIPTION_QUEUE, connection=self.redis_conn)
             logger.info("✅ Task queue initialized successfully")
             
         except Exception as e:
             logger.error(f"❌ Failed to initialize task queue: {e}")
             self.redis_conn = None
             self.queue = None
+            self.diarization_queue = None
+            self.local_transcription_queue = None
     
     def enqueue_task(self, func, *args, **kwargs) -> str:
         """
         Enqueue a background task
         
         Args:
-            func: Function to execute
+            func: Function to execute, or its dotted import path so the caller
+                never has to import the task module (and its dependencies)
             *args: Function arguments
             **kwargs: Function keyword arguments
             
@@ -45,19 +58,97 @@ class TaskService:
         if not self.queue:
             logger.error("❌ Task queue not available - falling back to synchronous execution")
             # Fallback to synchronous execution
-            func(*args, **kwargs)
+            self._resolve(func)(*args, **kwargs)
             return "sync-fallback"
         
         try:
-            job = self.queue.enqueue(func, *args, **kwargs, timeout='30m')  # 30 min timeout
+            job = self.queue.enqueue(func, *args, **kwargs, job_timeout='30m')  # 30 min timeout
             logger.info(f"📤 Task enqueued successfully. Job ID: {job.id}")
             return job.id
         except Exception as e:
             logger.error(f"❌ Failed to enqueue task: {e}")
             # Fallback to synchronous execution
-            func(*args, **kwargs)
+            self._resolve(func)(*args, **kwargs)
             return "sync-fallback"
     
+    def _resolve(self, func):
+        """Import a task given by dotted path; RQ does the same inside the worker"""
+        return import_attribute(func) if isinstance(func, str) else func
+    
+    def enqueue_diarization(self, func, *args, **kwargs) -> Optional[Job]:
+        """
+        Enqueue a job on the diarization queue
+        
+        Unlike enqueue_task there is no synchronous fallback: diarization must
+        never load its model inside the API or the general worker. Returns None
+        when the queue is unavailable or no diarization worker is listening.
+        """
+        if not self.diarization_queue:
+            return None
+        
+        try:
+            if not Worker.all(queue=self.diarization_queue):
+                logger.warning("⚠️  No diarization workers running - skipping speaker diarization")
+                return None
+            
+            job = self.diarization_queue.enqueue(
+                func, *args, **kwargs,
+                job_timeout=settings.diarization_timeout_seconds,
+                result_ttl=3600
+            )
+            logger.info(f"📤 Diarization job enqueued. Job ID: {job.id}")
+            return job
+        except Exception as e:
+            logger.error(f"❌ Failed to enqueue diarization job: {e}")
+            return None
+    
+    def enqueue_local_transcription(self, func, *args, **kwargs) -> Optional[Job]:
+        """
+        Enqueue a job on the local transcription queue
+        
+        Same contract as enqueue_diarization: no synchronous fallback, and None
+        when the queue is unavailable or no local transcription worker is
+        listening, so the caller can fall back to the Whisper API.
+        """
+        if not self.local_transcription_queue:
+            return None
+        
+        try:
+            if not Worker.all(queue=self.local_transcription_queue):
+                logger.warning("⚠️  No local transcription workers running")
+                return None
+            
+            job = self.local_transcription_queue.enqueue(
+                func, *args, **kwargs,
+                job_timeout=settings.local_transcription_timeout_seconds,
+                result_ttl=600
+            )
+            logger.info(f"📤 Local transcription job enqueued. Job ID: {job.id}")
+            return job
+        except Exception as e:
+            logger.error(f"❌ Failed to enqueue local transcription job: {e}")
+            return None
+    
+    def wait_for_job(self, job: Job, timeout: float, poll_interval: float = 0.5) -> Optional[Any]:
+        """
+        Block until a job finishes and return its result
+        
+        Returns:
+            The job result, or None if it failed or did not finish in time
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            status = job.get_status(refresh=True)
+            if status == JobStatus.FINISHED:
+                return job.return_value()
+            if status in (JobStatus.FAILED, JobStatus.STOPPED, JobStatus.CANCELED):
+                logger.error(f"❌ Job {job.id} ended with status {status}")
+                return None
+            time.sleep(poll_interval)
+        
+        logger.error(f"❌ Timed out after {timeout}s waiting for job {job.id}")
+        return None
+    
     def get_job_status(self, job_id: str) -> Dict[str, Any]:
         """Get status of a background job"""
         if not self.queue or job_id == "sync-fallback":
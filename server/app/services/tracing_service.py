@@ -0,0 +1,146 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# The innermost open span; child spans and propagated job contexts hang off it
+_current_span: ContextVar[Optional[Dict[str, Any]]] = ContextVar("kirki_current_span", default=None)
+# Spans finished under a continue_trace() block, for the per-recording breakdown
+_collector: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("kirki_span_collector", default=None)
+
+
+class TracingService:
+    """
+    Minimal span tracer with trace context propagated through RQ job arguments
+    
+    Finished spans are appended as JSON lines to a local file so a trace can be
+    reassembled across the API, the transcription worker and the diarization
+    worker by its trace_id.
+    """
+    
+    def __init__(self):
+        self.enabled = settings.tracing_enabled
+        self.export_path = settings.trace_export_path
+        self._export_lock = threading.Lock()
+    
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """Record a span as a child of the current one (or as a new trace root)"""
+        if not self.enabled:
+            yield {}
+            return
+        
+        parent = _current_span.get()
+        span = {
+            "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex,
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_id": parent["span_id"] if parent else None,
+            "name": name,
+            "start": time.time(),
+            "attributes": attributes,
+            "status": "ok"
+        }
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span["status"] = "error"
+            span["attributes"]["error"] = str(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            self._finish(span)
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the innermost open span"""
+        span = _current_span.get()
+        if span and "attributes" in span:
+            span["attributes"][key] = value
+    
+    def current_context(self) -> Optional[Dict[str, str]]:
+        """Get the trace context to pass along with an enqueued job"""
+        span = _current_span.get()
+        if not span:
+            return None
+        return {"trace_id": span["trace_id"], "span_id": span["span_id"]}
+    
+    @contextmanager
+    def continue_trace(
+        self,
+        context: Optional[Dict[str, str]],
+        name: str,
+        **attributes: Any
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Open a job's root span under a propagated context and collect every span finished inside it
+        
+        Yields:
+            The list the finished spans are appended to
+        """
+        spans: List[Dict[str, Any]] = []
+        collector_token = _collector.set(spans)
+        parent_token = _current_span.set(dict(context) if context else None)
+        try:
+            with self.span(name, **attributes):
+                yield spans
+        finally:
+            _current_span.reset(parent_token)
+            _collector.reset(collector_token)
+    
+    def record_span(self, name: str, start: datetime, end: Optional[datetime] = None, **attributes: Any) -> None:
+        """Record a span that was not observed directly, such as time spent waiting in a queue"""
+        if not self.enabled:
+            return
+        
+        # RQ stores naive UTC timestamps
+        start_ts = start.replace(tzinfo=start.tzinfo or timezone.utc).timestamp()
+        end_ts = end.replace(tzinfo=end.tzinfo or timezone.utc).timestamp() if end else time.time()
+        parent = _current_span.get()
+        self._finish({
+            "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex,
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_id": parent["span_id"] if parent else None,
+            "name": name,
+            "start": start_ts,
+            "attributes": attributes,
+            "status": "ok",
+            "duration_ms": round(max(end_ts - start_ts, 0.0) * 1000, 3)
+        })
+    
+    def summarize(self, spans: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Total seconds per span name, e.g. {"queue.wait": 2.1, "openai.transcription": 48.3, ...}"""
+        totals: Dict[str, float] = {}
+        for span in spans:
+            totals[span["name"]] = totals.get(span["name"], 0.0) + span["duration_ms"] / 1000
+        return {name: round(seconds, 3) for name, seconds in totals.items()}
+    
+    def _finish(self, span: Dict[str, Any]) -> None:
+        collector = _collector.get()
+        if collector is not None:
+            collector.append(span)
+        
+        if not self.export_path:
+            return
+        try:
+            line = json.dumps(span, default=str)
+            with self._export_lock:
+                with open(self.export_path, "a") as export_file:
+                    export_file.write(line + "\n")
+        except Exception as e:
+            # Tracing must never break the work it measures
+            logger.debug(f"Failed to export span {span['name']}: {e}")
+
+
+# Global tracing service instance
+tracing_service = TracingService()
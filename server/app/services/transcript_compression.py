@@ -0,0 +1,176 @@
+import logging
+import re
+from collections import Counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.tracing_service import tracing_service
+
+logger = logging.getLogger(__name__)
+
+# Hesitations dropped wherever they appear
+_FILLERS = re.compile(r"(?:,\s*)?\b(?:u+m+|u+h+|e+r+m+|h+m+|m+h*m+)\b,?", re.IGNORECASE)
+# Discourse fillers, only when set off by a comma ("so, you know, we ship" -> "so, we ship")
+_DISCOURSE_FILLERS = re.compile(r"\b(?:you know|i mean|basically|like),\s*", re.IGNORECASE)
+# Stutters and repeats ("we we we should" -> "we should")
+_REPEATS = re.compile(r"\b(\w+)(?:\s+\1\b)+", re.IGNORECASE)
+# Punctuation left behind by a removed filler ("fine. Hmm." -> "fine. .")
+_ORPHAN_PUNCTUATION = re.compile(r"(?:^|(?<=[.!?]))\s*[,.]+")
+_SPACES = re.compile(r"\s{2,}")
+# Leading "[Speaker SPEAKER_00]:" / "[00:12:31]" tags, kept verbatim on every turn
+_TAGS = re.compile(r"^((?:\[[^\]]*\]:?\s*)+)")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z0-9']+")
+
+# Sentences at least this similar to one just before them are dropped as repeats
+DUPLICATE_SIMILARITY = 0.85
+DUPLICATE_WINDOW = 6
+# TextRank damping factor and power-iteration rounds
+DAMPING = 0.85
+ITERATIONS = 30
+
+# A turn: its tags and the sentences spoken in it
+Turn = Tuple[str, List[str]]
+
+
+def remove_fillers(text: str) -> str:
+    """Drop hesitations, comma-bounded discourse fillers and stuttered repeats"""
+    text = _FILLERS.sub("", text)
+    text = _DISCOURSE_FILLERS.sub("", text)
+    text = _REPEATS.sub(r"\1", text)
+    text = _ORPHAN_PUNCTUATION.sub("", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def _parse_turns(text: str) -> List[Turn]:
+    turns = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        match = _TAGS.match(line)
+        tags = match.group(1) if match else ""
+        body = remove_fillers(line[len(tags):])
+        sentences = [sentence for sentence in _SENTENCE_END.split(body) if sentence]
+        if sentences:
+            turns.append((tags, sentences))
+    return turns
+
+
+def _tfidf_matrix(sentences: List[str]) -> np.ndarray:
+    """
+    L2-normalised TF-IDF rows, one per sentence
+    
+    Words used in a single sentence cannot make two sentences similar and are
+    left out, which keeps the dense matrix small for long meetings.
+    """
+    tokens = [_WORD.findall(sentence.lower()) for sentence in sentences]
+    document_counts = Counter(word for words in tokens for word in set(words))
+    vocabulary = {}
+    rows, columns = [], []
+    for row, words in enumerate(tokens):
+        for word in words:
+            if document_counts[word] > 1:
+                rows.append(row)
+                columns.append(vocabulary.setdefault(word, len(vocabulary)))
+    
+    matrix = np.zeros((len(sentences), max(len(vocabulary), 1)), dtype=np.float32)
+    if rows:
+        np.add.at(matrix, (np.array(rows), np.array(columns)), 1.0)
+    
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)).astype(np.float32) + 1.0
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-9)
+
+
+def _near_duplicates(matrix: np.ndarray) -> np.ndarray:
+    """Mask of sentences that repeat one of the few sentences just before them"""
+    duplicate = np.zeros(len(matrix), dtype=bool)
+    for offset in range(1, DUPLICATE_WINDOW + 1):
+        if offset >= len(matrix):
+            break
+        similarity = np.einsum("ij,ij->i", matrix[offset:], matrix[:-offset])
+        duplicate[offset:] |= similarity >= DUPLICATE_SIMILARITY
+    return duplicate
+
+
+def _textrank(matrix: np.ndarray) -> np.ndarray:
+    """
+    TextRank over cosine similarity between sentences
+    
+    The N x N similarity matrix is never built: S @ v is computed as
+    X @ (X.T @ v) minus the diagonal, which keeps memory linear in the
+    number of sentences for multi-hour transcripts.
+    """
+    count = len(matrix)
+    self_similarity = np.einsum("ij,ij->i", matrix, matrix)
+    
+    def similarity_times(vector: np.ndarray) -> np.ndarray:
+        return matrix @ (matrix.T @ vector) - self_similarity * vector
+    
+    out_weight = np.maximum(similarity_times(np.ones(count, dtype=np.float32)), 1e-9)
+    rank = np.full(count, 1.0 / count, dtype=np.float32)
+    for _ in range(ITERATIONS):
+        rank = (1 - DAMPING) / count + DAMPING * similarity_times(rank / out_weight)
+    return rank
+
+
+def compress_transcript(text: str, target_ratio: Optional[float] = None) -> str:
+    """
+    Shrink a transcript to about `target_ratio` of its length before it goes to an LLM
+    
+    Fillers and stutters are removed, near-duplicate sentences collapsed, and
+    the remaining sentences ranked by TextRank blended with their mean TF-IDF
+    weight. The best-ranked sentences are kept in their original order under
+    their original speaker tags. Transcripts shorter than
+    transcript_compression_min_chars only get the filler clean-up.
+    """
+    if not settings.transcript_compression_enabled or not text:
+        return text
+    target_ratio = target_ratio or settings.transcript_compression_ratio
+    
+    with tracing_service.span("transcript.compress", original_chars=len(text)):
+        turns = _parse_turns(text)
+        if len(text) < settings.transcript_compression_min_chars:
+            return "\n\n".join(f"{tags}{' '.join(sentences)}" for tags, sentences in turns)
+        
+        sentences = [sentence for _, turn_sentences in turns for sentence in turn_sentences]
+        if not sentences:
+            return ""
+        matrix = _tfidf_matrix(sentences)
+        
+        duplicate = _near_duplicates(matrix)
+        rank = _textrank(matrix)
+        weight = matrix.sum(axis=1) / np.maximum(np.count_nonzero(matrix, axis=1), 1)
+        score = rank / max(rank.max(), 1e-9) + weight / max(weight.max(), 1e-9)
+        score[duplicate] = -np.inf
+        
+        lengths = np.array([len(sentence) + 1 for sentence in sentences])
+        keep = np.zeros(len(sentences), dtype=bool)
+        budget = target_ratio * len(text)
+        used = 0
+        for index in np.argsort(-score, kind="stable"):
+            if duplicate[index] or used + lengths[index] > budget:
+                continue
+            keep[index] = True
+            used += lengths[index]
+        
+        compressed = []
+        position = 0
+        for tags, turn_sentences in turns:
+            kept = [sentence for offset, sentence in enumerate(turn_sentences) if keep[position + offset]]
+            position += len(turn_sentences)
+            if kept:
+                compressed.append(f"{tags}{' '.join(kept)}")
+        result = "\n\n".join(compressed)
+        
+        tracing_service.set_attribute("compressed_chars", len(result))
+        logger.info(
+            f"🗜️  Compressed transcript from {len(text)} to {len(result)} characters "
+            f"({int(keep.sum())} of {len(sentences)} sentences, {int(duplicate.sum())} repeats dropped)"
+        )
+        return result
@@ -0,0 +1,264 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.models.database import SessionLocal
+from app.models.transcript_index import TranscriptIndex
+from app.services.diarization_service import SpeakerTurn
+from app.services.speaker_alignment import align_words_to_speakers
+
+logger = logging.getLogger(__name__)
+
+# One packed record per word: 16 bytes instead of a JSON object per word
+WORD_DTYPE = np.dtype([
+    ("start", "<f4"),
+    ("end", "<f4"),
+    ("speaker", "<u2"),
+    ("text_start", "<u4"),
+    ("text_end", "<u4"),
+])
+
+# Speaker code used when a recording was not diarized
+NO_SPEAKER = np.iinfo(np.uint16).max
+
+SEGMENT_COLUMNS = ("start", "end", "speaker", "text_start", "text_end")
+
+
+class TranscriptIndexService:
+    """
+    Columnar word/segment index over a recording's plain transcript
+    
+    Words and segments store character offsets into Recording.transcript rather
+    than copies of the text, so search hits and excerpts map to playback times
+    with a binary search instead of re-scanning or re-transcribing.
+    """
+    
+    def build_index(
+        self,
+        transcript: str,
+        words: List[Dict[str, Any]],
+        segments: Optional[List[Dict[str, Any]]] = None,
+        turns: Optional[Sequence[SpeakerTurn]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the index from Whisper output and optional diarization turns
+        
+        Args:
+            transcript: Plain Whisper transcript the offsets refer to
+            words: Whisper word timestamps as dicts with start, end and word
+            segments: Whisper segments as dicts with start, end and text
+            turns: Diarization turns as (start, end, speaker) tuples
+        
+        Returns:
+            Dict with speakers, columnar segments and the packed word array
+        """
+        packed = np.zeros(len(words), dtype=WORD_DTYPE)
+        packed["start"] = [word["start"] for word in words]
+        packed["end"] = [word["end"] for word in words]
+        packed["text_start"], packed["text_end"] = self._locate(transcript, [word["word"] for word in words])
+        
+        speakers: List[str] = []
+        packed["speaker"] = NO_SPEAKER
+        if turns and words:
+            labels = np.array(align_words_to_speakers(words, turns), dtype=object)
+            unique_labels, codes = np.unique(labels, return_inverse=True)
+            speakers = unique_labels.tolist()
+            packed["speaker"] = codes
+        
+        if segments:
+            segment_columns = self._columns_from_segments(transcript, segments, packed)
+        else:
+            segment_columns = self._columns_from_speaker_runs(packed)
+        
+        return {
+            "speakers": speakers,
+            "segments": segment_columns,
+            "words": packed
+        }
+    
+    def save_index(self, recording_id: int, index: Dict[str, Any]) -> TranscriptIndex:
+        """Store (or replace) the transcript index of a recording"""
+        db = SessionLocal()
+        try:
+            row = db.query(TranscriptIndex).filter(TranscriptIndex.recording_id == recording_id).first()
+            if row is None:
+                row = TranscriptIndex(recording_id=recording_id)
+                db.add(row)
+            
+            row.speakers = index["speakers"]
+            row.segments = index["segments"]
+            row.words = index["words"].tobytes()
+            row.word_count = len(index["words"])
+            row.created_at = datetime.utcnow()
+            db.commit()
+            db.refresh(row)
+            
+            logger.info(f"🗂️  Stored transcript index for recording {recording_id}: {row.word_count} words, {len(row.segments['start'])} segments")
+            return row
+        except Exception as e:
+            logger.error(f"❌ Failed to store transcript index for recording {recording_id}: {e}")
+            db.rollback()
+            raise e
+        finally:
+            db.close()
+    
+    def get_index(self, recording_id: int) -> Optional[TranscriptIndex]:
+        """Get the stored transcript index of a recording"""
+        db = SessionLocal()
+        try:
+            return db.query(TranscriptIndex).filter(TranscriptIndex.recording_id == recording_id).first()
+        finally:
+            db.close()
+    
+    def get_indexes(self, recording_ids: List[int]) -> Dict[int, TranscriptIndex]:
+        """Get the stored transcript indexes of several recordings keyed by recording ID"""
+        if not recording_ids:
+            return {}
+        db = SessionLocal()
+        try:
+            rows = db.query(TranscriptIndex).filter(TranscriptIndex.recording_id.in_(recording_ids)).all()
+            return {row.recording_id: row for row in rows}
+        finally:
+            db.close()
+    
+    def decode_words(self, row: TranscriptIndex) -> np.ndarray:
+        """Get the packed word records of an index without copying them"""
+        return np.frombuffer(row.words or b"", dtype=WORD_DTYPE)
+    
+    def time_at_offset(self, row: TranscriptIndex, char_offset: int) -> Optional[float]:
+        """
+        Get the playback time of the word containing a transcript character offset
+        
+        Returns:
+            Start time in seconds, or None if the index has no words
+        """
+        words = self.decode_words(row)
+        if not len(words):
+            return None
+        position = int(np.searchsorted(words["text_start"], char_offset, side="right")) - 1
+        return float(words["start"][max(position, 0)])
+    
+    def segments_between(
+        self,
+        row: TranscriptIndex,
+        transcript: str,
+        start: float = 0.0,
+        end: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the segments overlapping a time window, with their text and speaker
+        
+        Args:
+            row: Stored transcript index
+            transcript: Plain transcript the index offsets refer to
+            start: Window start in seconds
+            end: Window end in seconds (open-ended if None)
+        """
+        columns = row.segments or {}
+        starts = np.asarray(columns.get("start", []), dtype=np.float64)
+        ends = np.asarray(columns.get("end", []), dtype=np.float64)
+        
+        # Segments are sorted by start, so only the upper bound needs a binary search
+        upper = len(starts) if end is None else int(np.searchsorted(starts, end, side="left"))
+        selected = np.nonzero(ends[:upper] > start)[0]
+        return self._segment_dicts(row, transcript, selected.tolist())
+    
+    def segments_by_index(
+        self,
+        row: TranscriptIndex,
+        transcript: str,
+        first: int = 0,
+        last: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get segments first..last (inclusive) with their text and speaker"""
+        count = self.segment_count(row)
+        stop = count if last is None else min(last + 1, count)
+        return self._segment_dicts(row, transcript, list(range(max(first, 0), stop)))
+    
+    def segment_count(self, row: TranscriptIndex) -> int:
+        """Number of segments in an index"""
+        return len((row.segments or {}).get("start", []))
+    
+    def _segment_dicts(self, row: TranscriptIndex, transcript: str, indices: List[int]) -> List[Dict[str, Any]]:
+        """Materialise the selected columnar segments as dicts"""
+        columns = row.segments
+        speakers = row.speakers or []
+        results = []
+        for i in indices:
+            speaker_code = columns["speaker"][i]
+            results.append({
+                "index": i,
+                "start": columns["start"][i],
+                "end": columns["end"][i],
+                "speaker": speakers[speaker_code] if speaker_code < len(speakers) else None,
+                "text": transcript[columns["text_start"][i]:columns["text_end"][i]].strip()
+            })
+        return results
+    
+    def _locate(self, transcript: str, pieces: List[str]) -> tuple:
+        """Find character offsets of consecutive pieces of the transcript"""
+        text_starts = np.zeros(len(pieces), dtype=np.uint32)
+        text_ends = np.zeros(len(pieces), dtype=np.uint32)
+        cursor = 0
+        for i, piece in enumerate(pieces):
+            piece = piece.strip()
+            found = transcript.find(piece, cursor) if piece else -1
+            if found < 0:
+                # Whisper words normally match the transcript verbatim; keep
+                # unmatched ones as empty spans at the current position
+                text_starts[i] = text_ends[i] = cursor
+                continue
+            text_starts[i] = found
+            text_ends[i] = cursor = found + len(piece)
+        return text_starts, text_ends
+    
+    def _columns_from_segments(
+        self,
+        transcript: str,
+        segments: List[Dict[str, Any]],
+        words: np.ndarray
+    ) -> Dict[str, List]:
+        """Columnar Whisper segments, each labelled with its dominant speaker"""
+        segments = sorted(segments, key=lambda segment: segment["start"])
+        text_starts, text_ends = self._locate(transcript, [segment["text"] for segment in segments])
+        starts = np.array([segment["start"] for segment in segments], dtype=np.float64)
+        ends = np.array([segment["end"] for segment in segments], dtype=np.float64)
+        
+        # Each word belongs to the last segment starting at or before it
+        word_segments = np.clip(np.searchsorted(starts, words["start"], side="right") - 1, 0, None)
+        segment_speakers = np.full(len(segments), NO_SPEAKER, dtype=np.int64)
+        labelled = words["speaker"] != NO_SPEAKER
+        for i in np.unique(word_segments[labelled]).tolist():
+            codes = words["speaker"][labelled & (word_segments == i)]
+            segment_speakers[i] = int(np.bincount(codes).argmax())
+        
+        return {
+            "start": starts.tolist(),
+            "end": ends.tolist(),
+            "speaker": segment_speakers.tolist(),
+            "text_start": text_starts.tolist(),
+            "text_end": text_ends.tolist()
+        }
+    
+    def _columns_from_speaker_runs(self, words: np.ndarray) -> Dict[str, List]:
+        """Segments from runs of consecutive words by the same speaker when Whisper gave none"""
+        if not len(words):
+            return {column: [] for column in SEGMENT_COLUMNS}
+        
+        boundaries = np.flatnonzero(np.diff(words["speaker"].astype(np.int64))) + 1
+        run_starts = np.concatenate(([0], boundaries))
+        run_ends = np.concatenate((boundaries, [len(words)])) - 1
+        return {
+            # Round away float32 noise so the JSON column stays readable
+            "start": np.round(words["start"][run_starts].astype(np.float64), 3).tolist(),
+            "end": np.round(words["end"][run_ends].astype(np.float64), 3).tolist(),
+            "speaker": words["speaker"][run_starts].astype(np.int64).tolist(),
+            "text_start": words["text_start"][run_starts].astype(np.int64).tolist(),
+            "text_end": words["text_end"][run_ends].astype(np.int64).tolist()
+        }
+
+
+# Global transcript index service instance
+transcript_index_service = TranscriptIndexService()
@@ -2,11 +2,19 @@ import os
 import tempfile
 import httpx
 import logging
-from typing import Optional, Dict, Any
-from openai import OpenAI
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 import json
 
 from app.core.config import settings
+from app.services.openai_client import get_openai_client
+from app.services.diarization_service import SpeakerTurn
+from app.services.local_transcription_service import local_transcription_service
+from app.services.metrics_service import metrics_service
+from app.services.speaker_alignment import align_words_to_speakers
+from app.services.tracing_service import tracing_service
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
@@ -17,65 +25,49 @@ class TranscriptionService:
     def __init__(self):
         logger.info("🎤 Initializing TranscriptionService")
         
-        if settings.openai_api_key:
-            self.openai_client = OpenAI(api_key=settings.openai_api_key)
-            logger.info("✅ OpenAI client initialized")
-        else:
-            self.openai_client = None
+        if not settings.openai_api_key:
             logger.warning("⚠️  OpenAI API key not configured - transcription will not be available")
         
-        # Speaker diarization disabled for Docker stability
-        self.diarization_pipeline = None
-        self.hf_token = settings.huggingface_access_token
-        logger.info("⏭️  Speaker diarization disabled for Docker compatibility")
-        
-    def _initialize_diarization(self):
-        """Initialize the speaker diarization pipeline with memory optimization"""
-        if self.hf_token and not self.diarization_pipeline:
-            try:
-                logger.info("🔧 Initializing diarization pipeline with CPU optimization...")
-                
-                # Clear any existing torch cache
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
-                gc.collect()
-                
-                # Try both token and use_auth_token parameters for compatibility
-                try:
-                    self.diarization_pipeline = Pipeline.from_pretrained(
-                        "pyannote/speaker-diarization-3.1",
-                        use_auth_token=self.hf_token
-                    )
-                except Exception:
-                    # Fallback to token parameter for newer versions
-                    self.diarization_pipeline = Pipeline.from_pretrained(
-                        "pyannote/speaker-diarization-3.1",
-                        token=self.hf_token
-                    )
-                
-                # Force CPU usage and optimize for Docker
-                if hasattr(self.diarization_pipeline, 'to'):
-                    self.diarization_pipeline.to(torch.device('cpu'))
-                
-                logger.info("✅ Speaker diarization pipeline initialized with CPU optimization")
-            except Exception as e:
-                logger.error(f"❌ Failed to initialize diarization pipeline: {e}")
-                logger.error(f"❌ Make sure you have accepted user conditions for both pyannote/segmentation-3.0 and pyannote/speaker-diarization-3.1 models")
-                logger.error(f"❌ Visit: https://huggingface.co/pyannote/segmentation-3.0 and https://huggingface.co/pyannote/speaker-diarization-3.1")
+        # Speaker diarization runs on dedicated workers (see diarization_service);
+        # this service only aligns the resulting speaker turns with Whisper words
     
-    async def transcribe_media(self, media_url: str, file_content: bytes) -> Dict[str, Any]:
+    @property
+    def openai_client(self) -> Optional["OpenAI"]:
+        """Shared OpenAI client, created on first use"""
+        return get_openai_client()
+    
+    async def transcribe_media(
+        self,
+        media_url: str,
+        file_content: bytes,
+        storage_path: Optional[str] = None,
+        duration: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Transcribe audio/video file using OpenAI Whisper and add speaker diarization
         
+        Short recordings go to the local faster-whisper workers when the
+        transcription backend allows it, falling back to the Whisper API if
+        no local worker is available.
+        
         Args:
             media_url: URL of the uploaded media file
             file_content: Raw file content as bytes
+            storage_path: Storage path of the file; required for local transcription
+            duration: Media duration in seconds, if known before transcribing
             
         Returns:
             Dict containing transcript and speaker-diarized transcript
         """
         logger.info(f"🎯 Starting transcription for media: {media_url} ({len(file_content)} bytes)")
         
+        if storage_path and local_transcription_service.should_use(len(file_content), duration):
+            local_result = self._transcribe_local(storage_path)
+            if local_result is not None:
+                return local_result
+            logger.warning("⚠️  Local transcription unavailable, falling back to the Whisper API")
+        tracing_service.set_attribute("transcription.backend", "openai")
+        
         if not self.openai_client:
             logger.error("❌ OpenAI API key not configured")
             raise ValueError("OpenAI API key not configured")
@@ -83,6 +75,8 @@ class TranscriptionService:
         result = {
             "transcript": "",
             "transcript_with_speakers": "",
+            "words": [],
+            "segments": [],
             "duration": None,
             "error": None
         }
@@ -100,29 +94,38 @@ class TranscriptionService:
                 with open(temp_file_path, "rb") as audio_file:
                     try:
                         # Try with word-level timestamps (newer API)
-                        transcript_response = self.openai_client.audio.transcriptions.create(
-                            model="whisper-1",
-                            file=audio_file,
-                            response_format="verbose_json",
-                            timestamp_granularities=["word"]
-                        )
+                        with metrics_service.track_openai_call("transcription", "whisper-1"):
+                            transcript_response = self.openai_client.audio.transcriptions.create(
+                                model="whisper-1",
+                                file=audio_file,
+                                response_format="verbose_json",
+                                timestamp_granularities=["word", "segment"]
+                            )
                     except Exception as e:
                         logger.warning(f"⚠️  Word-level timestamps not supported, falling back to basic transcription: {e}")
                         # Fallback to basic transcription without word timestamps
-                        transcript_response = self.openai_client.audio.transcriptions.create(
-                            model="whisper-1",
-                            file=audio_file,
-                            response_format="verbose_json"
-                        )
+                        with metrics_service.track_openai_call("transcription", "whisper-1"):
+                            transcript_response = self.openai_client.audio.transcriptions.create(
+                                model="whisper-1",
+                                file=audio_file,
+                                response_format="verbose_json"
+                            )
                 
                 result["transcript"] = transcript_response.text
                 result["duration"] = transcript_response.duration
+                result["words"] = [
+                    {"start": word.start, "end": word.end, "word": word.word}
+                    for word in (getattr(transcript_response, "words", None) or [])
+                ]
+                result["segments"] = [
+                    {"start": segment.start, "end": segment.end, "text": segment.text}
+                    for segment in (getattr(transcript_response, "segments", None) or [])
+                ]
                 
                 logger.info(f"✅ Whisper transcription completed. Duration: {result['duration']}s")
                 logger.debug(f"📝 Transcript length: {len(result['transcript'])} characters")
                 
-                # Skip speaker diarization for now (disabled due to Docker compatibility issues)
-                logger.info("⏭️  Speaker diarization disabled - using original transcript")
+                # Speaker labels are added later from the diarization worker's turns
                 result["transcript_with_speakers"] = result["transcript"]
                 
             finally:
@@ -137,56 +140,49 @@ class TranscriptionService:
         logger.info("🎯 Transcription process completed")
         return result
     
-    async def _add_speaker_diarization(self, audio_file_path: str, whisper_response) -> str:
+    def _transcribe_local(self, storage_path: str) -> Optional[Dict[str, Any]]:
+        """Transcribe on the local transcription workers; None if they could not do it"""
+        logger.info("🖥️  Starting local faster-whisper transcription...")
+        with tracing_service.span("transcription.local.wait", storage_path=storage_path):
+            local = local_transcription_service.request(storage_path)
+        if local is None:
+            return None
+        
+        tracing_service.set_attribute("transcription.backend", "local")
+        logger.info(f"✅ Local transcription completed. Duration: {local['duration']}s")
+        return {
+            "transcript": local["text"],
+            # Speaker labels are added later from the diarization worker's turns
+            "transcript_with_speakers": local["text"],
+            "words": local["words"],
+            "segments": local["segments"],
+            "duration": local["duration"],
+            "error": None
+        }
+    
+    def add_speaker_labels(self, transcript: str, words: List[Dict[str, Any]], turns: List[SpeakerTurn]) -> str:
         """
-        Add speaker diarization to the Whisper transcript
+        Build a speaker-labelled transcript from Whisper words and diarization turns
         
         Args:
-            audio_file_path: Path to the audio file
-            whisper_response: Response from OpenAI Whisper
+            transcript: Plain Whisper transcript
+            words: Whisper word timestamps as dicts with start, end and word
+            turns: Diarization turns as (start, end, speaker) tuples
             
         Returns:
             String with speaker-diarized transcript
         """
         try:
-            self._initialize_diarization()
-            
-            if not self.diarization_pipeline:
-                logger.info("⚠️  Speaker diarization not available (no HuggingFace token), returning original transcript")
-                return whisper_response.text
-            
-            logger.info("👥 Performing speaker diarization...")
-            
-                            # Run diarization with timeout and error handling
-            try:
-                logger.info(f"🎯 Processing audio file: {audio_file_path}")
-                diarization = self.diarization_pipeline(audio_file_path)
-                
-                # Clean up memory immediately after processing
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
-                gc.collect()
-                
-            except Exception as diarization_error:
-                logger.error(f"❌ Speaker diarization failed: {diarization_error}")
-                logger.info("📝 Falling back to original transcript without speaker labels")
-                # Clean up memory even on failure
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
-                gc.collect()
-                return whisper_response.text
-            
-            # Debug: log diarization results
-            speaker_count = len(set(speaker for _, _, speaker in diarization.itertracks(yield_label=True)))
+            speaker_count = len(set(speaker for _, _, speaker in turns))
             logger.info(f"🎯 Detected {speaker_count} unique speakers")
             
-            # Get word-level timestamps from Whisper
-            words = whisper_response.words if hasattr(whisper_response, 'words') else []
+            if not turns:
+                return transcript
             
             if not words:
                 logger.info("📝 No word-level timestamps available, using segment-based diarization")
                 # Fallback: Use segment-based diarization without word alignment
-                return self._create_segment_based_transcript(diarization, whisper_response.text)
+                return self._create_segment_based_transcript(turns, transcript)
             
             logger.info(f"📝 Processing {len(words)} words for speaker alignment")
             
@@ -195,14 +191,10 @@ class TranscriptionService:
             current_speaker = None
             current_segment = []
             
-            for word in words:
-                word_start = word.start
-                word_end = word.end
-                word_text = word.word
-                
-                # Find which speaker is talking at this time
-                speaker = self._get_speaker_at_time(diarization, word_start)
-                
+            # Find which speaker is talking over each word in one vectorized pass
+            word_speakers = align_words_to_speakers(words, turns)
+            
+            for word, speaker in zip(words, word_speakers):
                 if speaker != current_speaker:
                     # New speaker, finish previous segment
                     if current_segment:
@@ -212,7 +204,7 @@ class TranscriptionService:
                     
                     current_speaker = speaker
                 
-                current_segment.append(word_text.strip())
+                current_segment.append(word["word"].strip())
             
             # Add final segment
             if current_segment:
@@ -224,27 +216,25 @@ class TranscriptionService:
             # Check if we actually have multiple speakers
             if speaker_count <= 1:
                 logger.info("⚠️  Only one speaker detected, speaker diarization may not be meaningful")
-                result = f"[Speaker A]: {whisper_response.text}"
+                result = f"[Speaker A]: {transcript}"
             
-            logger.info("✅ Speaker diarization completed")
+            logger.info("✅ Speaker alignment completed")
             return result
             
         except Exception as e:
-            logger.error(f"❌ Speaker diarization failed: {e}")
-            logger.error(f"❌ Error details: {str(e)}")
-            return whisper_response.text
+            logger.error(f"❌ Speaker alignment failed: {e}")
+            return transcript
     
-    def _create_segment_based_transcript(self, diarization, original_text: str) -> str:
+    def _create_segment_based_transcript(self, turns: List[SpeakerTurn], original_text: str) -> str:
         """Create a segment-based transcript when word-level timestamps aren't available"""
         try:
             segments = []
-            for segment, _, speaker in diarization.itertracks(yield_label=True):
-                duration = segment.end - segment.start
+            for start, end, speaker in turns:
                 segments.append({
-                    'start': segment.start,
-                    'end': segment.end,
+                    'start': start,
+                    'end': end,
                     'speaker': speaker,
-                    'duration': duration
+                    'duration': end - start
                 })
             
             if not segments:
@@ -279,13 +269,6 @@ class TranscriptionService:
         except Exception as e:
             logger.error(f"❌ Segment-based transcript creation failed: {e}")
             return f"[Speaker A]: {original_text}"
-    
-    def _get_speaker_at_time(self, diarization, timestamp: float) -> str:
-        """Get the speaker who is talking at a specific timestamp"""
-        for segment, _, speaker in diarization.itertracks(yield_label=True):
-            if segment.start <= timestamp <= segment.end:
-                return speaker
-        return "Unknown"
 
 
 # Global transcription service instance
@@ -0,0 +1,271 @@
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterator, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class UploadSessionService:
+    """Service for resumable, offset-based chunked uploads staged on local disk"""
+    
+    def __init__(self):
+        self.staging_dir = settings.upload_staging_dir
+        self.session_ttl = timedelta(hours=settings.upload_session_ttl_hours)
+    
+    def create_session(
+        self,
+        filename: str,
+        total_size: int,
+        content_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a new upload session and its empty staging file
+        
+        Args:
+            filename: Original filename
+            total_size: Total number of bytes the client will send
+            content_type: MIME type of the file
+        
+        Returns:
+            Dict containing the session state
+        """
+        os.makedirs(self.staging_dir, exist_ok=True)
+        self.cleanup_expired_sessions()
+        
+        upload_id = uuid.uuid4().hex
+        session = {
+            "upload_id": upload_id,
+            "filename": filename,
+            "content_type": content_type,
+            "total_size": total_size,
+            "created_at": datetime.utcnow().isoformat(),
+            "recording_id": None,
+            "completing": False,
+            "error": None
+        }
+        
+        # Create the empty part file first so offset queries work immediately
+        open(self._part_path(upload_id), "wb").close()
+        self._write_session(session)
+        
+        logger.info(f"📦 Created upload session {upload_id} for {filename} ({total_size} bytes)")
+        return self._with_progress(session)
+    
+    def get_session(self, upload_id: str) -> Dict[str, Any]:
+        """
+        Get the current state of an upload session, including its offset
+        
+        Raises:
+            HTTPException: If the session does not exist
+        """
+        return self._with_progress(self._read_session(upload_id))
+    
+    async def append_chunk(
+        self,
+        upload_id: str,
+        offset: int,
+        chunks: AsyncIterator[bytes]
+    ) -> Dict[str, Any]:
+        """
+        Append a stream of bytes to an upload session at the given offset
+        
+        Args:
+            upload_id: Upload session ID
+            offset: Offset the client believes the upload is at
+            chunks: Async iterator over the request body
+        
+        Returns:
+            Dict containing the updated session state
+        
+        Raises:
+            HTTPException: If the session is unknown, the offset does not match
+                           or the chunk would exceed the declared size
+        """
+        session = self._read_session(upload_id)
+        if session["recording_id"] is not None or session.get("completing"):
+            # A retried final PATCH gets the current state back instead of storing the file twice
+            if offset == session["total_size"]:
+                return self._with_progress(session)
+            raise HTTPException(status_code=409, detail="Upload already completed")
+        
+        with self._locked_part(upload_id) as part_file:
+            current_offset = os.fstat(part_file.fileno()).st_size
+            if offset != current_offset:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Offset mismatch: expected {current_offset}, got {offset}"
+                )
+            
+            written = 0
+            async for chunk in chunks:
+                if current_offset + written + len(chunk) > session["total_size"]:
+                    # Drop the partial chunk so the client can retry from a known offset
+                    await asyncio.to_thread(part_file.truncate, current_offset)
+                    raise HTTPException(status_code=413, detail="Chunk exceeds declared upload size")
+                await asyncio.to_thread(part_file.write, chunk)
+                written += len(chunk)
+            await asyncio.to_thread(part_file.flush)
+        
+        logger.debug(f"📥 Upload {upload_id}: wrote {written} bytes at offset {offset}")
+        return self._with_progress(session)
+    
+    def begin_completion(self, upload_id: str) -> bool:
+        """
+        Claim the completion of a fully received upload
+        
+        Returns:
+            True for exactly one caller; False when the upload is already being
+            completed or has been completed
+        """
+        if self._read_session(upload_id)["recording_id"] is not None:
+            # Checked before locking, which would recreate the removed part file
+            return False
+        
+        with self._locked_part(upload_id):
+            session = self._read_session(upload_id)
+            if session["recording_id"] is not None or session.get("completing"):
+                return False
+            session["completing"] = True
+            session["error"] = None
+            self._write_session(session)
+            return True
+    
+    def fail_completion(self, upload_id: str, error: str) -> None:
+        """Release a failed completion so the final PATCH can be retried"""
+        session = self._read_session(upload_id)
+        session["completing"] = False
+        session["error"] = error
+        self._write_session(session)
+    
+    def get_assembled_path(self, upload_id: str) -> str:
+        """Get the path of the assembled staging file"""
+        return self._part_path(upload_id)
+    
+    def mark_completed(self, upload_id: str, recording_id: int) -> Dict[str, Any]:
+        """Record the recording created from an upload and drop its staged bytes"""
+        session = self._read_session(upload_id)
+        session["recording_id"] = recording_id
+        session["completing"] = False
+        self._write_session(session)
+        
+        try:
+            os.unlink(self._part_path(upload_id))
+        except FileNotFoundError:
+            pass
+        
+        logger.info(f"✅ Upload session {upload_id} completed as recording {recording_id}")
+        return self._with_progress(session)
+    
+    def delete_session(self, upload_id: str) -> bool:
+        """Abort an upload session and remove its staged files"""
+        removed = False
+        for path in (self._part_path(upload_id), self._session_path(upload_id)):
+            try:
+                os.unlink(path)
+                removed = True
+            except FileNotFoundError:
+                pass
+        return removed
+    
+    def cleanup_expired_sessions(self) -> int:
+        """Remove sessions older than the configured TTL"""
+        if not os.path.isdir(self.staging_dir):
+            return 0
+        
+        cutoff = datetime.utcnow() - self.session_ttl
+        removed = 0
+        for entry in os.listdir(self.staging_dir):
+            if not entry.endswith(".json"):
+                continue
+            upload_id = entry[:-len(".json")]
+            try:
+                session = self._read_session(upload_id)
+                if datetime.fromisoformat(session["created_at"]) < cutoff:
+                    self.delete_session(upload_id)
+                    removed += 1
+            except HTTPException:
+                continue
+        
+        if removed:
+            logger.info(f"🧹 Removed {removed} expired upload sessions")
+        return removed
+    
+    def _with_progress(self, session: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach the current offset and progress to a session dict"""
+        if session["recording_id"] is not None:
+            offset = session["total_size"]
+        else:
+            try:
+                offset = os.path.getsize(self._part_path(session["upload_id"]))
+            except FileNotFoundError:
+                offset = 0
+        
+        total_size = session["total_size"]
+        return {
+            **session,
+            "offset": offset,
+            "progress": (offset / total_size) if total_size else 1.0,
+            "completed": session["recording_id"] is not None,
+            "completing": bool(session.get("completing")),
+            "error": session.get("error")
+        }
+    
+    @contextmanager
+    def _locked_part(self, upload_id: str) -> Iterator[BinaryIO]:
+        """
+        Open the part file for appending under an exclusive, non-blocking lock
+        
+        flock conflicts between separate descriptors even within one process,
+        so a blocking lock would stall the event loop behind a concurrent
+        request for the same upload; the second request gets a 409 instead.
+        """
+        with open(self._part_path(upload_id), "ab") as part_file:
+            try:
+                fcntl.flock(part_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise HTTPException(status_code=409, detail="Upload is busy with another request")
+            try:
+                yield part_file
+            finally:
+                fcntl.flock(part_file.fileno(), fcntl.LOCK_UN)
+    
+    def _read_session(self, upload_id: str) -> Dict[str, Any]:
+        try:
+            with open(self._session_path(upload_id), "r") as session_file:
+                return json.load(session_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            raise HTTPException(status_code=404, detail="Upload session not found")
+    
+    def _write_session(self, session: Dict[str, Any]) -> None:
+        # Write atomically so concurrent readers never see a truncated file
+        path = self._session_path(session["upload_id"])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as session_file:
+            json.dump(session, session_file)
+        os.replace(tmp_path, path)
+    
+    def _session_path(self, upload_id: str) -> str:
+        return os.path.join(self.staging_dir, f"{self._safe_id(upload_id)}.json")
+    
+    def _part_path(self, upload_id: str) -> str:
+        return os.path.join(self.staging_dir, f"{self._safe_id(upload_id)}.part")
+    
+    def _safe_id(self, upload_id: str) -> str:
+        # Upload IDs are uuid4 hex strings; reject anything that could escape the staging dir
+        if not upload_id.isalnum():
+            raise HTTPException(status_code=404, detail="Upload session not found")
+        return upload_id
+
+
+# Global upload session service instance
+upload_session_service = UploadSessionService()
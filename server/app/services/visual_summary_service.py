@@ -1,46 +1,103 @@
 import logging
-import httpx
-from typing import Dict, Any, Optional
-from openai import OpenAI
+import os
+from typing import TYPE_CHECKING, Dict, Any, Optional
 
 from app.core.config import settings
-from app.services.storage_service import storage_service
+from app.services.flowchart_renderer import build_flowchart, render_image, render_svg
+from app.services.media_derivatives import store_image_derivatives, store_remote_image, upload_bytes
+from app.services.openai_client import get_openai_client
+from app.services.metrics_service import metrics_service
+from app.services.tracing_service import tracing_service
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
 
 class VisualSummaryService:
-    """Service for generating visual summaries using DALL·E 3"""
+    """
+    Service for generating visual summaries of meetings
+    
+    The decision flowchart is rendered locally from the analysis, as SVG plus
+    a PNG or WebP raster and a thumbnail, in milliseconds and without network
+    calls besides the uploads. A DALL·E 3 illustration can be added afterwards
+    by a background job when visual_summary_illustration_enabled is set.
+    """
     
     def __init__(self):
         logger.info("🎨 Initializing VisualSummaryService")
         
-        if settings.openai_api_key:
-            self.openai_client = OpenAI(api_key=settings.openai_api_key)
-            logger.info("✅ OpenAI client initialized for DALL·E 3")
-        else:
-            self.openai_client = None
-            logger.warning("⚠️  OpenAI API key not configured - visual summaries will not be available")
+        if settings.visual_summary_illustration_enabled and not settings.openai_api_key:
+            logger.warning("⚠️  OpenAI API key not configured - visual summary illustrations will not be available")
+    
+    @property
+    def openai_client(self) -> Optional["OpenAI"]:
+        """Shared OpenAI client, created on first use"""
+        return get_openai_client()
     
-    async def generate_visual_summary(self, recording_id: int, summary: str, action_items: list, decisions: list, filename: str) -> Optional[str]:
+    async def generate_visual_summary(self, recording_id: int, summary: str, action_items: list, decisions: list, filename: str) -> Optional[Dict[str, str]]:
         """
-        Generate a visual summary using DALL·E 3 based on meeting content
+        Render the decision flowchart of a meeting and upload it
         
         Args:
             recording_id: ID of the recording
             summary: Meeting summary text
             action_items: List of action items
             decisions: List of decisions
-            filename: Original filename for context
+            filename: Original filename, used as the chart title
             
         Returns:
-            URL of the uploaded visual summary image, or None if failed
+            Public URL per stored variant, e.g. {"svg": ..., "png": ..., "webp": ..., "thumbnail": ...},
+            or None if failed
+        """
+        logger.info(f"🎨 Rendering visual summary for recording {recording_id}")
+        
+        try:
+            raster_format = settings.visual_summary_raster_format
+            with tracing_service.span("visual.render", format=raster_format):
+                decision_flow = self._analyze_decision_flow(decisions, action_items, summary)
+                chart = build_flowchart(
+                    os.path.splitext(filename)[0],
+                    decisions,
+                    action_items,
+                    decision_flow,
+                    max_items=settings.visual_summary_max_items
+                )
+                svg = render_svg(chart).encode("utf-8")
+                image = render_image(chart)
+            
+            assets = {"svg": await upload_bytes(svg, f"visual_summary_{recording_id}.svg", "image/svg+xml")}
+            if image is not None:
+                assets.update(await store_image_derivatives(image, f"visual_summary_{recording_id}", (raster_format, "webp")))
+            
+            logger.info(f"✅ Visual summary uploaded to storage: {', '.join(assets)}")
+            return assets
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to generate visual summary: {e}")
+            return None
+    
+    def primary_url(self, assets: Dict[str, str]) -> Optional[str]:
+        """URL shown as the recording's visual summary: the raster if there is one, else the SVG"""
+        return assets.get(settings.visual_summary_raster_format) or assets.get("svg")
+    
+    async def generate_illustration(self, recording_id: int, summary: str, action_items: list, decisions: list, filename: str) -> Optional[Dict[str, str]]:
+        """
+        Generate a decorative decision-tree illustration using DALL·E 3
+        
+        The generated image is streamed from OpenAI straight into storage,
+        with WebP and thumbnail variants derived on the way.
+        
+        Returns:
+            Visual assets to add, e.g. {"illustration": ..., "illustration_webp": ...,
+            "illustration_thumbnail": ...}, or None if failed
         """
         if not self.openai_client:
-            logger.error("❌ OpenAI client not available for visual summary")
+            logger.error("❌ OpenAI client not available for visual summary illustration")
             return None
         
-        logger.info(f"🎨 Generating visual summary for recording {recording_id}")
+        logger.info(f"🎨 Generating visual summary illustration for recording {recording_id}")
         
         try:
             # Create a prompt for DALL·E 3 based on meeting content
@@ -48,36 +105,27 @@ class VisualSummaryService:
             logger.info(f"📝 Generated DALL·E prompt: {prompt[:200]}...")
             
             # Generate image using DALL·E 3
-            response = self.openai_client.images.generate(
-                model="dall-e-3",
-                prompt=prompt,
-                size="1024x1024",
-                quality="standard",
-                n=1
-            )
+            with metrics_service.track_openai_call("image_generation", "dall-e-3"):
+                response = self.openai_client.images.generate(
+                    model="dall-e-3",
+                    prompt=prompt,
+                    size="1024x1024",
+                    quality="standard",
+                    n=1
+                )
             
             image_url = response.data[0].url
             logger.info(f"✅ DALL·E 3 image generated: {image_url}")
             
-            # Download the image
-            image_content = self._download_image(image_url)
-            if not image_content:
-                logger.error("❌ Failed to download generated image")
-                return None
-            
-            # Upload to Supabase storage
-            visual_filename = f"visual_summary_{recording_id}.png"
-            file_details = storage_service.upload_file(
-                file_content=image_content,
-                filename=visual_filename,
-                content_type="image/png"
-            )
-            
-            logger.info(f"✅ Visual summary uploaded to storage: {file_details['public_url']}")
-            return file_details['public_url']
+            variants = await store_remote_image(image_url, f"visual_illustration_{recording_id}")
+            logger.info(f"✅ Visual summary illustration uploaded to storage: {variants['original']}")
+            return {
+                "illustration" if name == "original" else f"illustration_{name}": url
+                for name, url in variants.items()
+            }
             
         except Exception as e:
-            logger.error(f"❌ Failed to generate visual summary: {e}")
+            logger.error(f"❌ Failed to generate visual summary illustration: {e}")
             return None
     
     def _create_visual_prompt(self, summary: str, action_items: list, decisions: list, filename: str) -> str:
@@ -187,17 +235,6 @@ class VisualSummaryService:
                 flow_analysis['decision_types'].append('general')
         
         return flow_analysis
-    
-    def _download_image(self, image_url: str) -> Optional[bytes]:
-        """Download image from URL"""
-        try:
-            with httpx.Client(timeout=30) as client:
-                response = client.get(image_url)
-                response.raise_for_status()
-                return response.content
-        except Exception as e:
-            logger.error(f"❌ Failed to download image: {e}")
-            return None
 
 
 # Global visual summary service instance
@@ -0,0 +1,38 @@
+import logging
+import os
+import tempfile
+from typing import Dict, List, Optional
+
+from app.services.diarization_service import diarization_service, SpeakerTurn
+from app.services.storage_service import storage_service
+from app.services.tracing_service import tracing_service
+
+logger = logging.getLogger(__name__)
+
+
+def process_diarization_task(
+    recording_id: int,
+    storage_path: str,
+    trace_context: Optional[Dict[str, str]] = None
+) -> List[SpeakerTurn]:
+    """
+    Background task that runs speaker diarization for a recording
+    This runs on the dedicated diarization workers, which keep the model warm
+    
+    Returns:
+        List of (start, end, speaker) turns, picked up by the transcription task
+    """
+    logger.info(f"👥 Starting diarization for recording ID: {recording_id}")
+    
+    with tracing_service.continue_trace(trace_context, "diarization", recording_id=recording_id):
+        # Co-located workers read the media straight from the shared volume
+        local_path = storage_service.get_local_path(storage_path)
+        if local_path:
+            return diarization_service.diarize(local_path)
+        
+        suffix = os.path.splitext(storage_path)[1] or ".mp4"
+        with tempfile.NamedTemporaryFile(suffix=suffix) as temp_file:
+            with tracing_service.span("storage.download", storage_path=storage_path):
+                temp_file.write(storage_service.download_file(storage_path))
+            temp_file.flush()
+            return diarization_service.diarize(temp_file.name)
\ No newline at end of file
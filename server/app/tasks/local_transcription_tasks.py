@@ -0,0 +1,82 @@
+import logging
+import os
+import tempfile
+from typing import List
+
+from app.services.local_transcription_service import local_transcription_service
+from app.services.storage_service import storage_service
+from app.services.tracing_service import tracing_service
+
+logger = logging.getLogger(__name__)
+
+
+def process_local_transcription_batch() -> int:
+    """
+    Background task that transcribes every pending local transcription request
+    This runs on the dedicated local transcription workers, which keep the model warm
+    
+    Each request enqueues one of these tasks; the first to run claims up to
+    local_transcription_batch_size requests and later ones find less (or
+    nothing) left, so recordings that arrive together are decoded together.
+    
+    Returns:
+        Number of requests handled
+    """
+    requests = local_transcription_service.claim_pending(local_transcription_service.batch_size)
+    if not requests:
+        return 0
+    
+    logger.info(f"🎤 Local transcription batch of {len(requests)} recording(s)")
+    
+    with tracing_service.continue_trace(None, "local_transcription_batch", batch_size=len(requests)):
+        temp_paths: List[str] = []
+        audio_paths: List[str] = []
+        failures = {}
+        answered = set()
+        try:
+            for request in requests:
+                storage_path = request["storage_path"]
+                # Co-located workers read the media straight from the shared volume
+                local_path = storage_service.get_local_path(storage_path)
+                if local_path:
+                    audio_paths.append(local_path)
+                    continue
+                
+                suffix = os.path.splitext(storage_path)[1] or ".mp4"
+                try:
+                    with tracing_service.span("storage.download", storage_path=storage_path):
+                        content = storage_service.download_file(storage_path)
+                except Exception as e:
+                    failures[request["request_id"]] = str(e)
+                    audio_paths.append("")
+                    continue
+                with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_file:
+                    temp_file.write(content)
+                temp_paths.append(temp_file.name)
+                audio_paths.append(temp_file.name)
+            
+            runnable = [path for path in audio_paths if path]
+            with tracing_service.span("transcription.local", batch_size=len(runnable)):
+                transcribed = iter(local_transcription_service.transcribe_many(runnable) if runnable else [])
+            
+            for request, path in zip(requests, audio_paths):
+                if path:
+                    result = next(transcribed)
+                else:
+                    result = {"error": f"Download failed: {failures[request['request_id']]}"}
+                local_transcription_service.publish_result(request["request_id"], result)
+                answered.add(request["request_id"])
+        except Exception as e:
+            # The requests are already off the pending list; answer them now so the
+            # waiting processing jobs fall back to the API instead of timing out
+            logger.error(f"❌ Local transcription batch failed: {e}")
+            for request in requests:
+                if request["request_id"] not in answered:
+                    local_transcription_service.publish_result(request["request_id"], {"error": f"Batch failed: {e}"})
+            raise
+        finally:
+            for path in temp_paths:
+                os.unlink(path)
+    
+    logger.info(f"✅ Local transcription batch of {len(requests)} recording(s) completed")
+    return len(requests)
@@ -1,23 +1,134 @@
 import asyncio
+import contextvars
 import logging
-from typing import Any, Dict
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
 
+from rq import get_current_job
+
+from app.core.config import settings
 from app.services.recording_service import recording_service
+from app.services.storage_service import storage_service
+from app.services.task_service import task_service
+from app.services.diarization_service import diarization_service
+from app.services.media_probe_service import media_probe_service
+from app.tasks.diarization_tasks import process_diarization_task
 from app.services.transcription_service import transcription_service
+from app.services.transcript_index_service import transcript_index_service
 from app.services.analysis_service import analysis_service
 from app.services.visual_summary_service import visual_summary_service
+from app.services.metrics_service import metrics_service
+from app.services.tracing_service import tracing_service
 
 logger = logging.getLogger(__name__)
 
 
-def process_transcription_task(recording_id: int, media_url: str, file_content: bytes, **kwargs):
+def process_transcription_task(
+    recording_id: int,
+    media_url: str,
+    file_content: Optional[bytes] = None,
+    storage_path: Optional[str] = None,
+    trace_context: Optional[Dict[str, str]] = None,
+    **kwargs
+):
     """
     Background task to process transcription and analysis for uploaded media files
     This runs in a separate worker process
+    
+    Media uploaded directly to storage is passed by storage_path instead of
+    file_content and fetched here, so the bytes never go through the API.
+    
+    trace_context links the spans recorded here to the upload that queued the
+    job; the time spent per span is stored on the recording when done.
+    """
+    with tracing_service.continue_trace(trace_context, "process_recording", recording_id=recording_id) as spans:
+        job = get_current_job()
+        if job is not None and job.enqueued_at:
+            tracing_service.record_span("queue.wait", job.enqueued_at, job.started_at)
+        
+        _process_recording(recording_id, media_url, file_content, storage_path)
+    
+    try:
+        recording_service.update_recording(
+            recording_id=recording_id,
+            processing_timings=tracing_service.summarize(spans),
+            llm_usage=metrics_service.summarize_openai_usage(spans)
+        )
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to store processing timings for recording {recording_id}: {e}")
+
+
+def _stage_media(storage_path: Optional[str], file_content: bytes) -> Tuple[str, bool]:
     """
+    Get a path ffmpeg can read the media from
+    
+    Returns:
+        (path, is_temp): is_temp is set when the path is a temp copy to remove
+    """
+    # Co-located workers read the media straight from the shared volume
+    path = storage_service.get_local_path(storage_path) if storage_path else None
+    if path:
+        return path, False
+    suffix = os.path.splitext(storage_path or "")[1] or ".mp4"
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_file:
+        temp_file.write(file_content)
+    return temp_file.name, True
+
+
+def _probe_media(recording_id: int, media_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read codec and duration with ffprobe, which only parses the container headers
+    
+    Returns:
+        The probe, or None when it failed
+    """
+    try:
+        with metrics_service.track_stage("ingest"):
+            probe = media_probe_service.probe(media_path)
+        if probe["duration"]:
+            recording_service.update_recording(recording_id=recording_id, duration=probe["duration"])
+        return probe
+    except Exception as e:
+        logger.warning(f"⚠️  Media probe failed for recording {recording_id}: {e}")
+        return None
+
+
+def _store_waveform(recording_id: int, media_path: str, probe: Dict[str, Any]) -> None:
+    """Decode the media into waveform peaks and store them with the probe"""
+    try:
+        with metrics_service.track_stage("waveform"):
+            peaks, decoded_seconds = media_probe_service.compute_peaks(media_path)
+        if not probe["duration"]:
+            # Containers without a duration header (e.g. some WebM) get the decoded length
+            probe = {**probe, "duration": decoded_seconds}
+            recording_service.update_recording(recording_id=recording_id, duration=decoded_seconds)
+        media_probe_service.save(recording_id, {**probe, "peaks": peaks})
+        logger.info(f"🎚️  Stored {len(peaks)} waveform peaks for recording {recording_id}")
+    except Exception as e:
+        logger.warning(f"⚠️  Waveform generation failed for recording {recording_id}: {e}")
+
+
+def _process_recording(
+    recording_id: int,
+    media_url: str,
+    file_content: Optional[bytes],
+    storage_path: Optional[str]
+):
+    """Transcribe, analyse and visualise one recording, recording failures on the row"""
     logger.info(f"🎯 Starting background transcription for recording ID: {recording_id}")
     
+    media_path = None
+    media_is_temp = False
+    waveform_thread = None
     try:
+        if file_content is None:
+            if not storage_path:
+                raise ValueError("Either file_content or storage_path is required")
+            with tracing_service.span("storage.download", storage_path=storage_path):
+                file_content = storage_service.download_file(storage_path)
+        
         # Update status to processing
         recording_service.update_transcription(
             recording_id=recording_id,
@@ -25,18 +136,68 @@ def process_transcription_task(recording_id: int, media_url: str, file_content:
             status="processing"
         )
         
+        # Start speaker diarization on the dedicated workers so it runs
+        # concurrently with Whisper instead of after it
+        diarization_job = None
+        if storage_path and diarization_service.is_available:
+            diarization_job = task_service.enqueue_diarization(
+                process_diarization_task,
+                recording_id,
+                storage_path,
+                trace_context=tracing_service.current_context()
+            )
+        
+        # Probe codec and duration up front so the duration can steer transcription
+        # and model routing; the full decode for the waveform peaks runs alongside
+        # transcription, in a copy of this context so its spans join the trace
+        media_duration = None
+        if settings.media_ingest_enabled and media_probe_service.is_available:
+            media_path, media_is_temp = _stage_media(storage_path, file_content)
+            probe = _probe_media(recording_id, media_path)
+            if probe is not None:
+                media_duration = probe["duration"]
+                waveform_thread = threading.Thread(
+                    target=contextvars.copy_context().run,
+                    args=(_store_waveform, recording_id, media_path, probe),
+                    name=f"waveform-{recording_id}",
+                    daemon=True
+                )
+                waveform_thread.start()
+        
         # Run the async transcription in a new event loop
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         
         try:
             # Perform transcription
-            transcription_result = loop.run_until_complete(
-                transcription_service.transcribe_media(
-                    media_url=media_url,
-                    file_content=file_content
+            with metrics_service.track_stage("transcribe") as stage:
+                transcription_result = loop.run_until_complete(
+                    transcription_service.transcribe_media(
+                        media_url=media_url,
+                        file_content=file_content,
+                        storage_path=storage_path,
+                        duration=media_duration
+                    )
                 )
-            )
+                if transcription_result["error"]:
+                    stage.outcome = "error"
+            
+            speaker_turns = None
+            if diarization_job and not transcription_result["error"]:
+                logger.info(f"👥 Waiting for diarization of recording {recording_id}")
+                with tracing_service.span("diarization.wait"):
+                    speaker_turns = task_service.wait_for_job(
+                        diarization_job,
+                        timeout=settings.diarization_timeout_seconds
+                    )
+                if speaker_turns:
+                    transcription_result["transcript_with_speakers"] = transcription_service.add_speaker_labels(
+                        transcription_result["transcript"],
+                        transcription_result["words"],
+                        speaker_turns
+                    )
+                else:
+                    logger.warning(f"⚠️  Diarization unavailable for recording {recording_id}, using plain transcript")
             
             if transcription_result["error"]:
                 # Update with error
@@ -53,20 +214,38 @@ def process_transcription_task(recording_id: int, media_url: str, file_content:
                     recording_id=recording_id,
                     transcript=transcription_result["transcript"],
                     transcript_with_speakers=transcription_result["transcript_with_speakers"],
-                    duration=transcription_result["duration"],
+                    duration=transcription_result["duration"] or media_duration,
                     status="analyzing"  # Set to analyzing status
                 )
                 logger.info(f"✅ Transcription completed for recording {recording_id}")
                 
+                # Keep Whisper's timestamps so search hits and excerpts can seek playback
+                try:
+                    transcript_index_service.save_index(
+                        recording_id,
+                        transcript_index_service.build_index(
+                            transcription_result["transcript"],
+                            transcription_result["words"],
+                            transcription_result["segments"],
+                            speaker_turns
+                        )
+                    )
+                except Exception as index_error:
+                    logger.warning(f"⚠️  Failed to index transcript for recording {recording_id}: {index_error}")
+                
                 # Now perform analysis
                 logger.info(f"🧠 Starting analysis for recording {recording_id}")
                 
-                analysis_result = loop.run_until_complete(
-                    analysis_service.analyze_transcript(
-                        transcript=transcription_result["transcript"],
-                        transcript_with_speakers=transcription_result["transcript_with_speakers"]
+                with metrics_service.track_stage("analyze") as stage:
+                    analysis_result = loop.run_until_complete(
+                        analysis_service.analyze_transcript(
+                            transcript=transcription_result["transcript"],
+                            transcript_with_speakers=transcription_result["transcript_with_speakers"],
+                            duration=transcription_result["duration"] or media_duration
+                        )
                     )
-                )
+                    if analysis_result["error"]:
+                        stage.outcome = "error"
                 
                 if analysis_result["error"]:
                     # Update with analysis error but keep transcription
@@ -90,28 +269,32 @@ def process_transcription_task(recording_id: int, media_url: str, file_content:
                     )
                     logger.info(f"✅ Analysis completed for recording {recording_id}")
                     
-                    # Generate visual summary using DALL·E 3
+                    # Render the decision flowchart locally
                     logger.info(f"🎨 Starting visual summary generation for recording {recording_id}")
                     try:
                         # Get recording object to access filename
                         current_recording = recording_service.get_recording(recording_id)
                         filename = current_recording.original_filename if current_recording else f"recording_{recording_id}"
                         
-                        visual_summary_url = loop.run_until_complete(
-                            visual_summary_service.generate_visual_summary(
-                                recording_id=recording_id,
-                                summary=analysis_result["summary"],
-                                action_items=analysis_result["action_items"],
-                                decisions=analysis_result["decisions"],
-                                filename=filename
+                        with metrics_service.track_stage("visualize") as stage:
+                            visual_assets = loop.run_until_complete(
+                                visual_summary_service.generate_visual_summary(
+                                    recording_id=recording_id,
+                                    summary=analysis_result["summary"],
+                                    action_items=analysis_result["action_items"],
+                                    decisions=analysis_result["decisions"],
+                                    filename=filename
+                                )
                             )
-                        )
+                            if not visual_assets:
+                                stage.outcome = "error"
                         
-                        if visual_summary_url:
-                            # Update recording with visual summary URL and mark as completed
+                        if visual_assets:
+                            # Update recording with visual summary URLs and mark as completed
                             recording_service.update_recording(
                                 recording_id=recording_id,
-                                visual_summary_url=visual_summary_url
+                                visual_summary_url=visual_summary_service.primary_url(visual_assets),
+                                visual_assets=visual_assets
                             )
                             # Update status to completed
                             recording_service.update_analysis(
@@ -119,6 +302,14 @@ def process_transcription_task(recording_id: int, media_url: str, file_content:
                                 status="completed"
                             )
                             logger.info(f"✅ Visual summary generated and saved for recording {recording_id}")
+                            
+                            # The DALL·E illustration is an optional extra that nobody waits for
+                            if settings.visual_summary_illustration_enabled:
+                                task_service.enqueue_task(
+                                    "app.tasks.visual_summary_tasks.process_visual_illustration_task",
+                                    recording_id,
+                                    trace_context=tracing_service.current_context()
+                                )
                         else:
                             # Failed to generate visual summary, but mark as completed since analysis succeeded
                             recording_service.update_analysis(
@@ -141,6 +332,8 @@ def process_transcription_task(recording_id: int, media_url: str, file_content:
                 logger.info(f"✅ Processing completed for recording {recording_id} (transcription + analysis + visual)")
                 
         finally:
+            # Pooled storage connections belong to this loop; the next job gets a new one
+            loop.run_until_complete(storage_service.aclose())
             loop.close()
             
     except Exception as e:
@@ -150,4 +343,9 @@ def process_transcription_task(recording_id: int, media_url: str, file_content:
             transcript="",
             status="failed",
             error=str(e)
-        ) 
\ No newline at end of file
+        )
+    finally:
+        if waveform_thread is not None:
+            waveform_thread.join()
+        if media_is_temp:
+            os.unlink(media_path) 
\ No newline at end of file
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import os
+from typing import Dict, Optional
+
+from app.services.recording_service import recording_service
+from app.services.storage_service import storage_service
+from app.services.visual_summary_service import visual_summary_service
+from app.services.tracing_service import tracing_service
+
+logger = logging.getLogger(__name__)
+
+
+def process_visual_illustration_task(
+    recording_id: int,
+    trace_context: Optional[Dict[str, str]] = None
+) -> Optional[str]:
+    """
+    Background task that adds a DALL·E 3 illustration to an analysed recording
+    
+    Queued after the flowchart has been stored, so the recording is already
+    completed and a slow or failed image request changes nothing but the
+    "illustration" entries of its visual assets.
+    
+    Returns:
+        URL of the illustration, or None if it could not be generated
+    """
+    with tracing_service.continue_trace(trace_context, "visual_illustration", recording_id=recording_id):
+        recording = recording_service.get_recording(recording_id)
+        if not recording:
+            logger.warning(f"⚠️  Recording {recording_id} not found for visual summary illustration")
+            return None
+        
+        illustration_assets = asyncio.run(_generate_illustration(recording))
+        if not illustration_assets:
+            return None
+        
+        visual_assets = dict(recording.visual_assets or {})
+        visual_assets.update(illustration_assets)
+        recording_service.update_recording(recording_id=recording_id, visual_assets=visual_assets)
+        logger.info(f"✅ Visual summary illustration saved for recording {recording_id}")
+        return illustration_assets["illustration"]
+
+
+async def _generate_illustration(recording) -> Optional[Dict[str, str]]:
+    try:
+        return await visual_summary_service.generate_illustration(
+            recording_id=recording.id,
+            summary=recording.summary or "",
+            action_items=recording.action_items or [],
+            decisions=recording.decisions or [],
+            filename=os.path.basename(recording.original_filename)
+        )
+    finally:
+        # Pooled storage connections belong to this event loop
+        await storage_service.aclose()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the OpenAI and Supabase Storage APIs
+
+Serves just enough of both APIs for the upload -> transcribe -> analyze ->
+visualize pipeline to run end to end without network access or API fees.
+Each service answers after a configurable latency and can be made to fail
+with 500s or 429s at a given rate.
+
+Usage: python benchmarks/fake_services.py [--port 9100] [--profile realistic]
+
+Point the API and workers at it with:
+    OPENAI_BASE_URL=http://localhost:9100/v1
+    SUPABASE_URL=http://localhost:9100
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import struct
+import time
+import uuid
+import zlib
+from collections import Counter
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+SERVICES = ("whisper", "chat", "images", "storage")
+
+# Labeling prompts list their rules as "**Label name**: description"
+LABEL_RULE = re.compile(r"^\*\*(.+?)\*\*:", re.MULTILINE)
+# Streamed completions are sent a few characters at a time, like real tokens
+STREAM_CHUNK_CHARS = 8
+STREAM_CHUNK_DELAY = 0.005
+
+
+@dataclass
+class ServiceProfile:
+    """How one fake service behaves"""
+    latency: float = 0.0  # Mean response time in seconds
+    jitter: float = 0.0  # Standard deviation of the response time
+    error_rate: float = 0.0  # Fraction of requests answered with a 500
+    rate_limit_rate: float = 0.0  # Fraction of requests answered with a 429
+
+
+# Whisper latency scales with the audio; these are per request for the small files the driver uploads
+PROFILES: Dict[str, Dict[str, ServiceProfile]] = {
+    "fast": {service: ServiceProfile() for service in SERVICES},
+    "realistic": {
+        "whisper": ServiceProfile(latency=6.0, jitter=2.0),
+        "chat": ServiceProfile(latency=4.0, jitter=1.5),
+        "images": ServiceProfile(latency=10.0, jitter=3.0),
+        "storage": ServiceProfile(latency=0.08, jitter=0.03),
+    },
+    "flaky": {
+        "whisper": ServiceProfile(latency=6.0, jitter=2.0, error_rate=0.03, rate_limit_rate=0.1),
+        "chat": ServiceProfile(latency=4.0, jitter=1.5, error_rate=0.03, rate_limit_rate=0.1),
+        "images": ServiceProfile(latency=10.0, jitter=3.0, error_rate=0.05, rate_limit_rate=0.15),
+        "storage": ServiceProfile(latency=0.08, jitter=0.03, error_rate=0.01),
+    },
+}
+
+VOCABULARY = (
+    "we", "should", "ship", "the", "release", "next", "week", "after", "review", "budget",
+    "team", "agreed", "to", "move", "launch", "date", "customer", "feedback", "on", "design",
+    "action", "item", "follow", "up", "with", "marketing", "decision", "is", "final", "today",
+)
+
+
+def _tiny_png() -> bytes:
+    """A valid 1x1 PNG, returned as the generated image"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(b"\x00\x80\x80\x80")) + chunk(b"IEND", b"")
+
+
+async def _stream_completion(model: str, content: str, usage: Optional[Dict[str, int]]) -> AsyncIterator[str]:
+    """Chat completion chunks in the OpenAI streaming format"""
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    
+    def chunk(choices: list, **extra: Any) -> str:
+        payload = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model, "choices": choices, **extra}
+        return f"data: {json.dumps(payload)}\n\n"
+    
+    yield chunk([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+    for start in range(0, len(content), STREAM_CHUNK_CHARS):
+        await asyncio.sleep(STREAM_CHUNK_DELAY)
+        yield chunk([{"index": 0, "delta": {"content": content[start:start + STREAM_CHUNK_CHARS]}, "finish_reason": None}])
+    yield chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+    if usage:
+        yield chunk([], usage=usage)
+    yield "data: [DONE]\n\n"
+
+
+class FakeServices:
+    """State shared by the fake endpoints: stored objects, profiles and request counters"""
+    
+    def __init__(self, profiles: Dict[str, ServiceProfile], seed: Optional[int] = None):
+        self.profiles = profiles
+        self.random = random.Random(seed)
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self.counts: Counter = Counter()
+        self.image = _tiny_png()
+    
+    async def simulate(self, service: str) -> Optional[Response]:
+        """Wait out the service's latency, then maybe fail; returns the failure response if any"""
+        profile = self.profiles[service]
+        delay = max(self.random.gauss(profile.latency, profile.jitter), 0.0) if profile.latency else 0.0
+        if delay:
+            await asyncio.sleep(delay)
+        
+        roll = self.random.random()
+        if roll < profile.rate_limit_rate:
+            self.counts[(service, 429)] += 1
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after": "1"}
+            )
+        if roll < profile.rate_limit_rate + profile.error_rate:
+            self.counts[(service, 500)] += 1
+            return JSONResponse(
+                {"error": {"message": "Injected server error", "type": "server_error"}, "statusCode": "500"},
+                status_code=500
+            )
+        self.counts[(service, 200)] += 1
+        return None
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        result: Dict[str, Dict[str, int]] = {service: {} for service in SERVICES}
+        for (service, status), count in self.counts.items():
+            result[service][str(status)] = count
+        return result
+
+
+def create_app(fakes: FakeServices) -> FastAPI:
+    """Build the fake OpenAI + Supabase Storage application"""
+    app = FastAPI(title="Kirki load-test stand-ins")
+    
+    @app.get("/stats")
+    async def stats() -> Dict[str, Any]:
+        """Requests answered per service and status code"""
+        return {"services": fakes.stats(), "objects": len(fakes.objects)}
+    
+    # --- OpenAI ---
+    
+    @app.post("/v1/audio/transcriptions")
+    async def transcriptions(request: Request) -> Response:
+        form = await request.form()
+        upload = form.get("file")
+        size = len(await upload.read()) if upload is not None else 0
+        failure = await fakes.simulate("whisper")
+        if failure:
+            return failure
+        
+        # About one word every 0.4s of "audio", treating the upload as 16 kB/s
+        duration = max(size / 16000, 5.0)
+        word_count = int(duration / 0.4)
+        words, segments = [], []
+        for i in range(word_count):
+            start = round(i * 0.4, 2)
+            words.append({"word": VOCABULARY[i % len(VOCABULARY)], "start": start, "end": round(start + 0.35, 2)})
+        for first in range(0, word_count, 12):
+            chunk = words[first:first + 12]
+            segments.append({
+                "id": len(segments), "seek": 0, "start": chunk[0]["start"], "end": chunk[-1]["end"],
+                "text": " " + " ".join(word["word"] for word in chunk), "tokens": [], "temperature": 0.0,
+                "avg_logprob": -0.2, "compression_ratio": 1.2, "no_speech_prob": 0.01
+            })
+        return JSONResponse({
+            "task": "transcribe",
+            "language": "english",
+            "duration": duration,
+            "text": " ".join(word["word"] for word in words),
+            "words": words,
+            "segments": segments
+        })
+    
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request) -> Response:
+        body = await request.json()
+        failure = await fakes.simulate("chat")
+        if failure:
+            return failure
+        
+        prompt = "\n".join(str(message.get("content", "")) for message in body.get("messages", []))
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            # One shape that satisfies both the analysis and the labeling prompts;
+            # every rule named in a labeling prompt is applied
+            content = json.dumps({
+                "summary": "The team agreed on the release plan and assigned follow-ups.",
+                "action_items": [{"task": "Follow up with marketing", "assignee": None, "due_date": None, "priority": "medium"}],
+                "decisions": [{"description": "Ship the release next week", "owner": None, "context": "Review done", "impact": "Launch"}],
+                "labels": [
+                    {"label_name": name, "confidence": 0.9, "reasoning": "Mentioned in the meeting"}
+                    for name in LABEL_RULE.findall(prompt)
+                ]
+            })
+        else:
+            content = "The team agreed on the release plan and assigned follow-ups."
+        
+        prompt_tokens = max(len(prompt) // 4, 1)
+        completion_tokens = max(len(content) // 4, 1)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+            return StreamingResponse(
+                _stream_completion(body.get("model", "gpt-4o"), content, usage if include_usage else None),
+                media_type="text/event-stream"
+            )
+        return JSONResponse({
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage
+        })
+    
+    @app.post("/v1/images/generations")
+    async def image_generations(request: Request) -> Response:
+        body = await request.json()
+        failure = await fakes.simulate("images")
+        if failure:
+            return failure
+        return JSONResponse({
+            "created": int(time.time()),
+            "data": [{"url": f"{str(request.base_url).rstrip('/')}/images/{uuid.uuid4().hex}.png", "revised_prompt": body.get("prompt", "")[:100]}]
+        })
+    
+    @app.get("/images/{image_id}.png")
+    async def image(image_id: str) -> Response:
+        failure = await fakes.simulate("storage")
+        return failure or Response(fakes.image, media_type="image/png")
+    
+    # --- Supabase Storage ---
+    
+    @app.get("/storage/v1/object/public/{bucket}/{path:path}")
+    @app.get("/storage/v1/object/authenticated/{bucket}/{path:path}")
+    @app.get("/storage/v1/object/{bucket}/{path:path}")
+    async def download(bucket: str, path: str) -> Response:
+        failure = await fakes.simulate("storage")
+        if failure:
+            return failure
+        stored = fakes.objects.get(f"{bucket}/{path}")
+        if stored is None:
+            return JSONResponse({"statusCode": "404", "error": "not_found", "message": "Object not found"}, status_code=404)
+        return Response(stored["content"], media_type=stored["content_type"])
+    
+    @app.post("/storage/v1/object/list/{bucket}")
+    async def list_objects(bucket: str, request: Request) -> Response:
+        body = await request.json()
+        failure = await fakes.simulate("storage")
+        if failure:
+            return failure
+        prefix = f"{bucket}/{body.get('prefix') or ''}".rstrip("/") + "/"
+        search = body.get("search") or ""
+        entries = [
+            {"name": key[len(prefix):], "metadata": {"size": len(stored["content"]), "mimetype": stored["content_type"]}}
+            for key, stored in fakes.objects.items()
+            if key.startswith(prefix) and "/" not in key[len(prefix):] and search in key[len(prefix):]
+        ]
+        return JSONResponse(entries[:body.get("limit", 100)])
+    
+    @app.post("/storage/v1/object/upload/sign/{bucket}/{path:path}")
+    async def sign_upload(bucket: str, path: str) -> Response:
+        failure = await fakes.simulate("storage")
+        return failure or JSONResponse({"url": f"/object/upload/sign/{bucket}/{path}?token={uuid.uuid4().hex}"})
+    
+    @app.post("/storage/v1/object/{bucket}/{path:path}")
+    @app.put("/storage/v1/object/{bucket}/{path:path}")
+    @app.put("/storage/v1/object/upload/sign/{bucket}/{path:path}")
+    async def upload(bucket: str, path: str, request: Request) -> Response:
+        content_type = request.headers.get("content-type", "application/octet-stream")
+        if content_type.startswith("multipart/form-data"):
+            # The SDK uploads as a multipart form with a single "file" field
+            upload_file = (await request.form())["file"]
+            content, content_type = await upload_file.read(), upload_file.content_type
+        else:
+            content = await request.body()
+        failure = await fakes.simulate("storage")
+        if failure:
+            return failure
+        fakes.objects[f"{bucket}/{path}"] = {"content": content, "content_type": content_type}
+        return JSONResponse({"Key": f"{bucket}/{path}"})
+    
+    @app.delete("/storage/v1/object/{bucket}")
+    async def remove(bucket: str, request: Request) -> Response:
+        body = await request.json()
+        failure = await fakes.simulate("storage")
+        if failure:
+            return failure
+        removed = [path for path in body.get("prefixes", []) if fakes.objects.pop(f"{bucket}/{path}", None) is not None]
+        return JSONResponse([{"name": path} for path in removed])
+    
+    return app
+
+
+def build_profiles(
+    name: str,
+    latency_scale: float = 1.0,
+    error_rate: Optional[float] = None,
+    rate_limit_rate: Optional[float] = None
+) -> Dict[str, ServiceProfile]:
+    """A named profile with optional overrides applied to every service"""
+    profiles = {}
+    for service, profile in PROFILES[name].items():
+        profile = replace(profile, latency=profile.latency * latency_scale, jitter=profile.jitter * latency_scale)
+        if error_rate is not None:
+            profile = replace(profile, error_rate=error_rate)
+        if rate_limit_rate is not None:
+            profile = replace(profile, rate_limit_rate=rate_limit_rate)
+        profiles[service] = profile
+    return profiles
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options shared with the load-test driver, which can start this server itself"""
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="realistic", help="Latency/failure profile")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiply every service's latency")
+    parser.add_argument("--error-rate", type=float, default=None, help="Override the 500 rate of every service")
+    parser.add_argument("--rate-limit-rate", type=float, default=None, help="Override the 429 rate of every service")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible latencies and failures")
+
+
+def main() -> None:
+    import uvicorn
+    
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
+    profiles = build_profiles(args.profile, args.latency_scale, args.error_rate, args.rate_limit_rate)
+    uvicorn.run(create_app(FakeServices(profiles, seed=args.seed)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
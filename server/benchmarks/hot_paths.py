@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for CPU hot paths whose cost grows with meeting length
+
+Each benchmark runs against synthetic transcripts and diarization turns for a
+10-minute, 1-hour and 4-hour meeting. Results are compared with a stored
+baseline and the run fails (exit code 1) if any case got slower than the
+baseline by more than --threshold.
+
+Baselines are machine-specific: regenerate them with --save-baseline on the
+hardware that runs the comparison.
+
+Usage:
+    python benchmarks/hot_paths.py [--only 'search*'] [--sizes 10min,1h] [--threshold 0.5]
+    python benchmarks/hot_paths.py --save-baseline
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+import warnings
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+# The endpoints still call the pydantic v1-style from_orm(), which is what gets measured
+warnings.filterwarnings("ignore", message=".*from_orm.*")
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+from app.api.v1.endpoints.search import _build_search_result, _rank_results  # noqa: E402
+from app.models.recording import Recording  # noqa: E402
+from app.models.schemas import RecordingResponse  # noqa: E402
+from app.models.transcript_index import TranscriptIndex  # noqa: E402
+from app.services.speaker_alignment import align_words_to_speakers  # noqa: E402
+from app.services.transcript_compression import compress_transcript  # noqa: E402
+from app.services.transcript_index_service import transcript_index_service  # noqa: E402
+from app.services.transcription_service import transcription_service  # noqa: E402
+from app.services.visual_summary_service import visual_summary_service  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "hot_paths.json")
+
+SIZES = {"10min": 10, "1h": 60, "4h": 240}
+
+# Conversational speech runs at about 150 words per minute
+WORDS_PER_MINUTE = 150
+SPEAKERS = ("SPEAKER_00", "SPEAKER_01", "SPEAKER_02", "SPEAKER_03")
+VOCABULARY = (
+    "we", "should", "ship", "the", "release", "next", "week", "after", "review", "budget",
+    "team", "agreed", "to", "move", "launch", "date", "customer", "feedback", "on", "design",
+    "priority", "deadline", "owner", "approve", "proposal", "risk", "depends", "migration", "plan", "today",
+)
+SEARCH_RESULTS = 50  # The search endpoint's maximum page size
+
+
+class Meeting:
+    """Synthetic Whisper output and diarization turns for one meeting length"""
+    
+    def __init__(self, minutes: int, seed: int = 42):
+        rng = random.Random(seed + minutes)
+        duration = minutes * 60.0
+        word_count = minutes * WORDS_PER_MINUTE
+        step = duration / word_count
+        
+        self.words = []
+        for i in range(word_count):
+            start = i * step
+            self.words.append({"start": start, "end": start + step * 0.8, "word": rng.choice(VOCABULARY)})
+        self.transcript = " ".join(word["word"] for word in self.words)
+        # A rare token near the end so searches scan almost the whole transcript
+        self.transcript += " kickoff"
+        
+        # Speaker turns of 3-40 seconds with occasional overlaps
+        self.turns: List[Tuple[float, float, str]] = []
+        t = 0.0
+        while t < duration:
+            length = rng.uniform(3.0, 40.0)
+            self.turns.append((t, min(t + length, duration), rng.choice(SPEAKERS)))
+            t += length - (rng.uniform(0.0, 1.5) if rng.random() < 0.2 else 0.0)
+        
+        # Roughly one decision per 10 minutes and one action item per 5
+        self.decisions = [
+            {"description": f"Approve the {rng.choice(VOCABULARY)} proposal", "owner": rng.choice(SPEAKERS),
+             "context": " ".join(rng.choices(VOCABULARY, k=20)), "impact": " ".join(rng.choices(VOCABULARY, k=12))}
+            for _ in range(max(minutes // 10, 1))
+        ]
+        self.action_items = [
+            {"task": " ".join(rng.choices(VOCABULARY, k=10)), "assignee": rng.choice(SPEAKERS),
+             "due_date": None, "priority": rng.choice(("high", "medium", "low"))}
+            for _ in range(max(minutes // 5, 1))
+        ]
+        self.summary = " ".join(rng.choices(VOCABULARY, k=200))
+        
+        self.transcript_with_speakers = transcription_service.add_speaker_labels(self.transcript, self.words, self.turns)
+        index = transcript_index_service.build_index(self.transcript, self.words, turns=self.turns)
+        self.index = TranscriptIndex(
+            speakers=index["speakers"],
+            segments=index["segments"],
+            words=index["words"].tobytes(),
+            word_count=len(index["words"])
+        )
+    
+    def recording(self, recording_id: int) -> Recording:
+        """A fully processed recording row, as loaded for search results or the detail endpoint"""
+        created = datetime(2024, 1, 1) + timedelta(hours=recording_id)
+        return Recording(
+            id=recording_id,
+            original_filename=f"meeting_{recording_id}.mp4",
+            media_url=f"https://example.com/meeting_{recording_id}.mp4",
+            storage_path=f"uploads/meeting_{recording_id}.mp4",
+            file_size=50_000_000,
+            content_type="video/mp4",
+            transcript=self.transcript,
+            transcript_with_speakers=self.transcript_with_speakers,
+            summary=self.summary,
+            action_items=self.action_items,
+            decisions=self.decisions,
+            visual_summary_url=None,
+            labels=[],
+            processing_status="completed",
+            processing_error=None,
+            duration=self.words[-1]["end"],
+            processing_timings={"stage.transcribe": 60.0},
+            created_at=created,
+            updated_at=created,
+        )
+
+
+def bench_search(meeting: Meeting) -> Callable[[], Any]:
+    recordings = [meeting.recording(i) for i in range(SEARCH_RESULTS)]
+    
+    def run():
+        results = [_build_search_result(recording, "kickoff", meeting.index) for recording in recordings]
+        _rank_results(results, "kickoff")
+        return results
+    return run
+
+
+def bench_speaker_alignment(meeting: Meeting) -> Callable[[], Any]:
+    return lambda: align_words_to_speakers(meeting.words, meeting.turns)
+
+
+def bench_add_speaker_labels(meeting: Meeting) -> Callable[[], Any]:
+    return lambda: transcription_service.add_speaker_labels(meeting.transcript, meeting.words, meeting.turns)
+
+
+def bench_segment_transcript(meeting: Meeting) -> Callable[[], Any]:
+    return lambda: transcription_service._create_segment_based_transcript(meeting.turns, meeting.transcript)
+
+
+def bench_compression(meeting: Meeting) -> Callable[[], Any]:
+    return lambda: compress_transcript(meeting.transcript_with_speakers)
+
+
+def bench_decision_flow(meeting: Meeting) -> Callable[[], Any]:
+    return lambda: visual_summary_service._analyze_decision_flow(meeting.decisions, meeting.action_items, meeting.summary)
+
+
+def bench_recording_response(meeting: Meeting) -> Callable[[], Any]:
+    recording = meeting.recording(1)
+    return lambda: RecordingResponse.from_orm(recording).model_dump_json()
+
+
+BENCHMARKS: Dict[str, Callable[[Meeting], Callable[[], Any]]] = {
+    "search_results": bench_search,
+    "speaker_alignment": bench_speaker_alignment,
+    "add_speaker_labels": bench_add_speaker_labels,
+    "segment_based_transcript": bench_segment_transcript,
+    "transcript_compression": bench_compression,
+    "decision_flow": bench_decision_flow,
+    "recording_response": bench_recording_response,
+}
+
+
+def measure(func: Callable[[], Any], repeat: int, min_time: float) -> float:
+    """Best per-call time over `repeat` rounds, each long enough to time reliably"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(number, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", default="*", help="Glob over benchmark names")
+    parser.add_argument("--sizes", default=",".join(SIZES), help=f"Comma-separated subset of {', '.join(SIZES)}")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per case; the best is kept")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per timing round")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file to compare with or save to")
+    # Sub-millisecond cases jitter by 20-40% on shared machines; real regressions in these paths are multiples
+    parser.add_argument("--threshold", type=float, default=0.5, help="Allowed slowdown over baseline (0.5 = 50%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    args = parser.parse_args()
+    
+    baseline: Dict[str, float] = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+    
+    results: Dict[str, float] = {}
+    regressions: List[str] = []
+    print(f"{'case':<40} {'seconds':>12} {'baseline':>12} {'change':>8}")
+    for size in args.sizes.split(","):
+        meeting = Meeting(SIZES[size])
+        for name, setup in BENCHMARKS.items():
+            if not fnmatch.fnmatch(name, args.only):
+                continue
+            case = f"{name}[{size}]"
+            seconds = results[case] = measure(setup(meeting), args.repeat, args.min_time)
+            
+            reference = baseline.get(case)
+            if reference:
+                change = seconds / reference - 1
+                flag = " ❌" if change > args.threshold else ""
+                if flag:
+                    regressions.append(case)
+                print(f"{case:<40} {seconds:>12.6f} {reference:>12.6f} {change:>+7.1%}{flag}")
+            else:
+                print(f"{case:<40} {seconds:>12.6f} {'-':>12} {'-':>8}")
+    
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as baseline_file:
+            json.dump({
+                "machine": f"{platform.machine()} {platform.processor() or platform.system()}",
+                "python": platform.python_version(),
+                "results": results,
+            }, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write("\n")
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return 0
+    
+    if regressions:
+        print(f"\n❌ {len(regressions)} case(s) regressed more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print("\n✅ No regressions" if baseline else "\nℹ️  No baseline found; run with --save-baseline to create one")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+API cold-start benchmark
+
+Imports app.main in fresh interpreters and fails (exit code 1) if the median
+import time exceeds the budget or if any heavy module that must only be loaded
+by workers ends up in the API process.
+
+Usage: python benchmarks/startup_benchmark.py [--runs 5] [--max-seconds 1.5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use by the services or workers that need them, never at API import
+FORBIDDEN_MODULES = (
+    "openai",
+    "tiktoken",
+    "supabase",
+    "torch",
+    "torchaudio",
+    "pyannote.audio",
+    "faster_whisper",
+    "ctranslate2",
+    "PIL",
+    "app.tasks.processing_tasks",
+    "app.tasks.diarization_tasks",
+    "app.tasks.local_transcription_tasks",
+    "app.tasks.visual_summary_tasks",
+)
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    "seconds": elapsed,
+    "modules": len(sys.modules),
+    "forbidden": [name for name in %r if name in sys.modules],
+}))
+"""
+
+
+def measure_once() -> dict:
+    """Import the API in a fresh interpreter and report what it cost"""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE % (FORBIDDEN_MODULES,)],
+        cwd=SERVER_DIR,
+        capture_output=True,
+        text=True,
+        check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing app.main failed:\n{result.stderr}")
+    # Application logging also goes to stdout; the probe's line is the last one
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument("--max-seconds", type=float, default=1.5, help="Budget for the median import time")
+    args = parser.parse_args()
+    
+    # The first run warms the bytecode and filesystem caches and is not counted
+    measure_once()
+    samples = [measure_once() for _ in range(args.runs)]
+    
+    timings = [sample["seconds"] for sample in samples]
+    median = statistics.median(timings)
+    forbidden = sorted({name for sample in samples for name in sample["forbidden"]})
+    
+    print(f"app.main import: median {median:.3f}s, min {min(timings):.3f}s, max {max(timings):.3f}s "
+          f"over {args.runs} runs ({samples[0]['modules']} modules loaded)")
+    
+    failed = False
+    if median > args.max_seconds:
+        print(f"❌ Cold start regressed: {median:.3f}s exceeds the {args.max_seconds:.3f}s budget")
+        failed = True
+    if forbidden:
+        print(f"❌ Worker-only modules imported by the API: {', '.join(forbidden)}")
+        failed = True
+    if not failed:
+        print("✅ Cold start within budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,8 @@ from app.core.config import settings
 
 # Import all models so Alembic can detect them
 from app.models.recording import Recording
+from app.models.transcript_index import TranscriptIndex
+from app.models.media_probe import MediaProbe
 # TextChunk removed - embeddings functionality removed
 
 # this is the Alembic Config object, which provides
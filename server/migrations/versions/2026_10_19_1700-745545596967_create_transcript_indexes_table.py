@@ -0,0 +1,38 @@
+"""create_transcript_indexes_table
+
+Revision ID: 745545596967
+Revises: d48136932e87
+Create Date: 2026-10-19 17:00:12.417305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '745545596967'
+down_revision = 'd48136932e87'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('transcript_indexes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recording_id', sa.Integer(), nullable=False),
+    sa.Column('speakers', sa.JSON(), nullable=True),
+    sa.Column('segments', sa.JSON(), nullable=True),
+    sa.Column('words', sa.LargeBinary(), nullable=True),
+    sa.Column('word_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['recording_id'], ['recordings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transcript_indexes_id'), 'transcript_indexes', ['id'], unique=False)
+    op.create_index(op.f('ix_transcript_indexes_recording_id'), 'transcript_indexes', ['recording_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_transcript_indexes_recording_id'), table_name='transcript_indexes')
+    op.drop_index(op.f('ix_transcript_indexes_id'), table_name='transcript_indexes')
+    op.drop_table('transcript_indexes')
\ No newline at end of file
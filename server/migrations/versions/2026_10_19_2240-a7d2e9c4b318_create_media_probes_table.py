@@ -0,0 +1,43 @@
+"""create_media_probes_table
+
+Revision ID: a7d2e9c4b318
+Revises: 8c3f1a6e4d27
+Create Date: 2026-10-19 22:40:05.618204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d2e9c4b318'
+down_revision = '8c3f1a6e4d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('media_probes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recording_id', sa.Integer(), nullable=False),
+    sa.Column('format_name', sa.String(), nullable=True),
+    sa.Column('duration', sa.Float(), nullable=True),
+    sa.Column('bit_rate', sa.Integer(), nullable=True),
+    sa.Column('audio_codec', sa.String(), nullable=True),
+    sa.Column('channels', sa.Integer(), nullable=True),
+    sa.Column('sample_rate', sa.Integer(), nullable=True),
+    sa.Column('video_codec', sa.String(), nullable=True),
+    sa.Column('peaks', sa.LargeBinary(), nullable=True),
+    sa.Column('peak_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['recording_id'], ['recordings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_media_probes_id'), 'media_probes', ['id'], unique=False)
+    op.create_index(op.f('ix_media_probes_recording_id'), 'media_probes', ['recording_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_media_probes_recording_id'), table_name='media_probes')
+    op.drop_index(op.f('ix_media_probes_id'), table_name='media_probes')
+    op.drop_table('media_probes')
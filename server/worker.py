@@ -4,22 +4,33 @@ RQ Worker script for processing background tasks
 """
 import logging
 import sys
-from rq import Worker, Connection
+from rq import Worker, SimpleWorker, Connection
 import redis
 
 from app.core.config import settings
+from app.core.logging_config import setup_logging
+from app.services.task_service import DIARIZATION_QUEUE, LOCAL_TRANSCRIPTION_QUEUE
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
+# Setup logging; no queue listener here because RQ forks a child per job
+# and the listener thread would not exist in the child
+setup_logging(use_queue=False)
 
 logger = logging.getLogger(__name__)
 
-def run_worker():
-    """Run RQ worker"""
+def run_worker(queue_names=None):
+    """
+    Run RQ worker
+    
+    Usage: python worker.py [queue ...]   (defaults to the "default" queue)
+    
+    Diarization and local transcription workers run jobs in-process instead
+    of forking per job, so the pyannote or faster-whisper model is loaded once
+    at startup and stays warm between jobs.
+    """
+    queue_names = queue_names or ['default']
+    diarization_worker = DIARIZATION_QUEUE in queue_names
+    local_transcription_worker = LOCAL_TRANSCRIPTION_QUEUE in queue_names
+    
     try:
         # Connect to Redis
         redis_conn = redis.Redis(
@@ -36,10 +47,19 @@ def run_worker():
         redis_conn.ping()
         logger.info("✅ Redis connection successful")
         
+        if diarization_worker:
+            from app.services.diarization_service import diarization_service
+            diarization_service.load()
+        
+        if local_transcription_worker:
+            from app.services.local_transcription_service import local_transcription_service
+            local_transcription_service.load()
+        
         # Create and run worker
         with Connection(redis_conn):
-            worker = Worker(['default'])
-            logger.info("👷 Worker ready to process tasks")
+            worker_class = SimpleWorker if diarization_worker or local_transcription_worker else Worker
+            worker = worker_class(queue_names)
+            logger.info(f"👷 Worker ready to process tasks from {queue_names}")
             worker.work()
             
     except Exception as e:
@@ -47,4 +67,4 @@ def run_worker():
         sys.exit(1)
 
 if __name__ == "__main__":
-    run_worker() 
\ No newline at end of file
+    run_worker(sys.argv[1:]) 
\ No newline at end of file